@@ -4,3 +4,23 @@ __author__ = 'Sergio Abad'
 
 from .api import AliexpressApi
 from .api import models
+
+from .helpers.lazy import lazy_imports
+
+
+# Imported on first use, so a worker only pays for the features it uses
+LAZY_IMPORTS = {
+    'AsyncAliexpressApi': '.async_api',
+    'ClientPool': '.client_pool',
+    'ResponseCache': '.helpers.cache',
+    'CacheBackend': '.helpers.cache',
+    'MemoryCache': '.helpers.cache',
+    'SqliteCache': '.helpers.cache',
+    'RateLimiter': '.helpers.rate_limit',
+    'RetryPolicy': '.helpers.retry',
+    'HedgePolicy': '.helpers.hedge',
+    'SingleFlight': '.helpers.single_flight',
+}
+
+
+__getattr__, __dir__ = lazy_imports(__name__, LAZY_IMPORTS)
@@ -5,16 +5,31 @@ to get product information and affiliate links from AliExpress using the officia
 API in an easier way.
 """
 
-from aliexpress_api.errors.exceptions import CategoriesNotFoudException
-from aliexpress_api.helpers.categories import filter_child_categories, filter_parent_categories
+from aliexpress_api.errors.exceptions import AliexpressException, CategoriesNotFoudException
+from aliexpress_api.helpers.categories import CategoryIndex, CATEGORIES_TTL, get_shared_index, set_shared_index
 from aliexpress_api.models.category import ChildCategory
-from .skd import setDefaultAppInfo
+from .skd import appinfo
 from .skd import api as aliapi
 from .errors import ProductsNotFoudException, InvalidTrackingIdException, OrdersNotFoundException
-from .helpers import api_request, parse_products, get_list_as_string, get_product_ids
+from .errors import ApiRequestException
+from .helpers import get_list_as_string, get_product_ids
+from .helpers import get_unique, get_chunks, get_links, get_link_key, normalize_link
+from .helpers import get_response, parse_response
+from .models.base import unwrap_list
 from . import models
 
-from typing import List, Union
+from collections import Counter, defaultdict, deque
+from typing import TYPE_CHECKING, Callable, Iterator, List, Union
+import math
+import threading
+
+if TYPE_CHECKING:
+    from .helpers import ResponseCache, RateLimiter, RetryPolicy, HedgePolicy, SingleFlight
+
+
+MAX_PRODUCT_IDS = 50
+MAX_SOURCE_VALUES = 50
+MAX_PAGE_SIZE = 50
 
 
 class AliexpressApi:
@@ -26,6 +41,29 @@ class AliexpressApi:
         language (str): Language code. Defaults to EN.
         currency (str): Currency code. Defaults to USD.
         tracking_id (str): The tracking id for link generator. Defaults to None.
+        cache (ResponseCache): Cache for the responses of product and category requests.
+            Defaults to None, which disables it.
+        categories_path (str): JSON file where the category index is kept between runs.
+            Defaults to None, which keeps it only in memory.
+        categories_ttl (int): Seconds before the category index is fetched again.
+            Defaults to one day.
+        rate_limiter (RateLimiter): Limits the calls per second to each API method. It can
+            be shared by the clients using the same key. Defaults to None, which disables it.
+        retry_policy (RetryPolicy): Retries the read calls that fail with transient errors.
+            Defaults to None, which disables it.
+        hedge_policy (HedgePolicy): Sends again the product details and affiliate link calls
+            that take longer than usual. Defaults to None, which disables it.
+        single_flight (SingleFlight): Shares one request between the identical calls made
+            at the same time. Defaults to None, which disables it.
+        sign_method (str): Request signature method, 'md5' or 'hmac-sha256'. Defaults to md5.
+        compress_requests (bool): Sends the request bodies compressed with gzip. Only for
+            endpoints that accept it. Defaults to False.
+        https (bool): Sends the requests with HTTPS. Reconnections resume the TLS session,
+            so they cost close to HTTP ones. Defaults to False.
+
+    The bytes sent and received by each API method, after compression, and the decoded
+    response bytes are added up in ``transferred``, with the number of ``calls`` sent to
+    the API. Retries and hedged copies are counted, cached and shared responses are not.
     """
 
     def __init__(self,
@@ -35,6 +73,16 @@ class AliexpressApi:
         currency: models.Currency,
         tracking_id: str = None,
         app_signature: str = None,
+        cache: 'ResponseCache' = None,
+        categories_path: str = None,
+        categories_ttl: int = CATEGORIES_TTL,
+        rate_limiter: 'RateLimiter' = None,
+        retry_policy: 'RetryPolicy' = None,
+        hedge_policy: 'HedgePolicy' = None,
+        single_flight: 'SingleFlight' = None,
+        sign_method: str = 'md5',
+        compress_requests: bool = False,
+        https: bool = False,
         **kwargs):
         self._key = key
         self._secret = secret
@@ -42,51 +90,69 @@ class AliexpressApi:
         self._language = language
         self._currency = currency
         self._app_signature = app_signature
+        self._cache = cache
+        self._categories_path = categories_path
+        self._categories_ttl = categories_ttl
+        self._rate_limiter = rate_limiter
+        self._retry_policy = retry_policy
+        self._hedge_policy = hedge_policy
+        self._single_flight = single_flight
         self.categories = None
-        setDefaultAppInfo(self._key, self._secret)
+        self._category_index = None
+        self._sign_method = sign_method
+        self._app_info = appinfo(self._key, self._secret, self._sign_method)
+        self._compress_requests = compress_requests
+        self._https = https
+        self.transferred = defaultdict(Counter)
+        self._transfer_lock = threading.Lock()
 
 
     def get_products_details(self,
         product_ids: Union[str, List[str]],
         fields: Union[str, List[str]] = None,
         country: str = None,
-        **kwargs) -> List[models.Product]:
+        chunk_size: int = MAX_PRODUCT_IDS,
+        max_workers: int = 4,
+        **kwargs) -> models.ProductList:
         """Get products information.
 
+        Duplicated IDs are removed and the rest are requested in chunks of ``chunk_size``,
+        sending up to ``max_workers`` chunks at the same time. A failed chunk does not stop
+        the rest, its IDs are returned as missing with the error.
+
         Args:
             product_ids (``str | list[str]``): One or more links or product IDs.
-            fields (``str | list[str]``): The fields to include in the results. Defaults to all.
+            fields (``str | list[str] | models.Projection``): The fields to include in the results.
+                Defaults to all. A projection, like ``models.PRICE_ONLY``, returns slim products.
             country (``str``): Filter products that can be sent to that country. Returns the price
                 according to the country's tax rate policy.
+            chunk_size (``int``): Product IDs sent on each request. Defaults to 50, the maximum
+                accepted by the API.
+            max_workers (``int``): Maximum number of chunks requested in parallel. Defaults to 4.
 
         Returns:
-            ``list[models.Product]``: A list of products.
+            ``models.ProductList``: A list of products in the same order as the given IDs. The IDs
+            without results are available in its ``missing_ids`` attribute, and the errors of
+            the failed chunks, by product ID, in ``errors``.
 
         Raises:
             ``ProductsNotFoudException``
             ``InvalidArgumentException``
-            ``ApiRequestException``
-            ``ApiRequestResponseException``
+            ``ApiRequestException``: If no products were found and a chunk failed.
+            ``ApiRequestResponseException``: If no products were found and a chunk failed.
         """
-        product_ids = get_product_ids(product_ids)
-        product_ids = get_list_as_string(product_ids)
+        product_ids = get_unique(get_product_ids(product_ids))
+        chunks = get_chunks(product_ids, chunk_size)
 
-        request = aliapi.rest.AliexpressAffiliateProductdetailGetRequest()
-        request.app_signature = self._app_signature
-        request.fields = get_list_as_string(fields)
-        request.product_ids = product_ids
-        request.country = country
-        request.target_currency = self._currency
-        request.target_language = self._language
-        request.tracking_id = self._tracking_id
-
-        response = api_request(request, 'aliexpress_affiliate_productdetail_get_response')
-
-        if response.current_record_count > 0:
-            response = parse_products(response.products.product)
-            return response
+        if len(chunks) == 1:
+            responses = [self._products_details_chunk(chunks[0], fields, country)]
         else:
-            raise ProductsNotFoudException('No products found with current parameters')
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                responses = list(executor.map(
+                    lambda chunk: self._products_details_chunk(chunk, fields, country), chunks))
+
+        return self._products_details_response(product_ids, responses, fields, chunks)
 
 
     def get_affiliate_links(self,
@@ -110,23 +176,57 @@ class AliexpressApi:
             ``ApiRequestException``
             ``ApiRequestResponseException``
         """
+        request = self._affiliate_links_request(links, link_type)
+        response = self._request(request, 'aliexpress_affiliate_link_generate_response')
+        return self._affiliate_links_response(response)
+
+
+    def get_affiliate_links_bulk(self,
+        links: Union[str, List[str]],
+        link_type: models.LinkType = models.LinkType.NORMAL,
+        chunk_size: int = MAX_SOURCE_VALUES,
+        max_workers: int = 4,
+        **kwargs) -> List[models.AffiliateLinkResult]:
+        """Converts any number of links in affiliate links.
+
+        Links are normalized and deduplicated, then converted in chunks of ``chunk_size``,
+        sending up to ``max_workers`` chunks at the same time. Forms of the same link, like
+        with or without scheme, fragment or trailing slash, are converted once. A failed
+        chunk does not stop the rest, its links are returned with the error instead.
+
+        Args:
+            links (``str | list[str]``): One or more links to convert.
+            link_type (``models.LinkType``): Choose between normal link with standard commission
+                or hot link with hot product commission. Defaults to NORMAL.
+            chunk_size (``int``): Links sent on each request. Defaults to 50.
+            max_workers (``int``): Maximum number of chunks requested in parallel. Defaults to 4.
+
+        Returns:
+            ``list[models.AffiliateLinkResult]``: One result for each given link, in the same
+            order, with the link as given in ``source_value``.
+
+        Raises:
+            ``InvalidArgumentException``
+            ``InvalidTrackingIdException``
+        """
         if not self._tracking_id:
             raise InvalidTrackingIdException('The tracking id is required for affiliate links')
 
-        links = get_list_as_string(links)
+        links = get_links(links)
+        chunks = self._affiliate_links_bulk_chunks(links, chunk_size)
 
-        request = aliapi.rest.AliexpressAffiliateLinkGenerateRequest()
-        request.app_signature = self._app_signature
-        request.source_values = links
-        request.promotion_link_type = link_type
-        request.tracking_id = self._tracking_id
+        def convert(chunk):
+            try:
+                request = self._affiliate_links_request(chunk, link_type)
+                return self._request(request, 'aliexpress_affiliate_link_generate_response')
+            except AliexpressException as error:
+                return error
 
-        response = api_request(request, 'aliexpress_affiliate_link_generate_response')
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            responses = list(executor.map(convert, chunks))
 
-        if response.total_result_count > 0:
-            return response.promotion_links.promotion_link
-        else:
-            raise ProductsNotFoudException('Affiliate links not available')
+        return self._affiliate_links_bulk_response(links, chunks, responses)
 
 
     def get_hotproducts(self,
@@ -141,13 +241,15 @@ class AliexpressApi:
 		platform_product_type: models.ProductType = None,
 		ship_to_country: str = None,
 		sort: models.SortBy = None,
+        raw: bool = False,
         **kwargs) -> models.HotProductsResponse:
         """Search for affiliated products with high commission.
 
         Args:
             category_ids (``str | list[str]``): One or more category IDs.
             delivery_days (``int``): Estimated delivery days.
-            fields (``str | list[str]``): The fields to include in the results list. Defaults to all.
+            fields (``str | list[str] | models.Projection``): The fields to include in the results list.
+                Defaults to all. A projection, like ``models.PRICE_ONLY``, returns slim products.
             keywords (``str``): Search products based on keywords.
             max_sale_price (``int``): Filters products with price below the specified value.
                 Prices appear in lowest currency denomination. So $31.41 should be 3141.
@@ -159,6 +261,8 @@ class AliexpressApi:
             ship_to_country (``str``): Filter products that can be sent to that country.
                 Returns the price according to the country's tax rate policy.
             sort (``models.SortBy``): Specifies the sort method.
+            raw (``bool``): Returns the undecoded ``resp_result`` dict, useful to forward the
+                JSON downstream. Defaults to False.
 
         Returns:
             ``models.HotProductsResponse``: Contains response information and the list of products.
@@ -168,30 +272,11 @@ class AliexpressApi:
             ``ApiRequestException``
             ``ApiRequestResponseException``
         """
-        request = aliapi.rest.AliexpressAffiliateHotproductQueryRequest()
-        request.app_signature = self._app_signature
-        request.category_ids = get_list_as_string(category_ids)
-        request.delivery_days = str(delivery_days)
-        request.fields = get_list_as_string(fields)
-        request.keywords = keywords
-        request.max_sale_price = max_sale_price
-        request.min_sale_price = min_sale_price
-        request.page_no = page_no
-        request.page_size = page_size
-        request.platform_product_type = platform_product_type
-        request.ship_to_country = ship_to_country
-        request.sort = sort
-        request.target_currency = self._currency
-        request.target_language = self._language
-        request.tracking_id = self._tracking_id
-
-        response = api_request(request, 'aliexpress_affiliate_hotproduct_query_response')
-
-        if response.current_record_count > 0:
-            response.products = parse_products(response.products.product)
-            return response
-        else:
-            raise ProductsNotFoudException('No products found with current parameters')
+        request = self._products_request(aliapi.rest.AliexpressAffiliateHotproductQueryRequest(),
+            category_ids, delivery_days, fields, keywords, max_sale_price, min_sale_price,
+            page_no, page_size, platform_product_type, ship_to_country, sort)
+        response = self._request(request, 'aliexpress_affiliate_hotproduct_query_response', raw)
+        return response if raw else self._products_response(response, models.HotProductsResponse, fields)
 
 
     def get_products(self,
@@ -206,13 +291,15 @@ class AliexpressApi:
 		platform_product_type: models.ProductType = None,
 		ship_to_country: str = None,
 		sort: models.SortBy = None,
+        raw: bool = False,
         **kwargs) -> models.ProductsResponse:
         """Search for affiliated products.
 
         Args:
             category_ids (``str | list[str]``): One or more category IDs.
             delivery_days (``int``): Estimated delivery days.
-            fields (``str | list[str]``): The fields to include in the results list. Defaults to all.
+            fields (``str | list[str] | models.Projection``): The fields to include in the results list.
+                Defaults to all. A projection, like ``models.PRICE_ONLY``, returns slim products.
             keywords (``str``): Search products based on keywords.
             max_sale_price (``int``): Filters products with price below the specified value.
                 Prices appear in lowest currency denomination. So $31.41 should be 3141.
@@ -224,6 +311,8 @@ class AliexpressApi:
             ship_to_country (``str``): Filter products that can be sent to that country.
                 Returns the price according to the country's tax rate policy.
             sort (``models.SortBy``): Specifies the sort method.
+            raw (``bool``): Returns the undecoded ``resp_result`` dict, useful to forward the
+                JSON downstream. Defaults to False.
 
         Returns:
             ``models.ProductsResponse``: Contains response information and the list of products.
@@ -233,30 +322,190 @@ class AliexpressApi:
             ``ApiRequestException``
             ``ApiRequestResponseException``
         """
-        request = aliapi.rest.AliexpressAffiliateProductQueryRequest()
+        request = self._products_request(aliapi.rest.AliexpressAffiliateProductQueryRequest(),
+            category_ids, delivery_days, fields, keywords, max_sale_price, min_sale_price,
+            page_no, page_size, platform_product_type, ship_to_country, sort)
+        response = self._request(request, 'aliexpress_affiliate_product_query_response', raw)
+        return response if raw else self._products_response(response, fields=fields)
+
+
+    def iter_hotproducts(self,
+        category_ids: Union[str, List[str]] = None,
+        delivery_days: int = None,
+        fields: Union[str, List[str]] = None,
+        keywords: str = None,
+        max_sale_price: int = None,
+        min_sale_price: int = None,
+        page_no: int = 1,
+        page_size: int = MAX_PAGE_SIZE,
+        platform_product_type: models.ProductType = None,
+        ship_to_country: str = None,
+        sort: models.SortBy = None,
+        max_items: int = None,
+        prefetch: int = 1,
+        **kwargs) -> Iterator[models.Product]:
+        """Iterates over the hot products of all the result pages.
+
+        While the current page is being consumed, the next ``prefetch`` pages are requested
+        in the background. Takes the same search arguments as ``get_hotproducts``.
+
+        Args:
+            page_no (``int``): First page to fetch. Defaults to 1.
+            page_size (``int``): Products on each page. Defaults to 50.
+            max_items (``int``): Stops after yielding this number of products. Defaults to all.
+            prefetch (``int``): Number of pages requested ahead of the consumer. Defaults to 1.
+
+        Yields:
+            ``models.Product``: Each product found, page after page.
+
+        Raises:
+            ``ApiRequestException``
+            ``ApiRequestResponseException``
+        """
+        return self._iter_products(self.get_hotproducts, page_no, page_size, max_items, prefetch,
+            category_ids=category_ids, delivery_days=delivery_days, fields=fields,
+            keywords=keywords, max_sale_price=max_sale_price, min_sale_price=min_sale_price,
+            platform_product_type=platform_product_type, ship_to_country=ship_to_country, sort=sort)
+
+
+    def iter_products(self,
+        category_ids: Union[str, List[str]] = None,
+        delivery_days: int = None,
+        fields: Union[str, List[str]] = None,
+        keywords: str = None,
+        max_sale_price: int = None,
+        min_sale_price: int = None,
+        page_no: int = 1,
+        page_size: int = MAX_PAGE_SIZE,
+        platform_product_type: models.ProductType = None,
+        ship_to_country: str = None,
+        sort: models.SortBy = None,
+        max_items: int = None,
+        prefetch: int = 1,
+        **kwargs) -> Iterator[models.Product]:
+        """Iterates over the products of all the result pages.
+
+        While the current page is being consumed, the next ``prefetch`` pages are requested
+        in the background. Takes the same search arguments as ``get_products``.
+
+        Args:
+            page_no (``int``): First page to fetch. Defaults to 1.
+            page_size (``int``): Products on each page. Defaults to 50.
+            max_items (``int``): Stops after yielding this number of products. Defaults to all.
+            prefetch (``int``): Number of pages requested ahead of the consumer. Defaults to 1.
+
+        Yields:
+            ``models.Product``: Each product found, page after page.
+
+        Raises:
+            ``ApiRequestException``
+            ``ApiRequestResponseException``
+        """
+        return self._iter_products(self.get_products, page_no, page_size, max_items, prefetch,
+            category_ids=category_ids, delivery_days=delivery_days, fields=fields,
+            keywords=keywords, max_sale_price=max_sale_price, min_sale_price=min_sale_price,
+            platform_product_type=platform_product_type, ship_to_country=ship_to_country, sort=sort)
+
+
+    def download_hotproducts(self,
+        category_id: str = None,
+        country: str = None,
+        fields: Union[str, List[str]] = None,
+        locale_site: str = None,
+        page_no: int = None,
+        page_size: int = None,
+        raw: bool = False,
+        **kwargs) -> models.HotProductsResponse:
+        """Download a page of the hot products of a category, meant for bulk exports.
+
+        Args:
+            category_id (``str``): The category ID.
+            country (``str``): Filter products that can be sent to that country.
+            fields (``str | list[str] | models.Projection``): The fields to include in the results list.
+                Defaults to all. A projection, like ``models.PRICE_ONLY``, returns slim products.
+            locale_site (``str``): The site of the products, e.g., 'ru_site'.
+            page_no (``int``):
+            page_size (``int``): Products on each page. Should be between 1 and 50.
+            raw (``bool``): Returns the undecoded ``resp_result`` dict. Defaults to False.
+
+        Returns:
+            ``models.HotProductsResponse``: Contains response information and the list of products.
+
+        Raises:
+            ``ProductsNotFoudException``
+            ``ApiRequestException``
+            ``ApiRequestResponseException``
+        """
+        request = self._hotproducts_download_request(category_id, country, fields, locale_site,
+            page_no, page_size)
+        response = self._request(request, 'aliexpress_affiliate_hotproduct_download_response', raw)
+        return response if raw else self._products_response(response, models.HotProductsResponse, fields)
+
+
+    def get_featured_promos(self,
+        fields: Union[str, List[str]] = None,
+        **kwargs) -> List[models.Promo]:
+        """Get the featured promotions, like the current sales.
+
+        Args:
+            fields (``str | list[str]``): The fields to include in the results. Defaults to all.
+
+        Returns:
+            ``list[models.Promo]``: A list of promotions.
+
+        Raises:
+            ``ProductsNotFoudException``
+            ``ApiRequestException``
+            ``ApiRequestResponseException``
+        """
+        request = aliapi.rest.AliexpressAffiliateFeaturedpromoGetRequest()
         request.app_signature = self._app_signature
-        request.category_ids = get_list_as_string(category_ids)
-        request.delivery_days = str(delivery_days)
         request.fields = get_list_as_string(fields)
-        request.keywords = keywords
-        request.max_sale_price = max_sale_price
-        request.min_sale_price = min_sale_price
-        request.page_no = page_no
-        request.page_size = page_size
-        request.platform_product_type = platform_product_type
-        request.ship_to_country = ship_to_country
-        request.sort = sort
-        request.target_currency = self._currency
-        request.target_language = self._language
-        request.tracking_id = self._tracking_id
+        response = self._request(request, 'aliexpress_affiliate_featuredpromo_get_response')
+        return self._featured_promos_response(response)
 
-        response = api_request(request, 'aliexpress_affiliate_product_query_response')
 
-        if response.current_record_count > 0:
-            response.products = parse_products(response.products.product)
-            return response
-        else:
-            raise ProductsNotFoudException('No products found with current parameters')
+    def get_featured_promo_products(self,
+        promotion_name: str,
+        category_id: str = None,
+        country: str = None,
+        fields: Union[str, List[str]] = None,
+        page_no: int = None,
+        page_size: int = None,
+        promotion_end_time: str = None,
+        promotion_start_time: str = None,
+        sort: models.SortBy = None,
+        raw: bool = False,
+        **kwargs) -> models.PromoProductsResponse:
+        """Get the products of a featured promotion.
+
+        Args:
+            promotion_name (``str``): The ``promo_name`` of the promotion.
+            category_id (``str``): Filter products of this category.
+            country (``str``): Filter products that can be sent to that country.
+            fields (``str | list[str] | models.Projection``): The fields to include in the results list.
+                Defaults to all. A projection, like ``models.PRICE_ONLY``, returns slim products.
+            page_no (``int``):
+            page_size (``int``): Products on each page. Should be between 1 and 50.
+            promotion_end_time (``str``): Filter products with promotions ending before this time,
+                in format 'YYYY-MM-DD HH:MM:SS'.
+            promotion_start_time (``str``): Filter products with promotions starting after this
+                time, in format 'YYYY-MM-DD HH:MM:SS'.
+            sort (``models.SortBy``): Specifies the sort method.
+            raw (``bool``): Returns the undecoded ``resp_result`` dict. Defaults to False.
+
+        Returns:
+            ``models.PromoProductsResponse``: Contains response information and the list of products.
+
+        Raises:
+            ``ProductsNotFoudException``
+            ``ApiRequestException``
+            ``ApiRequestResponseException``
+        """
+        request = self._featured_promo_products_request(promotion_name, category_id, country,
+            fields, page_no, page_size, promotion_end_time, promotion_start_time, sort)
+        response = self._request(request, 'aliexpress_affiliate_featuredpromo_products_get_response', raw)
+        return response if raw else self._products_response(response, models.PromoProductsResponse, fields)
 
 
     def get_categories(self, **kwargs) -> List[Union[models.Category, ChildCategory]]:
@@ -273,13 +522,32 @@ class AliexpressApi:
         request = aliapi.rest.AliexpressAffiliateCategoryGetRequest()
         request.app_signature = self._app_signature
 
-        response = api_request(request, 'aliexpress_affiliate_category_get_response')
+        response = self._request(request, 'aliexpress_affiliate_category_get_response')
+        return self._categories_response(response)
 
-        if response.total_result_count > 0:
-            self.categories = response.categories.category
-            return self.categories
-        else:
-            raise CategoriesNotFoudException('No categories found')
+
+    def get_category_index(self, use_cache=True) -> CategoryIndex:
+        """Get the category tree indexed by id.
+
+        The index is shared by all the clients with the same ``categories_path`` and it is
+        only fetched again when it is older than ``categories_ttl``.
+
+        Args:
+            use_cache (``bool``): Uses cached categories to reduce API requests.
+
+        Returns:
+            ``CategoryIndex``: The indexed categories.
+
+        Raises:
+            ``CategoriesNotFoudException``
+            ``ApiRequestException``
+            ``ApiRequestResponseException``
+        """
+        index = use_cache and self._get_cached_category_index()
+        if not index:
+            self.get_categories()
+            index = self._category_index
+        return index
 
 
     def get_parent_categories(self, use_cache=True, **kwargs) -> List[models.Category]:
@@ -296,9 +564,7 @@ class AliexpressApi:
             ``ApiRequestException``
             ``ApiRequestResponseException``
         """
-        if not use_cache or not self.categories:
-            self.get_categories()
-        return filter_parent_categories(self.categories)
+        return self.get_category_index(use_cache).get_parents()
 
 
     def get_child_categories(self, parent_category_id: int, use_cache=True, **kwargs) -> List[models.ChildCategory]:
@@ -316,9 +582,28 @@ class AliexpressApi:
             ``ApiRequestException``
             ``ApiRequestResponseException``
         """
-        if not use_cache or not self.categories:
-            self.get_categories()
-        return filter_child_categories(self.categories, parent_category_id)
+        return self.get_category_index(use_cache).get_children(parent_category_id)
+
+
+    def get_category_path(self, category_id: int, use_cache=True) -> List[Union[models.Category, ChildCategory]]:
+        """Get a category and its ancestors, starting from the top level category.
+
+        Useful to resolve the ``second_level_category_id`` of a product.
+
+        Args:
+            category_id (``int``): The category id.
+            use_cache (``bool``): Uses cached categories to reduce API requests.
+
+        Returns:
+            ``list[models.Category | models.ChildCategory]``: The categories in the path,
+            or an empty list if the category does not exist.
+
+        Raises:
+            ``CategoriesNotFoudException``
+            ``ApiRequestException``
+            ``ApiRequestResponseException``
+        """
+        return self.get_category_index(use_cache).get_path(category_id)
 
 
     def smart_match_product(self,
@@ -343,7 +628,8 @@ class AliexpressApi:
             country (``str``): Country code for target location.
             device (``str``): Device type for targeting (e.g., "mobile", "desktop").
             device_id (``str``): Unique device ID.
-            fields (``str | list[str]``): Fields to include in the results list. Defaults to all.
+            fields (``str | list[str] | models.Projection``): Fields to include in the results list.
+                Defaults to all. A projection, like ``models.PRICE_ONLY``, returns slim products.
             keywords (``str``): Search products based on keywords.
             page_no (``int``): Page number of results to fetch.
             product_id (``str``): Specific product ID to match (optional).
@@ -361,30 +647,11 @@ class AliexpressApi:
             ``ApiRequestException``
             ``ApiRequestResponseException``
         """
-        request = aliapi.rest.AliexpressAffiliateProductSmartmatchRequest()
-        request.app = app,
-        request.app_signature = self._app_signature
-        request.country = country
-        request.device = device
-        request.device_id = device_id
-        request.fields = get_list_as_string(fields)
-        request.keywords = keywords
-        request.page_no = page_no
-        request.product_id = product_id
-        request.site = site
-        request.target_currency = target_currency
-        request.target_language = target_language
-        request.tracking_id = tracking_id
-        request.user = user
+        request = self._smart_match_product_request(device_id, app, country, device, fields,
+            keywords, page_no, product_id, site, target_currency, target_language, tracking_id, user)
+        response = self._request(request, 'aliexpress_affiliate_product_smartmatch_response')
+        return self._smart_match_product_response(response, fields)
 
-        response = api_request(request, 'aliexpress_affiliate_product_smartmatch_response')
-
-        if hasattr(response, 'products') and response.products:
-            response.products = parse_products(response.products.product)
-            return response
-        else:
-            raise ProductsNotFoudException('No products found with current parameters')
-        
     def get_order_list(self,
                        status: str,
                        start_time: str,
@@ -393,6 +660,7 @@ class AliexpressApi:
                        locale_site: str = None,
                        page_no: int = None,
                        page_size: int = None,
+                       raw: bool = False,
                        **kwargs) -> models.OrderListResponse:
         """
         Retrieve a list of affiliate orders from AliExpress.
@@ -405,6 +673,7 @@ class AliexpressApi:
             page_no (int): Page number to fetch.
             page_size (int): Number of records per page, up to 50.
             status (str): Status filter for the orders, e.g., 'Payment Completed'.
+            raw (bool): Returns the undecoded ``resp_result`` dict. Defaults to False.
 
         Returns:
             OrderListResponse: Contains response information and the list of orders.
@@ -413,6 +682,446 @@ class AliexpressApi:
             ProductsNotFoundException: If no orders are found for the specified parameters.
             ApiRequestException: If the API request fails.
         """
+        request = self._order_list_request(status, start_time, end_time, fields, locale_site,
+            page_no, page_size)
+        response = self._request(request, 'aliexpress_affiliate_order_list_response', raw)
+        return response if raw else self._order_list_response(response)
+
+
+    def get_order_list_by_index(self,
+                                status: str,
+                                start_time: str,
+                                end_time: str,
+                                fields: Union[str, List[str]] = None,
+                                page_size: int = None,
+                                start_query_index_id: str = None,
+                                raw: bool = False,
+                                **kwargs) -> models.OrderListByIndexResponse:
+        """
+        Retrieve a page of affiliate orders using an index cursor instead of a page number.
+
+        Args:
+            status (str): Status filter for the orders, e.g., 'Payment Completed'.
+            start_time (str): Start time in format 'YYYY-MM-DD HH:MM:SS'.
+            end_time (str): End time in format 'YYYY-MM-DD HH:MM:SS'.
+            fields (str | list[str]): The fields to include in the results list.
+            page_size (int): Number of records per page, up to 50.
+            start_query_index_id (str): The ``max_query_index_id`` of the previous page.
+                Leave empty to get the first page.
+            raw (bool): Returns the undecoded ``resp_result`` dict. Defaults to False.
+
+        Returns:
+            OrderListByIndexResponse: Contains the list of orders and the index cursors.
+
+        Raises:
+            OrdersNotFoundException: If no orders are found for the specified parameters.
+            ApiRequestException: If the API request fails.
+        """
+        request = self._order_list_by_index_request(status, start_time, end_time, fields,
+            page_size, start_query_index_id)
+        response = self._request(request, 'aliexpress_affiliate_order_listbyindex_response', raw)
+        return response if raw else self._order_list_by_index_response(response)
+
+
+    def iter_orders_by_index(self,
+                             status: str,
+                             start_time: str,
+                             end_time: str,
+                             fields: Union[str, List[str]] = None,
+                             page_size: int = MAX_PAGE_SIZE,
+                             start_query_index_id: str = None,
+                             checkpoint: Callable[[str], None] = None,
+                             **kwargs) -> Iterator[models.Order]:
+        """
+        Iterates over all the affiliate orders following the index cursor, one page at a time.
+
+        Only one page is kept in memory. After all the orders of a page have been consumed,
+        ``checkpoint`` is called with the cursor of the next page. Pass the last saved cursor
+        as ``start_query_index_id`` to resume an interrupted iteration.
+
+        Args:
+            status (str): Status filter for the orders, e.g., 'Payment Completed'.
+            start_time (str): Start time in format 'YYYY-MM-DD HH:MM:SS'.
+            end_time (str): End time in format 'YYYY-MM-DD HH:MM:SS'.
+            fields (str | list[str]): The fields to include in the results list.
+            page_size (int): Number of records per page, up to 50. Defaults to 50.
+            start_query_index_id (str): Cursor to resume from. Defaults to the beginning.
+            checkpoint (callable): Receives the cursor of the next page once the current one
+                has been consumed.
+
+        Yields:
+            Order: Each order found.
+
+        Raises:
+            ApiRequestException: If the API request fails.
+        """
+        cursor = start_query_index_id
+        while True:
+            try:
+                response = self.get_order_list_by_index(status, start_time, end_time, fields,
+                    page_size, cursor)
+            except OrdersNotFoundException:
+                return
+
+            for order in response.orders:
+                yield order
+
+            next_cursor = getattr(response, 'max_query_index_id', None)
+            if checkpoint and next_cursor:
+                checkpoint(next_cursor)
+            if not next_cursor or next_cursor == cursor or response.current_record_count < page_size:
+                return
+            cursor = next_cursor
+
+
+    def _iter_products(self, get_page, page_no, page_size, max_items, prefetch, **parameters):
+        def fetch(page):
+            try:
+                return get_page(page_no=page, page_size=page_size, **parameters)
+            except ProductsNotFoudException:
+                return None
+
+        if max_items is not None and max_items <= 0:
+            return
+        prefetch = max(prefetch, 1)
+        last_page = math.inf if max_items is None else page_no - 1 + math.ceil(max_items / page_size)
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=prefetch) as executor:
+            pending = deque([executor.submit(fetch, page_no)])
+            next_page = page_no + 1
+            yielded = 0
+            try:
+                while pending:
+                    response = pending.popleft().result()
+                    if response is None:
+                        return
+
+                    total_records = getattr(response, 'total_record_count', None)
+                    if total_records is not None:
+                        last_page = min(last_page, math.ceil(total_records / page_size))
+                    while next_page <= last_page and len(pending) < prefetch:
+                        pending.append(executor.submit(fetch, next_page))
+                        next_page += 1
+
+                    for product in response.products:
+                        yield product
+                        yielded += 1
+                        if max_items is not None and yielded >= max_items:
+                            return
+            finally:
+                for future in pending:
+                    future.cancel()
+
+
+    def warmup(self, connections: int = 1, timeout: int = 30):
+        """Opens connections to the API before the first call, so it doesn't wait for them.
+
+        Resolves the API domain, connects and, with ``https``, completes the TLS handshake.
+        The connections are kept open for the next calls. Useful when a process starts,
+        before it receives traffic. Forked processes don't inherit them, so in a prefork
+        server call it in each worker.
+
+        Args:
+            connections (``int``): Connections to open, usually the number of calls expected
+                in parallel. Defaults to 1.
+            timeout (``int``): Seconds to wait for each connection. Defaults to 30.
+
+        Raises:
+            ``OSError``: If the API can't be reached.
+        """
+        self._warmup_request().warmup(timeout, connections)
+
+
+    def _warmup_request(self):
+        # Request classes are imported on first use, so they are loaded here too
+        for name in aliapi.rest.__all__:
+            getattr(aliapi.rest, name)
+        request = aliapi.rest.AliexpressAffiliateProductdetailGetRequest()
+        if self._https:
+            request.set_https()
+        return request
+
+
+    def _request(self, request, response_name, raw=False):
+        request.set_app_info(self._app_info)
+        if self._https:
+            request.set_https()
+        if self._compress_requests:
+            request.set_request_compression()
+        cached = self._cache and self._cache.get(request)
+        response = cached or self._get_response(request)
+        result = parse_response(response, response_name, raw)
+        if self._cache and not cached:
+            self._cache.set(request, response)
+        return result
+
+
+    def _transfer_recorder(self, request):
+        # Each upstream call reports its own sizes, including both copies of a hedged call
+        def record(sizes):
+            with self._transfer_lock:
+                transferred = self.transferred[request.getapiname()]
+                transferred['calls'] += 1
+                transferred.update(sizes)
+        return record
+
+
+    def _get_response(self, request):
+        if not self._single_flight:
+            return self._retry_request(request)
+        return self._single_flight.call(request, self._retry_request, request)
+
+
+    def _retry_request(self, request):
+        if not self._retry_policy:
+            return self._hedge_request(request)
+        return self._retry_policy.call(request, self._hedge_request, request)
+
+
+    def _hedge_request(self, request):
+        if not self._hedge_policy:
+            return self._send_request(request)
+        return self._hedge_policy.call(request, self._send_request, request)
+
+
+    def _send_request(self, request):
+        on_transfer = self._transfer_recorder(request)
+        if not self._rate_limiter:
+            return get_response(request, on_transfer)
+
+        self._rate_limiter.acquire(request)
+        try:
+            response = get_response(request, on_transfer)
+        except ApiRequestException as error:
+            self._rate_limiter.update(request, error)
+            raise
+        self._rate_limiter.update(request)
+        return response
+
+
+    def _products_details_chunk(self, product_ids, fields, country):
+        try:
+            request = self._products_details_request(product_ids, fields, country)
+            return self._request(request, 'aliexpress_affiliate_productdetail_get_response')
+        except AliexpressException as error:
+            return error
+
+
+    def _products_details_request(self, product_ids, fields, country):
+        request = aliapi.rest.AliexpressAffiliateProductdetailGetRequest()
+        request.app_signature = self._app_signature
+        request.fields = get_list_as_string(fields)
+        request.product_ids = get_list_as_string(product_ids)
+        request.country = country
+        request.target_currency = self._currency
+        request.target_language = self._language
+        request.tracking_id = self._tracking_id
+        return request
+
+
+    def _products_details_response(self, product_ids, responses, fields=None, chunks=None):
+        # Failed chunks are returned as errors, raised only when no chunk found products
+        model = self._get_response_model(models.ProductsResponse, fields)
+        products = {}
+        failed = {}
+        for chunk, response in zip(chunks or [product_ids], responses):
+            if isinstance(response, AliexpressException):
+                failed.update(dict.fromkeys(chunk, response))
+            elif response.get('current_record_count', 0) > 0:
+                for product in model.from_dict(response).products:
+                    products[str(product.product_id)] = product
+
+        if not products:
+            if failed:
+                raise next(iter(failed.values()))
+            raise ProductsNotFoudException('No products found with current parameters')
+
+        ordered = models.ProductList()
+        for product_id in product_ids:
+            product = products.pop(product_id, None)
+            if product:
+                ordered.append(product)
+            else:
+                ordered.missing_ids.append(product_id)
+                if product_id in failed:
+                    ordered.errors[product_id] = failed[product_id]
+        ordered.extend(products.values())
+        return ordered
+
+
+    def _affiliate_links_request(self, links, link_type):
+        if not self._tracking_id:
+            raise InvalidTrackingIdException('The tracking id is required for affiliate links')
+
+        links = get_list_as_string(links)
+
+        request = aliapi.rest.AliexpressAffiliateLinkGenerateRequest()
+        request.app_signature = self._app_signature
+        request.source_values = links
+        request.promotion_link_type = link_type
+        request.tracking_id = self._tracking_id
+        return request
+
+
+    def _affiliate_links_response(self, response):
+        if response.get('total_result_count', 0) > 0:
+            return [models.AffiliateLink.from_dict(affiliate_link)
+                    for affiliate_link in response['promotion_links']['promotion_link']]
+        else:
+            raise ProductsNotFoudException('Affiliate links not available')
+
+
+    def _affiliate_links_bulk_chunks(self, links, chunk_size):
+        # Links are sent normalized, once for all the forms of the same link
+        normalized = {}
+        for link in links:
+            if link and ',' not in link:
+                normalized.setdefault(get_link_key(link), normalize_link(link))
+        return get_chunks(list(normalized.values()), chunk_size)
+
+
+    def _affiliate_links_bulk_response(self, links, chunks, responses):
+        # The echoed source values are matched by key, as the API may return another form
+        results = {}
+        for chunk, response in zip(chunks, responses):
+            if isinstance(response, AliexpressException):
+                for link in chunk:
+                    results[get_link_key(link)] = (None, str(response))
+                continue
+
+            if response.get('total_result_count', 0) > 0:
+                for affiliate_link in response['promotion_links']['promotion_link']:
+                    results[get_link_key(affiliate_link['source_value'])] = (
+                        affiliate_link.get('promotion_link'), None)
+
+        converted = []
+        for link in links:
+            if not link or ',' in link:
+                converted.append(models.AffiliateLinkResult(link, error='Invalid link'))
+                continue
+            promotion_link, error = results.get(get_link_key(link), (None, 'Affiliate link not available'))
+            converted.append(models.AffiliateLinkResult(link, promotion_link, error))
+        return converted
+
+
+    def _products_request(self, request, category_ids, delivery_days, fields, keywords,
+            max_sale_price, min_sale_price, page_no, page_size, platform_product_type,
+            ship_to_country, sort):
+        request.app_signature = self._app_signature
+        request.category_ids = get_list_as_string(category_ids)
+        request.delivery_days = str(delivery_days)
+        request.fields = get_list_as_string(fields)
+        request.keywords = keywords
+        request.max_sale_price = max_sale_price
+        request.min_sale_price = min_sale_price
+        request.page_no = page_no
+        request.page_size = page_size
+        request.platform_product_type = platform_product_type
+        request.ship_to_country = ship_to_country
+        request.sort = sort
+        request.target_currency = self._currency
+        request.target_language = self._language
+        request.tracking_id = self._tracking_id
+        return request
+
+
+    def _hotproducts_download_request(self, category_id, country, fields, locale_site,
+            page_no, page_size):
+        request = aliapi.rest.AliexpressAffiliateHotproductDownloadRequest()
+        request.app_signature = self._app_signature
+        request.category_id = category_id
+        request.country = country
+        request.fields = get_list_as_string(fields)
+        request.locale_site = locale_site
+        request.page_no = page_no
+        request.page_size = page_size
+        request.target_currency = self._currency
+        request.target_language = self._language
+        request.tracking_id = self._tracking_id
+        return request
+
+
+    def _featured_promos_response(self, response):
+        if response.get('current_record_count', 0) > 0:
+            return [models.Promo.from_dict(promo) for promo in unwrap_list(response['promos'])]
+        else:
+            raise ProductsNotFoudException('No featured promos found')
+
+
+    def _featured_promo_products_request(self, promotion_name, category_id, country, fields,
+            page_no, page_size, promotion_end_time, promotion_start_time, sort):
+        request = aliapi.rest.AliexpressAffiliateFeaturedpromoProductsGetRequest()
+        request.app_signature = self._app_signature
+        request.category_id = category_id
+        request.country = country
+        request.fields = get_list_as_string(fields)
+        request.page_no = page_no
+        request.page_size = page_size
+        request.promotion_end_time = promotion_end_time
+        request.promotion_name = promotion_name
+        request.promotion_start_time = promotion_start_time
+        request.sort = sort
+        request.target_currency = self._currency
+        request.target_language = self._language
+        request.tracking_id = self._tracking_id
+        return request
+
+
+    def _products_response(self, response, model=models.ProductsResponse, fields=None):
+        if response.get('current_record_count', 0) > 0:
+            return self._get_response_model(model, fields).from_dict(response)
+        else:
+            raise ProductsNotFoudException('No products found with current parameters')
+
+
+    def _get_cached_category_index(self):
+        index = get_shared_index(self._categories_path, self._categories_ttl)
+        if index:
+            self.categories = index.categories
+        return index
+
+
+    def _categories_response(self, response):
+        if response.get('total_result_count', 0) > 0:
+            self.categories = [
+                (models.ChildCategory if 'parent_category_id' in category else models.Category).from_dict(category)
+                for category in response['categories']['category']]
+            self._category_index = CategoryIndex(self.categories)
+            set_shared_index(self._category_index, self._categories_path)
+            return self.categories
+        else:
+            raise CategoriesNotFoudException('No categories found')
+
+
+    def _smart_match_product_request(self, device_id, app, country, device, fields, keywords,
+            page_no, product_id, site, target_currency, target_language, tracking_id, user):
+        request = aliapi.rest.AliexpressAffiliateProductSmartmatchRequest()
+        request.app = app,
+        request.app_signature = self._app_signature
+        request.country = country
+        request.device = device
+        request.device_id = device_id
+        request.fields = get_list_as_string(fields)
+        request.keywords = keywords
+        request.page_no = page_no
+        request.product_id = product_id
+        request.site = site
+        request.target_currency = target_currency
+        request.target_language = target_language
+        request.tracking_id = tracking_id
+        request.user = user
+        return request
+
+
+    def _smart_match_product_response(self, response, fields=None):
+        if response.get('products'):
+            return self._get_response_model(models.HotProductsResponse, fields).from_dict(response)
+        else:
+            raise ProductsNotFoudException('No products found with current parameters')
+
+
+    def _order_list_request(self, status, start_time, end_time, fields, locale_site,
+            page_no, page_size):
         request = aliapi.rest.AliexpressAffiliateOrderListRequest()
         request.app_signature = self._app_signature
         request.start_time = start_time
@@ -422,12 +1131,37 @@ class AliexpressApi:
         request.page_no = page_no
         request.page_size = page_size
         request.status = status
+        return request
+
+
+    def _order_list_response(self, response):
+        if response.get('current_record_count', 0) > 0:
+            return models.OrderListResponse.from_dict(response)
+        else:
+            raise OrdersNotFoundException("No orders found for the specified parameters")
+
+
+    def _order_list_by_index_request(self, status, start_time, end_time, fields, page_size,
+            start_query_index_id):
+        request = aliapi.rest.AliexpressAffiliateOrderListbyindexRequest()
+        request.app_signature = self._app_signature
+        request.start_time = start_time
+        request.end_time = end_time
+        request.fields = get_list_as_string(fields)
+        request.page_size = page_size
+        request.start_query_index_id = start_query_index_id
+        request.status = status
+        return request
 
-        response = api_request(request, 'aliexpress_affiliate_order_list_response')
 
-        if response.current_record_count > 0:
-            return response
+    def _order_list_by_index_response(self, response):
+        if response.get('current_record_count', 0) > 0:
+            return models.OrderListByIndexResponse.from_dict(response)
         else:
             raise OrdersNotFoundException("No orders found for the specified parameters")
 
 
+    def _get_response_model(self, model, fields):
+        if isinstance(fields, models.Projection):
+            return fields.get_response_model(model)
+        return model
@@ -0,0 +1,500 @@
+"""Asynchronous AliExpress API wrapper
+
+Provides the same methods as ``AliexpressApi`` as coroutines, using a non-blocking
+transport so many requests can be in flight from a single event loop.
+"""
+
+from .api import AliexpressApi, MAX_PAGE_SIZE, MAX_PRODUCT_IDS, MAX_SOURCE_VALUES
+from .errors import AliexpressException, InvalidTrackingIdException, OrdersNotFoundException
+from .errors import ApiRequestException, ProductsNotFoudException
+from .models.category import ChildCategory
+from .helpers.requests import get_response_async, parse_response
+from .helpers import CategoryIndex
+from .helpers import get_chunks, get_links, get_list_as_string, get_product_ids, get_unique
+from .skd import api as aliapi
+from .skd.api.base import AsyncConnectionPool
+from . import models
+
+from collections import deque
+from typing import AsyncIterator, Callable, List, Union
+import asyncio
+import math
+
+
+class AsyncAliexpressApi(AliexpressApi):
+    """Provides async methods to get information from AliExpress using your API credentials.
+
+    Args:
+        key (str): Your API key.
+        secret (str): Your API secret.
+        language (str): Language code. Defaults to EN.
+        currency (str): Currency code. Defaults to USD.
+        tracking_id (str): The tracking id for link generator. Defaults to None.
+        max_concurrency (int): Maximum number of requests in flight at the same time.
+            Defaults to 100.
+    """
+
+    def __init__(self,
+        key: str,
+        secret: str,
+        language: models.Language,
+        currency: models.Currency,
+        tracking_id: str = None,
+        app_signature: str = None,
+        max_concurrency: int = 100,
+        **kwargs):
+        super().__init__(key, secret, language, currency, tracking_id, app_signature, **kwargs)
+        self._max_concurrency = max_concurrency
+        self._loop = None
+        self._semaphore = None
+        self._pool = None
+
+
+    async def __aenter__(self):
+        return self
+
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+
+    async def close(self):
+        """Closes all the connections kept open by the client."""
+        if self._pool:
+            self._pool.clear()
+
+
+    async def get_products_details(self,
+        product_ids: Union[str, List[str]],
+        fields: Union[str, List[str]] = None,
+        country: str = None,
+        chunk_size: int = MAX_PRODUCT_IDS,
+        **kwargs) -> models.ProductList:
+        """Get products information. See ``AliexpressApi.get_products_details``.
+
+        Chunks are requested concurrently, limited only by ``max_concurrency``.
+        """
+        product_ids = get_unique(get_product_ids(product_ids))
+        chunks = get_chunks(product_ids, chunk_size)
+
+        async def fetch(chunk):
+            try:
+                request = self._products_details_request(chunk, fields, country)
+                return await self._request(request, 'aliexpress_affiliate_productdetail_get_response')
+            except AliexpressException as error:
+                return error
+
+        responses = await asyncio.gather(*[fetch(chunk) for chunk in chunks])
+        return self._products_details_response(product_ids, responses, fields, chunks)
+
+
+    async def get_affiliate_links(self,
+        links: Union[str, List[str]],
+        link_type: models.LinkType = models.LinkType.NORMAL,
+        **kwargs) -> List[models.AffiliateLink]:
+        """Converts a list of links in affiliate links. See ``AliexpressApi.get_affiliate_links``."""
+        request = self._affiliate_links_request(links, link_type)
+        response = await self._request(request, 'aliexpress_affiliate_link_generate_response')
+        return self._affiliate_links_response(response)
+
+
+    async def get_affiliate_links_bulk(self,
+        links: Union[str, List[str]],
+        link_type: models.LinkType = models.LinkType.NORMAL,
+        chunk_size: int = MAX_SOURCE_VALUES,
+        **kwargs) -> List[models.AffiliateLinkResult]:
+        """Converts any number of links in affiliate links. See ``AliexpressApi.get_affiliate_links_bulk``.
+
+        Chunks are requested concurrently, limited only by ``max_concurrency``.
+        """
+        if not self._tracking_id:
+            raise InvalidTrackingIdException('The tracking id is required for affiliate links')
+
+        links = get_links(links)
+        chunks = self._affiliate_links_bulk_chunks(links, chunk_size)
+
+        async def convert(chunk):
+            try:
+                request = self._affiliate_links_request(chunk, link_type)
+                return await self._request(request, 'aliexpress_affiliate_link_generate_response')
+            except AliexpressException as error:
+                return error
+
+        responses = await asyncio.gather(*[convert(chunk) for chunk in chunks])
+        return self._affiliate_links_bulk_response(links, chunks, responses)
+
+
+    async def get_hotproducts(self,
+        category_ids: Union[str, List[str]] = None,
+        delivery_days: int = None,
+        fields: Union[str, List[str]] = None,
+        keywords: str = None,
+        max_sale_price: int = None,
+        min_sale_price: int = None,
+        page_no: int = None,
+        page_size: int = None,
+        platform_product_type: models.ProductType = None,
+        ship_to_country: str = None,
+        sort: models.SortBy = None,
+        raw: bool = False,
+        **kwargs) -> models.HotProductsResponse:
+        """Search for affiliated products with high commission. See ``AliexpressApi.get_hotproducts``."""
+        request = self._products_request(aliapi.rest.AliexpressAffiliateHotproductQueryRequest(),
+            category_ids, delivery_days, fields, keywords, max_sale_price, min_sale_price,
+            page_no, page_size, platform_product_type, ship_to_country, sort)
+        response = await self._request(request, 'aliexpress_affiliate_hotproduct_query_response', raw)
+        return response if raw else self._products_response(response, models.HotProductsResponse, fields)
+
+
+    async def get_products(self,
+        category_ids: Union[str, List[str]] = None,
+        delivery_days: int = None,
+        fields: Union[str, List[str]] = None,
+        keywords: str = None,
+        max_sale_price: int = None,
+        min_sale_price: int = None,
+        page_no: int = None,
+        page_size: int = None,
+        platform_product_type: models.ProductType = None,
+        ship_to_country: str = None,
+        sort: models.SortBy = None,
+        raw: bool = False,
+        **kwargs) -> models.ProductsResponse:
+        """Search for affiliated products. See ``AliexpressApi.get_products``."""
+        request = self._products_request(aliapi.rest.AliexpressAffiliateProductQueryRequest(),
+            category_ids, delivery_days, fields, keywords, max_sale_price, min_sale_price,
+            page_no, page_size, platform_product_type, ship_to_country, sort)
+        response = await self._request(request, 'aliexpress_affiliate_product_query_response', raw)
+        return response if raw else self._products_response(response, fields=fields)
+
+
+    def iter_hotproducts(self,
+        category_ids: Union[str, List[str]] = None,
+        delivery_days: int = None,
+        fields: Union[str, List[str]] = None,
+        keywords: str = None,
+        max_sale_price: int = None,
+        min_sale_price: int = None,
+        page_no: int = 1,
+        page_size: int = MAX_PAGE_SIZE,
+        platform_product_type: models.ProductType = None,
+        ship_to_country: str = None,
+        sort: models.SortBy = None,
+        max_items: int = None,
+        prefetch: int = 1,
+        **kwargs) -> AsyncIterator[models.Product]:
+        """Iterates over the hot products of all the result pages. See ``AliexpressApi.iter_hotproducts``."""
+        return self._iter_products(self.get_hotproducts, page_no, page_size, max_items, prefetch,
+            category_ids=category_ids, delivery_days=delivery_days, fields=fields,
+            keywords=keywords, max_sale_price=max_sale_price, min_sale_price=min_sale_price,
+            platform_product_type=platform_product_type, ship_to_country=ship_to_country, sort=sort)
+
+
+    def iter_products(self,
+        category_ids: Union[str, List[str]] = None,
+        delivery_days: int = None,
+        fields: Union[str, List[str]] = None,
+        keywords: str = None,
+        max_sale_price: int = None,
+        min_sale_price: int = None,
+        page_no: int = 1,
+        page_size: int = MAX_PAGE_SIZE,
+        platform_product_type: models.ProductType = None,
+        ship_to_country: str = None,
+        sort: models.SortBy = None,
+        max_items: int = None,
+        prefetch: int = 1,
+        **kwargs) -> AsyncIterator[models.Product]:
+        """Iterates over the products of all the result pages. See ``AliexpressApi.iter_products``."""
+        return self._iter_products(self.get_products, page_no, page_size, max_items, prefetch,
+            category_ids=category_ids, delivery_days=delivery_days, fields=fields,
+            keywords=keywords, max_sale_price=max_sale_price, min_sale_price=min_sale_price,
+            platform_product_type=platform_product_type, ship_to_country=ship_to_country, sort=sort)
+
+
+    async def download_hotproducts(self,
+        category_id: str = None,
+        country: str = None,
+        fields: Union[str, List[str]] = None,
+        locale_site: str = None,
+        page_no: int = None,
+        page_size: int = None,
+        raw: bool = False,
+        **kwargs) -> models.HotProductsResponse:
+        """Download a page of the hot products of a category. See ``AliexpressApi.download_hotproducts``."""
+        request = self._hotproducts_download_request(category_id, country, fields, locale_site,
+            page_no, page_size)
+        response = await self._request(request, 'aliexpress_affiliate_hotproduct_download_response', raw)
+        return response if raw else self._products_response(response, models.HotProductsResponse, fields)
+
+
+    async def get_featured_promos(self,
+        fields: Union[str, List[str]] = None,
+        **kwargs) -> List[models.Promo]:
+        """Get the featured promotions. See ``AliexpressApi.get_featured_promos``."""
+        request = aliapi.rest.AliexpressAffiliateFeaturedpromoGetRequest()
+        request.app_signature = self._app_signature
+        request.fields = get_list_as_string(fields)
+        response = await self._request(request, 'aliexpress_affiliate_featuredpromo_get_response')
+        return self._featured_promos_response(response)
+
+
+    async def get_featured_promo_products(self,
+        promotion_name: str,
+        category_id: str = None,
+        country: str = None,
+        fields: Union[str, List[str]] = None,
+        page_no: int = None,
+        page_size: int = None,
+        promotion_end_time: str = None,
+        promotion_start_time: str = None,
+        sort: models.SortBy = None,
+        raw: bool = False,
+        **kwargs) -> models.PromoProductsResponse:
+        """Get the products of a featured promotion. See ``AliexpressApi.get_featured_promo_products``."""
+        request = self._featured_promo_products_request(promotion_name, category_id, country,
+            fields, page_no, page_size, promotion_end_time, promotion_start_time, sort)
+        response = await self._request(request, 'aliexpress_affiliate_featuredpromo_products_get_response', raw)
+        return response if raw else self._products_response(response, models.PromoProductsResponse, fields)
+
+
+    async def get_categories(self, **kwargs) -> List[Union[models.Category, ChildCategory]]:
+        """Get all available categories, both parent and child. See ``AliexpressApi.get_categories``."""
+        request = aliapi.rest.AliexpressAffiliateCategoryGetRequest()
+        request.app_signature = self._app_signature
+
+        response = await self._request(request, 'aliexpress_affiliate_category_get_response')
+        return await self._run_file_io(self._categories_response, response)
+
+
+    async def get_category_index(self, use_cache=True) -> CategoryIndex:
+        """Get the category tree indexed by id. See ``AliexpressApi.get_category_index``."""
+        index = use_cache and await self._run_file_io(self._get_cached_category_index)
+        if not index:
+            await self.get_categories()
+            index = self._category_index
+        return index
+
+
+    async def get_parent_categories(self, use_cache=True, **kwargs) -> List[models.Category]:
+        """Get all available parent categories. See ``AliexpressApi.get_parent_categories``."""
+        return (await self.get_category_index(use_cache)).get_parents()
+
+
+    async def get_child_categories(self, parent_category_id: int, use_cache=True, **kwargs) -> List[models.ChildCategory]:
+        """Get all available child categories for a specific parent category.
+        See ``AliexpressApi.get_child_categories``.
+        """
+        return (await self.get_category_index(use_cache)).get_children(parent_category_id)
+
+
+    async def get_category_path(self, category_id: int, use_cache=True) -> List[Union[models.Category, ChildCategory]]:
+        """Get a category and its ancestors. See ``AliexpressApi.get_category_path``."""
+        return (await self.get_category_index(use_cache)).get_path(category_id)
+
+
+    async def smart_match_product(self,
+            device_id: str,
+            app: str = None,
+            country: str = None,
+            device: str = None,
+            fields: Union[str, List[str]] = None,
+            keywords: str = None,
+            page_no: int = None,
+            product_id: str = None,
+            site: str = None,
+            target_currency: str = None,
+            target_language: str = None,
+            tracking_id: str = None,
+            user: str = None,
+            **kwargs) -> models.HotProductsResponse:
+        """Get affiliated products using smart match. See ``AliexpressApi.smart_match_product``."""
+        request = self._smart_match_product_request(device_id, app, country, device, fields,
+            keywords, page_no, product_id, site, target_currency, target_language, tracking_id, user)
+        response = await self._request(request, 'aliexpress_affiliate_product_smartmatch_response')
+        return self._smart_match_product_response(response, fields)
+
+
+    async def get_order_list(self,
+                       status: str,
+                       start_time: str,
+                       end_time: str,
+                       fields: Union[str, List[str]] = None,
+                       locale_site: str = None,
+                       page_no: int = None,
+                       page_size: int = None,
+                       raw: bool = False,
+                       **kwargs) -> models.OrderListResponse:
+        """Retrieve a list of affiliate orders from AliExpress. See ``AliexpressApi.get_order_list``."""
+        request = self._order_list_request(status, start_time, end_time, fields, locale_site,
+            page_no, page_size)
+        response = await self._request(request, 'aliexpress_affiliate_order_list_response', raw)
+        return response if raw else self._order_list_response(response)
+
+
+    async def get_order_list_by_index(self,
+                                      status: str,
+                                      start_time: str,
+                                      end_time: str,
+                                      fields: Union[str, List[str]] = None,
+                                      page_size: int = None,
+                                      start_query_index_id: str = None,
+                                      raw: bool = False,
+                                      **kwargs) -> models.OrderListByIndexResponse:
+        """Retrieve a page of affiliate orders using an index cursor.
+        See ``AliexpressApi.get_order_list_by_index``.
+        """
+        request = self._order_list_by_index_request(status, start_time, end_time, fields,
+            page_size, start_query_index_id)
+        response = await self._request(request, 'aliexpress_affiliate_order_listbyindex_response', raw)
+        return response if raw else self._order_list_by_index_response(response)
+
+
+    async def iter_orders_by_index(self,
+                                   status: str,
+                                   start_time: str,
+                                   end_time: str,
+                                   fields: Union[str, List[str]] = None,
+                                   page_size: int = MAX_PAGE_SIZE,
+                                   start_query_index_id: str = None,
+                                   checkpoint: Callable[[str], None] = None,
+                                   **kwargs) -> AsyncIterator[models.Order]:
+        """Iterates over all the affiliate orders following the index cursor.
+        See ``AliexpressApi.iter_orders_by_index``.
+        """
+        cursor = start_query_index_id
+        while True:
+            try:
+                response = await self.get_order_list_by_index(status, start_time, end_time, fields,
+                    page_size, cursor)
+            except OrdersNotFoundException:
+                return
+
+            for order in response.orders:
+                yield order
+
+            next_cursor = getattr(response, 'max_query_index_id', None)
+            if checkpoint and next_cursor:
+                checkpoint(next_cursor)
+            if not next_cursor or next_cursor == cursor or response.current_record_count < page_size:
+                return
+            cursor = next_cursor
+
+
+    async def _iter_products(self, get_page, page_no, page_size, max_items, prefetch, **parameters):
+        async def fetch(page):
+            try:
+                return await get_page(page_no=page, page_size=page_size, **parameters)
+            except ProductsNotFoudException:
+                return None
+
+        if max_items is not None and max_items <= 0:
+            return
+        prefetch = max(prefetch, 1)
+        last_page = math.inf if max_items is None else page_no - 1 + math.ceil(max_items / page_size)
+        pending = deque([asyncio.ensure_future(fetch(page_no))])
+        next_page = page_no + 1
+        yielded = 0
+        try:
+            while pending:
+                response = await pending.popleft()
+                if response is None:
+                    return
+
+                total_records = getattr(response, 'total_record_count', None)
+                if total_records is not None:
+                    last_page = min(last_page, math.ceil(total_records / page_size))
+                while next_page <= last_page and len(pending) < prefetch:
+                    pending.append(asyncio.ensure_future(fetch(next_page)))
+                    next_page += 1
+
+                for product in response.products:
+                    yield product
+                    yielded += 1
+                    if max_items is not None and yielded >= max_items:
+                        return
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+    async def warmup(self, connections: int = 1, timeout: int = 30):
+        """Opens connections to the API before the first call, so it doesn't wait for them.
+
+        Args:
+            connections (``int``): Connections to open. Defaults to 1.
+            timeout (``int``): Seconds to wait for each connection. Defaults to 30.
+        """
+        self._check_loop()
+        await self._warmup_request().warmup_async(self._pool, timeout, connections)
+
+
+    async def _request(self, request, response_name, raw=False):
+        self._check_loop()
+        request.set_app_info(self._app_info)
+        if self._https:
+            request.set_https()
+        if self._compress_requests:
+            request.set_request_compression()
+        cached = self._cache and await self._cache.get_async(request)
+        if cached:
+            return parse_response(cached, response_name, raw)
+
+        response = await self._get_response(request)
+        result = parse_response(response, response_name, raw)
+        if self._cache:
+            await self._cache.set_async(request, response)
+        return result
+
+
+    async def _run_file_io(self, function, *args):
+        # The category index is read and written from a thread when it is kept in a file
+        if not self._categories_path:
+            return function(*args)
+        return await asyncio.get_running_loop().run_in_executor(None, function, *args)
+
+
+    def _check_loop(self):
+        # Connections and semaphores belong to the event loop they were created in
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            if self._pool:
+                self._pool.clear()
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+            self._pool = AsyncConnectionPool(maxsize=self._max_concurrency)
+
+
+    async def _get_response(self, request):
+        if not self._single_flight:
+            return await self._retry_request(request)
+        return await self._single_flight.call_async(request, self._retry_request, request)
+
+
+    async def _retry_request(self, request):
+        if not self._retry_policy:
+            return await self._hedge_request(request)
+        return await self._retry_policy.call_async(request, self._hedge_request, request)
+
+
+    async def _hedge_request(self, request):
+        if not self._hedge_policy:
+            return await self._send_request(request)
+        return await self._hedge_policy.call_async(request, self._send_request, request)
+
+
+    async def _send_request(self, request):
+        on_transfer = self._transfer_recorder(request)
+        if not self._rate_limiter:
+            async with self._semaphore:
+                return await get_response_async(request, self._pool, on_transfer)
+
+        await self._rate_limiter.acquire_async(request)
+        try:
+            async with self._semaphore:
+                response = await get_response_async(request, self._pool, on_transfer)
+        except ApiRequestException as error:
+            self._rate_limiter.update(request, error)
+            raise
+        self._rate_limiter.update(request)
+        return response
@@ -0,0 +1,232 @@
+"""Pool of API clients
+
+Spreads the calls over several clients, each one with its own credentials, so the
+throughput is not limited by the quota of a single app.
+"""
+
+from .api import AliexpressApi
+from .errors import InvalidArgumentException
+
+from typing import List
+import asyncio
+import functools
+import inspect
+import itertools
+import threading
+
+
+ROUND_ROBIN = 'round_robin'
+LEAST_LOADED = 'least_loaded'
+
+API_METHODS = {
+    'get_products_details': 'aliexpress.affiliate.productdetail.get',
+    'get_affiliate_links': 'aliexpress.affiliate.link.generate',
+    'get_affiliate_links_bulk': 'aliexpress.affiliate.link.generate',
+    'get_hotproducts': 'aliexpress.affiliate.hotproduct.query',
+    'get_products': 'aliexpress.affiliate.product.query',
+    'iter_hotproducts': 'aliexpress.affiliate.hotproduct.query',
+    'iter_products': 'aliexpress.affiliate.product.query',
+    'download_hotproducts': 'aliexpress.affiliate.hotproduct.download',
+    'get_categories': 'aliexpress.affiliate.category.get',
+    'get_featured_promos': 'aliexpress.affiliate.featuredpromo.get',
+    'get_featured_promo_products': 'aliexpress.affiliate.featuredpromo.products.get',
+    'smart_match_product': 'aliexpress.affiliate.product.smartmatch',
+    'get_order_list': 'aliexpress.affiliate.order.list',
+    'get_order_list_by_index': 'aliexpress.affiliate.order.listbyindex',
+    'iter_orders_by_index': 'aliexpress.affiliate.order.listbyindex',
+}
+
+
+class ClientPool:
+    """Sends each call through one of several clients and provides the same methods as them.
+
+    With ``round_robin`` the clients are used in turns. With ``least_loaded`` the call goes
+    to the client whose rate limiter allows its next call for that API method sooner, and
+    then to the one with fewer calls in progress. Iterators, like ``iter_products``, are in
+    progress until they are exhausted or closed.
+
+    Args:
+        clients (list[AliexpressApi]): The clients, sync or async, e.g., one per app key.
+        strategy (str): 'round_robin' or 'least_loaded'. Defaults to round_robin.
+    """
+
+    def __init__(self, clients: List[AliexpressApi], strategy: str = ROUND_ROBIN):
+        if not clients:
+            raise InvalidArgumentException('At least one client is required')
+        if strategy not in (ROUND_ROBIN, LEAST_LOADED):
+            raise InvalidArgumentException('Strategy should be round_robin or least_loaded')
+
+        self.clients = list(clients)
+        self.strategy = strategy
+        self.calls = [0] * len(self.clients)
+        self._in_progress = [0] * len(self.clients)
+        self._turns = itertools.count()
+        self._lock = threading.Lock()
+
+
+    @classmethod
+    def from_credentials(cls, credentials: List[dict], language, currency,
+                         client_class=AliexpressApi, strategy: str = ROUND_ROBIN, **kwargs):
+        """Creates a pool with a client for each set of credentials.
+
+        Args:
+            credentials (``list[dict]``): Arguments of each client, at least ``key`` and
+                ``secret``, usually also ``tracking_id`` and its own ``rate_limiter``.
+            language (``models.Language``): Language code for all the clients.
+            currency (``models.Currency``): Currency code for all the clients.
+            client_class (``type``): ``AliexpressApi`` or ``AsyncAliexpressApi``.
+            strategy (``str``): 'round_robin' or 'least_loaded'.
+            **kwargs: Arguments shared by all the clients, like ``cache``.
+
+        Returns:
+            ``ClientPool``: The pool.
+        """
+        clients = [client_class(language=language, currency=currency, **dict(kwargs, **credential))
+                   for credential in credentials]
+        return cls(clients, strategy)
+
+
+    def get_client(self, method: str = None) -> AliexpressApi:
+        """Returns the client that would be used next for an API method."""
+        return self.clients[self._select(method)]
+
+
+    async def __aenter__(self):
+        return self
+
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+
+    async def close(self):
+        """Closes the connections of the async clients."""
+        for client in self.clients:
+            if hasattr(client, 'close'):
+                await client.close()
+
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+        attribute = getattr(self.clients[0], name)
+        if not callable(attribute):
+            return attribute
+
+        method = API_METHODS.get(name)
+        if asyncio.iscoroutinefunction(attribute):
+            @functools.wraps(attribute)
+            async def call(*args, **kwargs):
+                index = self._acquire(method)
+                try:
+                    return await getattr(self.clients[index], name)(*args, **kwargs)
+                finally:
+                    self._release(index)
+        else:
+            @functools.wraps(attribute)
+            def call(*args, **kwargs):
+                index = self._acquire(method)
+                try:
+                    result = getattr(self.clients[index], name)(*args, **kwargs)
+                except BaseException:
+                    self._release(index)
+                    raise
+                release = functools.partial(self._release, index)
+                if inspect.isgenerator(result):
+                    return _HeldIterator(result, release)
+                if inspect.isasyncgen(result):
+                    return _HeldAsyncIterator(result, release)
+                release()
+                return result
+        return call
+
+
+    def _acquire(self, method):
+        with self._lock:
+            index = self._select(method)
+            self.calls[index] += 1
+            self._in_progress[index] += 1
+            return index
+
+
+    def _release(self, index):
+        with self._lock:
+            self._in_progress[index] -= 1
+
+
+    def _select(self, method):
+        # Starting from the next turn spreads the calls when the clients are equally loaded
+        turn = next(self._turns) % len(self.clients)
+        if self.strategy == ROUND_ROBIN:
+            return turn
+
+        indexes = [(turn + position) % len(self.clients) for position in range(len(self.clients))]
+        return max(indexes, key=lambda index: (
+            self._get_available(self.clients[index], method), -self._in_progress[index]))
+
+
+    def _get_available(self, client, method):
+        # Seconds until the next call is allowed, as a negative number, zero when it is now.
+        # A call needs a whole token
+        limiter = client._rate_limiter
+        if limiter is None or method is None:
+            return 0
+        return min(limiter.get_available(method) - 1, 0) / limiter.get_rate(method)
+
+
+class _HeldIterator:
+    """Iterates the pages of a client, calling ``release`` once when it ends or is closed."""
+
+    def __init__(self, iterator, release):
+        self._iterator = iterator
+        self._release = release
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return next(self._iterator)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        release, self._release = self._release, None
+        if release:
+            self._iterator.close()
+            release()
+
+    def __del__(self):
+        self.close()
+
+
+class _HeldAsyncIterator:
+    """Async version of ``_HeldIterator``."""
+
+    def __init__(self, iterator, release):
+        self._iterator = iterator
+        self._release = release
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return await self._iterator.__anext__()
+        except BaseException:
+            await self.aclose()
+            raise
+
+    async def aclose(self):
+        release, self._release = self._release, None
+        if release:
+            await self._iterator.aclose()
+            release()
+
+    def __del__(self):
+        # The event loop closes the iterator itself, only the client needs releasing
+        release, self._release = self._release, None
+        if release:
+            release()
@@ -1,4 +1,22 @@
-from .requests import api_request
-from .arguments import get_list_as_string, get_product_ids
-from .products import parse_products
+from .requests import api_request, get_response, parse_response
+from .arguments import get_list_as_string, get_product_ids, get_unique, get_chunks, get_links
+from .arguments import normalize_link, get_link_key
 from .categories import filter_parent_categories, filter_child_categories
+from .categories import CategoryIndex, get_shared_index, set_shared_index
+
+from .lazy import lazy_imports
+
+
+LAZY_IMPORTS = {
+    'ResponseCache': '.cache',
+    'CacheBackend': '.cache',
+    'MemoryCache': '.cache',
+    'SqliteCache': '.cache',
+    'RateLimiter': '.rate_limit',
+    'RetryPolicy': '.retry',
+    'HedgePolicy': '.hedge',
+    'SingleFlight': '.single_flight',
+}
+
+
+__getattr__, __dir__ = lazy_imports(__name__, LAZY_IMPORTS)
@@ -1,5 +1,8 @@
 from ..tools.get_product_id import get_product_id
 from ..errors.exceptions import InvalidArgumentException
+from ..models.projection import Projection
+
+import urllib.parse
 
 
 def get_list_as_string(value):
@@ -9,6 +12,9 @@ def get_list_as_string(value):
     if isinstance(value, str):
         return value
 
+    elif isinstance(value, Projection):
+        return ','.join(value.fields)
+
     elif isinstance(value, list):
         return ','.join(value)
 
@@ -28,3 +34,46 @@ def get_product_ids(values):
         product_ids.append(get_product_id(value))
 
     return product_ids
+
+
+def get_unique(values):
+    return list(dict.fromkeys(values))
+
+
+def get_chunks(values, size):
+    if size < 1:
+        raise InvalidArgumentException('Chunk size should be greater than 0')
+
+    return [values[i:i + size] for i in range(0, len(values), size)]
+
+
+def get_links(values):
+    if isinstance(values, str):
+        values = values.split(',')
+
+    elif not isinstance(values, list):
+        raise InvalidArgumentException('Argument links should be a list or string')
+
+    return [value.strip() for value in values]
+
+
+def normalize_link(link):
+    """Returns the form of a link sent to the API: stripped, with an https scheme and a
+    lowercase host, without fragment, default port or trailing slash."""
+    link = link.strip()
+    if '://' not in link:
+        link = 'https://' + link.lstrip('/')
+    parts = urllib.parse.urlsplit(link)
+    scheme = parts.scheme.lower()
+    if scheme == 'http':
+        scheme = 'https'
+    host = parts.netloc.lower()
+    if host.endswith(':80') or host.endswith(':443'):
+        host = host.rsplit(':', 1)[0]
+    return urllib.parse.urlunsplit((scheme, host, parts.path.rstrip('/'), parts.query, ''))
+
+
+def get_link_key(link):
+    """Returns the key that matches a link with the ``source_value`` echoed by the API,
+    whatever form of the link either of them uses."""
+    return urllib.parse.unquote(normalize_link(link))
@@ -0,0 +1,181 @@
+"""Opt-in cache for the responses of read endpoints."""
+
+from collections import Counter, OrderedDict
+import json
+import threading
+import time
+
+
+DEFAULT_TTL = {
+    'aliexpress.affiliate.productdetail.get': 300,
+    'aliexpress.affiliate.product.query': 300,
+    'aliexpress.affiliate.hotproduct.query': 300,
+    'aliexpress.affiliate.category.get': 86400,
+}
+
+
+class CacheBackend:
+    """Storage used by ``ResponseCache``. Values are raw response bodies.
+
+    The async client calls backends that do ``blocking`` I/O from a thread, so the event
+    loop keeps running while they read or write.
+    """
+    blocking = True
+
+    def get(self, key: str):
+        """Returns the stored value or None if it does not exist or has expired."""
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: float):
+        """Stores a value for ``ttl`` seconds."""
+        raise NotImplementedError
+
+    def clear(self):
+        """Removes all stored values."""
+        raise NotImplementedError
+
+
+class MemoryCache(CacheBackend):
+    """In-memory backend with least recently used eviction.
+
+    Args:
+        maxsize (int): Maximum number of stored responses. Defaults to 1024.
+    """
+    blocking = False
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            if item[0] < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return item[1]
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class SqliteCache(CacheBackend):
+    """Local SQLite backend with least recently used eviction, shared between processes.
+
+    Eviction runs every ``maxsize // 10`` writes, so the size may briefly exceed the limit.
+
+    Args:
+        path (str): Database file path.
+        maxsize (int): Maximum number of stored responses. Defaults to 100000.
+    """
+
+    def __init__(self, path: str, maxsize: int = 100000):
+        import sqlite3
+        self.maxsize = maxsize
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute('CREATE TABLE IF NOT EXISTS responses '
+                         '(key TEXT PRIMARY KEY, value BLOB, expires REAL, used REAL)')
+        self._db.execute('CREATE INDEX IF NOT EXISTS responses_used ON responses (used)')
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._db.execute('SELECT value, expires FROM responses WHERE key = ?',
+                                   (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] < now:
+                self._db.execute('DELETE FROM responses WHERE key = ?', (key,))
+                return None
+            self._db.execute('UPDATE responses SET used = ? WHERE key = ?', (now, key))
+        return row[0]
+
+    def set(self, key, value, ttl):
+        now = time.time()
+        with self._lock:
+            self._db.execute('INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)',
+                             (key, value, now + ttl, now))
+            self._writes += 1
+            if self._writes > self.maxsize // 10:
+                self._writes = 0
+                self._db.execute('DELETE FROM responses WHERE key IN (SELECT key FROM responses '
+                                 'ORDER BY used DESC LIMIT -1 OFFSET ?)', (self.maxsize,))
+
+    def clear(self):
+        with self._lock:
+            self._db.execute('DELETE FROM responses')
+
+
+class ResponseCache:
+    """Caches API responses by method and request parameters.
+
+    Only the methods with a TTL are cached, by default product details, product and
+    hot product searches and categories.
+
+    Args:
+        backend (CacheBackend): Where responses are stored. Defaults to ``MemoryCache()``.
+        ttl (dict): Seconds to keep the responses of each API method, merged with the
+            defaults. Set a method to 0 to disable its cache.
+    """
+
+    def __init__(self, backend: CacheBackend = None, ttl: dict = None):
+        self.backend = backend or MemoryCache()
+        self.ttl = dict(DEFAULT_TTL, **(ttl or {}))
+        self.hits = Counter()
+        self.misses = Counter()
+        self._lock = threading.Lock()
+
+    def get(self, request):
+        method = request.getapiname()
+        if not self.ttl.get(method):
+            return None
+
+        response = self.backend.get(get_cache_key(request))
+        with self._lock:
+            if response is None:
+                self.misses[method] += 1
+            else:
+                self.hits[method] += 1
+        return response
+
+    def set(self, request, response):
+        ttl = self.ttl.get(request.getapiname())
+        if ttl:
+            self.backend.set(get_cache_key(request), response, ttl)
+
+    async def get_async(self, request):
+        """Like ``get``, reading blocking backends from a thread."""
+        if not self.backend.blocking or not self.ttl.get(request.getapiname()):
+            return self.get(request)
+        import asyncio
+        return await asyncio.get_running_loop().run_in_executor(None, self.get, request)
+
+    async def set_async(self, request, response):
+        """Like ``set``, writing to blocking backends from a thread."""
+        if not self.backend.blocking or not self.ttl.get(request.getapiname()):
+            return self.set(request, response)
+        import asyncio
+        await asyncio.get_running_loop().run_in_executor(None, self.set, request, response)
+
+    def clear(self):
+        self.backend.clear()
+
+
+def get_cache_key(request):
+    parameters = request.getApplicationParameters()
+    return request.getapiname() + json.dumps(parameters, sort_keys=True, separators=(',', ':'),
+                                             default=str)
@@ -1,6 +1,117 @@
-from typing import List, Union
+from typing import Dict, List, Optional, Union
 from .. import models
 
+import json
+import os
+import threading
+import time
+
+
+CATEGORIES_TTL = 86400
+
+_shared_indexes = {}
+_shared_lock = threading.Lock()
+
+
+class CategoryIndex:
+    """Category tree indexed by id, so lookups do not scan the whole list.
+
+    Args:
+        categories (``list[models.Category | models.ChildCategory]``): All the categories.
+        created (``float``): Timestamp when the categories were fetched. Defaults to now.
+    """
+
+    def __init__(self, categories: List[Union[models.Category, models.ChildCategory]], created: float = None):
+        self.categories = categories
+        self.created = created or time.time()
+        self._categories: Dict[int, models.Category] = {}
+        self._parents: List[models.Category] = []
+        self._children: Dict[int, List[models.ChildCategory]] = {}
+
+        for category in categories:
+            self._categories[category.category_id] = category
+            parent_category_id = getattr(category, 'parent_category_id', None)
+            if parent_category_id is None:
+                self._parents.append(category)
+            else:
+                self._children.setdefault(parent_category_id, []).append(category)
+
+    def get(self, category_id: int) -> Optional[Union[models.Category, models.ChildCategory]]:
+        """Returns the category with the given id, or None if it does not exist."""
+        return self._categories.get(to_category_id(category_id))
+
+    def get_parents(self) -> List[models.Category]:
+        """Returns the top level categories."""
+        return list(self._parents)
+
+    def get_children(self, parent_category_id: int) -> List[models.ChildCategory]:
+        """Returns the direct children of a category."""
+        return list(self._children.get(to_category_id(parent_category_id), []))
+
+    def get_path(self, category_id: int) -> List[Union[models.Category, models.ChildCategory]]:
+        """Returns the categories from the top level one down to the given category.
+
+        Products reference their categories with ``first_level_category_id`` and
+        ``second_level_category_id``; the path of the latter includes both.
+        """
+        path = []
+        category = self.get(category_id)
+        while category is not None and category not in path:
+            path.append(category)
+            category = self._categories.get(getattr(category, 'parent_category_id', None))
+        path.reverse()
+        return path
+
+    def is_expired(self, ttl: float) -> bool:
+        return time.time() - self.created > ttl
+
+    def save(self, path: str):
+        """Writes the categories to a JSON file, replacing it atomically."""
+        data = {'created': self.created,
+                'categories': [category.to_dict() for category in self.categories]}
+        temporary_path = path + '.tmp'
+        with open(temporary_path, 'w') as index_file:
+            json.dump(data, index_file)
+        os.replace(temporary_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional['CategoryIndex']:
+        """Reads the categories saved with ``save``. Returns None if the file is missing or invalid."""
+        try:
+            with open(path) as index_file:
+                data = json.load(index_file)
+            categories = [
+                (models.ChildCategory if 'parent_category_id' in category else models.Category).from_dict(category)
+                for category in data['categories']]
+            return cls(categories, data['created'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+
+def get_shared_index(path: str = None, ttl: float = CATEGORIES_TTL) -> Optional[CategoryIndex]:
+    with _shared_lock:
+        index = _shared_indexes.get(path)
+        if path and (index is None or index.is_expired(ttl)):
+            index = CategoryIndex.load(path)
+            if index:
+                _shared_indexes[path] = index
+        if index is None or index.is_expired(ttl):
+            return None
+        return index
+
+
+def set_shared_index(index: CategoryIndex, path: str = None):
+    with _shared_lock:
+        _shared_indexes[path] = index
+        if path:
+            index.save(path)
+
+
+def to_category_id(category_id):
+    if isinstance(category_id, str) and category_id.isdigit():
+        return int(category_id)
+    return category_id
+
 
 def filter_parent_categories(categories: List[Union[models.Category, models.ChildCategory]]) -> List[models.Category]:
     filtered_categories = []
@@ -0,0 +1,162 @@
+"""Hedged requests: slow calls are sent twice and the first answer wins."""
+
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import threading
+import time
+
+
+HEDGE_METHODS = (
+    'aliexpress.affiliate.link.generate',
+    'aliexpress.affiliate.productdetail.get',
+)
+
+
+class HedgePolicy:
+    """Sends a copy of the calls that take longer than usual and uses the first answer.
+
+    The wait before sending the copy is the ``percentile`` of the latest latencies of the
+    method, so only the slowest calls are duplicated. Copies are limited by a budget shared
+    by all the calls: each call adds ``max_ratio`` copies to it, up to ``max_budget``.
+
+    Args:
+        percentile (float): Latency percentile used as the wait. Defaults to 95.
+        min_delay (float): Minimum wait in seconds, also used until there are enough
+            latencies. Defaults to 0.05.
+        max_ratio (float): Maximum share of calls that are sent twice. Defaults to 0.05.
+        max_budget (float): Maximum copies saved in the budget. Defaults to 10.
+        window (int): Number of latencies kept per method. Defaults to 1000.
+        max_workers (int): Threads used to send the calls of the sync client. Defaults to 64.
+        methods (tuple): API methods that can be sent twice. Defaults to product details
+            and affiliate links.
+    """
+
+    def __init__(self, percentile: float = 95, min_delay: float = 0.05, max_ratio: float = 0.05,
+                 max_budget: float = 10, window: int = 1000, max_workers: int = 64,
+                 methods: tuple = HEDGE_METHODS):
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.max_ratio = max_ratio
+        self.max_budget = max_budget
+        self.window = window
+        self.max_workers = max_workers
+        self.methods = methods
+        self.hedged = Counter()
+        self.won = Counter()
+        self._lock = threading.Lock()
+        self._tokens = max_budget
+        self._latencies = {}
+        self._samples = Counter()
+        self._delays = {}
+        self._executor = None
+
+    def call(self, request, function, *args):
+        """Calls ``function(*args)`` to send the request, and again if it is slow."""
+        method = request.getapiname()
+        if method not in self.methods:
+            return function(*args)
+
+        delay = self._start(method)
+        executor = self._get_executor()
+        primary = executor.submit(self._timed, method, function, *args)
+        if wait([primary], timeout=delay).done or not self._take(method):
+            return primary.result()
+
+        hedge = executor.submit(function, *args)
+        pending = {primary, hedge}
+        while True:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        self._won(method)
+                    return future.result()
+            if not pending:
+                return primary.result()
+
+    async def call_async(self, request, function, *args):
+        """Awaits ``function(*args)`` to send the request, and again if it is slow."""
+        import asyncio
+        method = request.getapiname()
+        if method not in self.methods:
+            return await function(*args)
+
+        delay = self._start(method)
+        primary = asyncio.ensure_future(function(*args))
+        started = time.monotonic()
+        primary.add_done_callback(
+            lambda task: task.cancelled() or self._add_latency(method, time.monotonic() - started))
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done or not self._take(method):
+            return await primary
+
+        hedge = asyncio.ensure_future(function(*args))
+        pending = {primary, hedge}
+        try:
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self._won(method)
+                        return task.result()
+                if not pending:
+                    return primary.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def get_delay(self, method: str) -> float:
+        """Returns the time a call waits before it is sent again."""
+        return self._delays.get(method, self.min_delay)
+
+    def close(self):
+        """Stops the threads used by the sync client."""
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _start(self, method):
+        with self._lock:
+            self._tokens = min(self.max_budget, self._tokens + self.max_ratio)
+        return self.get_delay(method)
+
+    def _take(self, method):
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            self.hedged[method] += 1
+            return True
+
+    def _won(self, method):
+        with self._lock:
+            self.won[method] += 1
+
+    def _timed(self, method, function, *args):
+        started = time.monotonic()
+        try:
+            return function(*args)
+        finally:
+            self._add_latency(method, time.monotonic() - started)
+
+    def _add_latency(self, method, latency):
+        with self._lock:
+            latencies = self._latencies.get(method)
+            if latencies is None:
+                latencies = self._latencies[method] = deque(maxlen=self.window)
+            latencies.append(latency)
+            self._samples[method] += 1
+
+            # Sorting on every call would cost more than the hedge saves
+            if self._samples[method] % max(self.window // 10, 1) == 0:
+                ordered = sorted(latencies)
+                index = min(int(len(ordered) * self.percentile / 100), len(ordered) - 1)
+                self._delays[method] = max(self.min_delay, ordered[index])
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(self.max_workers)
+        return self._executor
@@ -0,0 +1,22 @@
+"""Module attributes imported on first use."""
+
+import importlib
+import sys
+
+
+def lazy_imports(module_name: str, imports: dict):
+    """Returns the ``__getattr__`` and ``__dir__`` of a module whose ``imports``, a dict of
+    attribute names to the relative modules that define them, are imported on first use."""
+    module = sys.modules[module_name]
+
+    def __getattr__(name):
+        if name not in imports:
+            raise AttributeError(f"module '{module_name}' has no attribute '{name}'")
+        value = getattr(importlib.import_module(imports[name], module_name), name)
+        setattr(module, name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(vars(module)) | set(imports))
+
+    return __getattr__, __dir__
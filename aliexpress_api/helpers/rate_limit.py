@@ -0,0 +1,132 @@
+"""Client side rate limiting of the API calls."""
+
+from ..skd.api.base import RequestException, TopException
+
+from collections import Counter
+import threading
+import time
+
+
+THROTTLE_ERROR_CODES = ('7',)
+THROTTLE_SUB_CODES = ('call-limited', 'call-exceeds-limit', 'limited-by-api-access-count')
+
+# Throttled calls already in flight when the rate was lowered do not lower it again
+DECREASE_INTERVAL = 1
+
+
+class RateLimiter:
+    """Limits the calls per second to each API method with a token bucket per method.
+
+    It can be shared by several clients using the same API key, from threads or event loops.
+    When a call is throttled by AliExpress the rate of its method is halved, then it grows
+    back by ``increase`` calls per second every second until it reaches the limit again.
+
+    Args:
+        rate (float): Calls per second allowed for each method. Defaults to 10.
+        rates (dict): Calls per second of specific methods, overriding ``rate``.
+        burst (int): Calls that can be sent at once after being idle. Defaults to 1.
+        adaptive (bool): Lowers the rate when calls are throttled. Defaults to True.
+        min_rate (float): The rate is never lowered below this. Defaults to 0.5.
+        increase (float): Calls per second the rate grows every second without throttling.
+            Defaults to 1.
+    """
+
+    def __init__(self, rate: float = 10, rates: dict = None, burst: int = 1,
+                 adaptive: bool = True, min_rate: float = 0.5, increase: float = 1):
+        self.rate = rate
+        self.rates = rates or {}
+        self.burst = burst
+        self.adaptive = adaptive
+        self.min_rate = min_rate
+        self.increase = increase
+        self.throttled = Counter()
+        self._lock = threading.Lock()
+        self._buckets = {}
+
+    def acquire(self, request):
+        """Blocks until the request can be sent."""
+        delay = self._reserve(request.getapiname())
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, request):
+        """Waits without blocking the event loop until the request can be sent."""
+        import asyncio
+        delay = self._reserve(request.getapiname())
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def update(self, request, error: Exception = None):
+        """Adapts the rate of the request method to the result of a call."""
+        if not self.adaptive:
+            return
+
+        method = request.getapiname()
+        throttled = error is not None and is_throttle_error(error)
+        with self._lock:
+            bucket = self._get_bucket(method)
+            if throttled:
+                self.throttled[method] += 1
+                now = time.monotonic()
+                if now - bucket.decreased >= DECREASE_INTERVAL:
+                    bucket.decreased = now
+                    bucket.rate = max(self.min_rate, bucket.rate / 2)
+                    bucket.tokens = min(bucket.tokens, 0)
+            elif error is None and bucket.rate < bucket.limit:
+                bucket.rate = min(bucket.limit, bucket.rate + self.increase / bucket.rate)
+
+    def get_rate(self, method: str) -> float:
+        """Returns the current calls per second allowed for an API method."""
+        with self._lock:
+            return self._get_bucket(method).rate
+
+    def get_available(self, method: str) -> float:
+        """Returns the calls to an API method that can be sent right now without waiting."""
+        with self._lock:
+            bucket = self._get_bucket(method)
+            bucket.refill(time.monotonic())
+            return bucket.tokens
+
+    def _reserve(self, method):
+        with self._lock:
+            return self._get_bucket(method).reserve(time.monotonic())
+
+    def _get_bucket(self, method):
+        bucket = self._buckets.get(method)
+        if bucket is None:
+            bucket = self._buckets[method] = _Bucket(self.rates.get(method, self.rate), self.burst)
+        return bucket
+
+
+class _Bucket:
+    __slots__ = ('limit', 'rate', 'capacity', 'tokens', 'updated', 'decreased')
+
+    def __init__(self, rate, capacity):
+        self.limit = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.decreased = 0
+
+    def refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, now):
+        # Tokens may go negative, which queues the callers in order of arrival
+        self.refill(now)
+        self.tokens -= 1
+        return -self.tokens / self.rate if self.tokens < 0 else 0
+
+
+def is_throttle_error(error):
+    while error is not None:
+        if isinstance(error, TopException):
+            subcode = str(error.subcode or '')
+            return (str(error.errorcode) in THROTTLE_ERROR_CODES
+                    or any(code in subcode for code in THROTTLE_SUB_CODES))
+        if isinstance(error, RequestException):
+            return error.status == 429
+        error = error.__cause__
+    return False
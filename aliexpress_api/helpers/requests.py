@@ -1,25 +1,46 @@
-from types import SimpleNamespace
-import json
-
 from ..errors import ApiRequestException, ApiRequestResponseException
+from ..skd.api.base import json_loads
+
+
+def api_request(request, response_name, raw=False):
+    return parse_response(get_response(request), response_name, raw)
+
 
+def get_response(request, on_transfer=None):
+    try:
+        return request.getResponse(raw=True, on_transfer=on_transfer)
+    except Exception as error:
+        _raise_request_exception(error)
 
-def api_request(request, response_name):
+
+async def get_response_async(request, pool=None, on_transfer=None):
     try:
-        response = request.getResponse()
+        return await request.getResponseAsync(pool=pool, raw=True, on_transfer=on_transfer)
     except Exception as error:
-        if hasattr(error, 'message'):
-            raise ApiRequestException(error.message) from error
-        raise ApiRequestException(error) from error
+        _raise_request_exception(error)
+
 
+def parse_response(body, response_name, raw=False):
+    """Decodes a response body in a single pass. Returns ``result``, or ``resp_result`` with ``raw``."""
     try:
-        response = response[response_name]['resp_result']
-        response = json.dumps(response)
-        response = json.loads(response, object_hook=lambda d: SimpleNamespace(**d))
+        response = json_loads(body)[response_name]['resp_result']
+        resp_code = response['resp_code']
     except Exception as error:
         raise ApiRequestResponseException(error) from error
 
-    if response.resp_code == 200:
-        return response.result
-    else:
-        raise ApiRequestResponseException(f'Response code {response.resp_code} - {response.resp_msg}')
+    if resp_code != 200:
+        raise ApiRequestResponseException(f'Response code {resp_code} - {response.get("resp_msg")}')
+
+    if raw:
+        return response
+
+    try:
+        return response['result']
+    except Exception as error:
+        raise ApiRequestResponseException(error) from error
+
+
+def _raise_request_exception(error):
+    if hasattr(error, 'message'):
+        raise ApiRequestException(error.message) from error
+    raise ApiRequestException(error) from error
@@ -0,0 +1,144 @@
+"""Retries of failed API calls with exponential backoff."""
+
+from ..skd.api.base import RequestException, TopException
+
+from collections import Counter, defaultdict
+import http.client
+import random
+import ssl
+import sys
+import threading
+import time
+
+
+READ_METHODS = (
+    'aliexpress.affiliate.category.get',
+    'aliexpress.affiliate.featuredpromo.get',
+    'aliexpress.affiliate.featuredpromo.products.get',
+    'aliexpress.affiliate.hotproduct.download',
+    'aliexpress.affiliate.hotproduct.query',
+    'aliexpress.affiliate.order.get',
+    'aliexpress.affiliate.order.list',
+    'aliexpress.affiliate.order.listbyindex',
+    'aliexpress.affiliate.product.query',
+    'aliexpress.affiliate.product.smartmatch',
+    'aliexpress.affiliate.productdetail.get',
+)
+
+# Call limited and service unavailable. Sub codes starting with isp. are failures of
+# the platform, while isv. ones are caused by the request and never retried.
+TRANSIENT_ERROR_CODES = ('7', '10')
+TRANSIENT_SUB_CODE_PREFIX = 'isp.'
+PERMANENT_SUB_CODE_PREFIX = 'isv.'
+
+
+class RetryPolicy:
+    """Retries the calls to read methods that fail with transient errors.
+
+    Timeouts, connection errors, HTTP 429 and 5xx statuses, throttling and platform errors
+    are retried, waiting a random time up to ``backoff * 2 ** (attempt - 1)`` seconds.
+    Retries are limited by a budget shared by all the calls: each call adds ``budget``
+    retries to it, up to ``max_budget``, so a failing upstream is not flooded with retries.
+
+    Args:
+        max_attempts (int): Maximum attempts for each call, including the first one.
+            Defaults to 3.
+        backoff (float): Base wait in seconds. Defaults to 0.5.
+        max_backoff (float): Maximum wait in seconds. Defaults to 10.
+        budget (float): Retries earned by each call. Defaults to 0.2.
+        max_budget (float): Maximum retries saved in the budget. Defaults to 10.
+        methods (tuple): API methods that are safe to retry. Defaults to the read methods.
+    """
+
+    def __init__(self, max_attempts: int = 3, backoff: float = 0.5, max_backoff: float = 10,
+                 budget: float = 0.2, max_budget: float = 10, methods: tuple = READ_METHODS):
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.budget = budget
+        self.max_budget = max_budget
+        self.methods = methods
+        self.attempts = defaultdict(Counter)
+        self.exhausted = Counter()
+        self._lock = threading.Lock()
+        self._tokens = max_budget
+
+    def call(self, request, function, *args):
+        """Calls ``function(*args)`` to send the request, retrying it if needed."""
+        self._deposit()
+        attempt = 1
+        while True:
+            try:
+                result = function(*args)
+            except Exception as error:
+                delay = self._get_delay(request, error, attempt)
+                if delay is None:
+                    self._record(request, attempt)
+                    raise
+                time.sleep(delay)
+                attempt += 1
+            else:
+                self._record(request, attempt)
+                return result
+
+    async def call_async(self, request, function, *args):
+        """Awaits ``function(*args)`` to send the request, retrying it if needed."""
+        import asyncio
+        self._deposit()
+        attempt = 1
+        while True:
+            try:
+                result = await function(*args)
+            except Exception as error:
+                delay = self._get_delay(request, error, attempt)
+                if delay is None:
+                    self._record(request, attempt)
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+            else:
+                self._record(request, attempt)
+                return result
+
+    def _get_delay(self, request, error, attempt):
+        method = request.getapiname()
+        if attempt >= self.max_attempts or method not in self.methods:
+            return None
+        if not is_transient_error(error):
+            return None
+
+        with self._lock:
+            if self._tokens < 1:
+                self.exhausted[method] += 1
+                return None
+            self._tokens -= 1
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))
+
+    def _deposit(self):
+        with self._lock:
+            self._tokens = min(self.max_budget, self._tokens + self.budget)
+
+    def _record(self, request, attempts):
+        with self._lock:
+            self.attempts[request.getapiname()][attempts] += 1
+
+
+def is_transient_error(error):
+    # Only calls made from an event loop can raise its timeout, so asyncio is loaded then
+    asyncio = sys.modules.get('asyncio')
+    timeout_error = asyncio.TimeoutError if asyncio else TimeoutError
+    while error is not None:
+        if isinstance(error, TopException):
+            subcode = str(error.subcode or '')
+            if subcode.startswith(PERMANENT_SUB_CODE_PREFIX):
+                return False
+            return (str(error.errorcode) in TRANSIENT_ERROR_CODES
+                    or subcode.startswith(TRANSIENT_SUB_CODE_PREFIX))
+        if isinstance(error, RequestException):
+            return error.status is None or error.status == 429 or error.status >= 500
+        if isinstance(error, ssl.CertificateError):
+            return False
+        if isinstance(error, (OSError, EOFError, http.client.HTTPException, timeout_error)):
+            return True
+        error = error.__cause__
+    return False
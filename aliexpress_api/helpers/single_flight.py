@@ -0,0 +1,72 @@
+"""Sharing of identical calls that are in flight at the same time."""
+
+from .cache import get_cache_key
+
+from collections import Counter
+import threading
+
+
+class SingleFlight:
+    """Sends only one of the identical calls made at the same time and shares its result.
+
+    Calls are identical when they have the same API method and application parameters.
+    Every caller receives the same response, or the same exception if it fails.
+    """
+
+    def __init__(self):
+        self.collapsed = Counter()
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._tasks = {}
+
+    def call(self, request, function, *args):
+        """Calls ``function(*args)`` to send the request, unless the same one is in flight."""
+        key = get_cache_key(request)
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.collapsed[request.getapiname()] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function(*args)
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    async def call_async(self, request, function, *args):
+        """Awaits ``function(*args)`` to send the request, unless the same one is in flight."""
+        import asyncio
+        key = (asyncio.get_running_loop(), get_cache_key(request))
+        task = self._tasks.get(key)
+        if task is None:
+            task = self._tasks[key] = asyncio.ensure_future(function(*args))
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        else:
+            with self._lock:
+                self.collapsed[request.getapiname()] += 1
+
+        # A caller that is cancelled does not cancel the call for the others
+        return await asyncio.shield(task)
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
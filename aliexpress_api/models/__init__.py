@@ -1,9 +1,12 @@
+from .base import Model
 from .languages import Language
 from .currencies import Currency
 from .request_parameters import ProductType, SortBy, LinkType
-from .affiliate_link import AffiliateLink
+from .affiliate_link import AffiliateLink, AffiliateLinkResult
 from .hotproducts import HotProductsResponse
-from .product import Product, ProductsResponse
+from .product import Product, ProductList, ProductsResponse
 from .category import Category, ChildCategory
+from .promo import Promo, PromoProductsResponse
+from .projection import Projection, ProductPrice, ProductLink, PRICE_ONLY, LINK_ONLY
 from .order import Order
-from .orderlist import OrderListResponse
+from .orderlist import OrderListResponse, OrderListByIndexResponse
@@ -1,3 +1,16 @@
-class AffiliateLink:
+from .base import Model
+
+
+class AffiliateLink(Model):
     promotion_link: str
     source_value: str
+
+
+class AffiliateLinkResult(Model):
+    """Result of converting a single link in bulk. On failure ``error`` explains the reason."""
+    source_value: str
+    promotion_link: str
+    error: str
+
+    def __init__(self, source_value: str, promotion_link: str = None, error: str = None):
+        super().__init__(source_value=source_value, promotion_link=promotion_link, error=error)
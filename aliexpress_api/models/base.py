@@ -0,0 +1,157 @@
+from types import SimpleNamespace
+import sys
+
+
+def to_int(value):
+    if value == '':
+        return None
+    return int(value)
+
+
+def to_float(value):
+    if value.__class__ is str:
+        if value.endswith('%'):
+            value = value[:-1]
+        if not value.strip():
+            return None
+    return float(value)
+
+
+def to_bool(value):
+    if value.__class__ is str:
+        value = value.strip().lower()
+        if value == 'true':
+            return True
+        if value == 'false':
+            return False
+        if not value:
+            return None
+        raise ValueError(value)
+    return bool(value)
+
+
+def to_namespace(value):
+    if isinstance(value, dict):
+        return SimpleNamespace(**{key: to_namespace(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return [to_namespace(item) for item in value]
+    return value
+
+
+def unwrap_list(value):
+    """Lists come wrapped in a single key object, like ``{"product": [...]}``."""
+    if isinstance(value, dict):
+        value = next(iter(value.values()), [])
+    return value
+
+
+def get_converter(annotation):
+    if annotation is int:
+        return to_int
+    if annotation is float:
+        return to_float
+    if annotation is bool:
+        return to_bool
+    if getattr(annotation, '__origin__', None) is list:
+        item = annotation.__args__[0]
+        if isinstance(item, ModelMeta):
+            return lambda value: [item.from_dict(data) for data in unwrap_list(value)]
+        return unwrap_list
+    return None
+
+
+def get_namespace_annotations(namespace):
+    """Returns the annotations of a class body before the class is created."""
+    if '__annotations__' in namespace or sys.version_info < (3, 14):
+        return namespace.get('__annotations__', {})
+    # From Python 3.14 annotations are lazy, the class body only has an __annotate__ function
+    import annotationlib
+    annotate = annotationlib.get_annotate_from_class_namespace(namespace)
+    if annotate is None:
+        return {}
+    return annotationlib.call_annotate_function(annotate, annotationlib.Format.FORWARDREF)
+
+
+class ModelMeta(type):
+    """Creates ``__slots__`` and field converters from the class annotations."""
+
+    def __new__(mcs, name, bases, namespace):
+        annotations = get_namespace_annotations(namespace)
+        namespace.setdefault('__slots__', tuple(annotations))
+        cls = super().__new__(mcs, name, bases, namespace)
+
+        cls._converters = {}
+        for base in reversed(cls.__mro__[1:]):
+            cls._converters.update(getattr(base, '_converters', {}))
+        for field, annotation in annotations.items():
+            cls._converters[field] = get_converter(annotation)
+        return cls
+
+
+class Model(metaclass=ModelMeta):
+    """Base class for the API results.
+
+    Numeric and boolean fields are converted once when the object is built. Fields returned by the API
+    that are not declared in the model are kept apart and still accessible as attributes,
+    unless ``_keep_extra`` is False.
+    """
+    __slots__ = ('_extra',)
+    _keep_extra = True
+
+    def __init__(self, **values):
+        self._extra = None
+        for key, value in values.items():
+            setattr(self, key, value)
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """Builds the model from a decoded API payload."""
+        self = cls.__new__(cls)
+        extra = None
+        converters = cls._converters
+        keep_extra = cls._keep_extra
+        for key, value in data.items():
+            converter = converters.get(key, to_namespace)
+            if converter is to_namespace:
+                if not keep_extra:
+                    continue
+                if extra is None:
+                    extra = {}
+                extra[key] = to_namespace(value)
+                continue
+
+            if converter is not None and value is not None:
+                try:
+                    value = converter(value)
+                except (TypeError, ValueError):
+                    pass
+            setattr(self, key, value)
+        self._extra = extra
+        return self
+
+    def to_dict(self) -> dict:
+        """Returns the fields present in the model as a dict."""
+        values = {}
+        for field in self._converters:
+            try:
+                value = getattr(self, field)
+            except AttributeError:
+                continue
+            if isinstance(value, list):
+                value = [item.to_dict() if isinstance(item, Model) else item for item in value]
+            values[field] = value
+        return values
+
+    def __getattr__(self, name):
+        if name != '_extra' and self._extra and name in self._extra:
+            return self._extra[name]
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def __eq__(self, other):
+        if type(self) is not type(other):
+            return NotImplemented
+        return self.to_dict() == other.to_dict() and self._extra == other._extra
+
+    def __repr__(self) -> str:
+        values = ', '.join(f'{key}={value!r}' for key, value in self.to_dict().items())
+        return f'{type(self).__name__}({values})'
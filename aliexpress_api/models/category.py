@@ -1,4 +1,7 @@
-class Category:
+from .base import Model
+
+
+class Category(Model):
     category_id: int
     category_name: str
 
@@ -1,8 +1,9 @@
+from .base import Model
 from .product import Product
 from typing import List
 
 
-class HotProductsResponse:
+class HotProductsResponse(Model):
     current_page_no: int
     current_record_count: int
     total_record_count: int
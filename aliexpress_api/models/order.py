@@ -1,11 +1,14 @@
-class Order:
-    estimated_finished_commission: str
+from .base import Model
+
+
+class Order(Model):
+    estimated_finished_commission: float
     product_detail_url: str
-    estimated_paid_commission: str
+    estimated_paid_commission: float
     product_count: int
-    order_number: str
+    order_number: int
     is_hot_product: str
-    parent_order_number: str
+    parent_order_number: int
     product_main_image_url: str
     order_status: str
     category_id: int
@@ -18,18 +21,18 @@ class Order:
     completed_settlement_time: str
     paid_time: str
     is_new_buyer: str
-    sub_order_id: str
+    sub_order_id: int
     custom_parameters: str
     ship_to_country: str
     product_title: str
-    incentive_commission_rate: str
-    new_buyer_bonus_commission: str
-    estimated_incentive_paid_commission: str
+    incentive_commission_rate: float
+    new_buyer_bonus_commission: float
+    estimated_incentive_paid_commission: float
     is_affiliate_product: str
-    paid_amount: str
+    paid_amount: float
     effect_detail_status: str
-    estimated_incentive_finished_commission: str
-    commission_rate: str
-    finished_amount: str
+    estimated_incentive_finished_commission: float
+    commission_rate: float
+    finished_amount: float
     order_platform: str
-    order_id: str
+    order_id: int
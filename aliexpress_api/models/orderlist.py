@@ -1,9 +1,17 @@
+from .base import Model
 from .order import Order
 from typing import List
 
-class OrderListResponse:
+class OrderListResponse(Model):
     total_record_count: int
     current_record_count: int
     total_page_no: int
     current_page_no: int
-    orders: List[Order]
\ No newline at end of file
+    orders: List[Order]
+
+
+class OrderListByIndexResponse(Model):
+    current_record_count: int
+    min_query_index_id: str
+    max_query_index_id: str
+    orders: List[Order]
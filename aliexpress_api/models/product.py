@@ -1,18 +1,18 @@
-from typing import List
+from .base import Model
+from typing import Dict, List
 
 
-class Product:
-    app_sale_price: str
+class Product(Model):
+    app_sale_price: float
     app_sale_price_currency: str
-    commission_rate: str
-    discount: str
-    evaluate_rate: str
+    commission_rate: float
+    discount: float
+    evaluate_rate: float
     first_level_category_id: int
     first_level_category_name: str
+    hot_product_commission_rate: float
     lastest_volume: int
-    hot_product_commission_rate: str
-    lastest_volume: int
-    original_price: str
+    original_price: float
     original_price_currency: str
     product_detail_url: str
     product_id: int
@@ -21,23 +21,36 @@ class Product:
     product_title: str
     product_video_url: str
     promotion_link: str
-    relevant_market_commission_rate: str
-    sale_price: str
+    relevant_market_commission_rate: float
+    sale_price: float
     sale_price_currency: str
     second_level_category_id: int
     second_level_category_name: str
     shop_id: int
     shop_url: str
-    target_app_sale_price: str
+    target_app_sale_price: float
     target_app_sale_price_currency: str
-    target_original_price: str
+    target_original_price: float
     target_original_price_currency: str
-    target_sale_price: str
+    target_sale_price: float
     target_sale_price_currency: str
 
 
-class ProductsResponse:
+class ProductsResponse(Model):
     current_page_no: int
     current_record_count: int
     total_record_count: int
     products: List[Product]
+
+
+class ProductList(list):
+    """List of products that also keeps the requested IDs which were not found, and the
+    errors of the IDs whose request failed."""
+    missing_ids: List[str]
+    errors: Dict[str, Exception]
+
+    def __init__(self, products: List[Product] = (), missing_ids: List[str] = None,
+                 errors: Dict[str, Exception] = None):
+        super().__init__(products)
+        self.missing_ids = missing_ids or []
+        self.errors = errors or {}
@@ -0,0 +1,128 @@
+from ..errors.exceptions import InvalidArgumentException
+from .base import Model, ModelMeta
+from .product import Product
+from typing import List
+
+
+class ProductPrice(Model):
+    _keep_extra = False
+    product_id: int
+    target_sale_price: float
+    target_sale_price_currency: str
+    target_original_price: float
+    target_original_price_currency: str
+
+
+class ProductLink(Model):
+    _keep_extra = False
+    product_id: int
+    promotion_link: str
+
+
+class Projection:
+    """The product fields that are requested to the API and decoded from its responses.
+
+    Pass it as ``fields`` to the product methods to receive slim product objects that only
+    have those attributes. ``product_id`` is always included. Projected results can be
+    pickled, and projections with the same fields share their model.
+
+    Args:
+        *fields (str): Names of the ``Product`` attributes that will be read.
+        model (type): Model of the products. Defaults to one created with those fields.
+    """
+
+    def __init__(self, *fields: str, model: type = None):
+        fields = tuple(dict.fromkeys(('product_id',) + fields))
+        unknown = [field for field in fields if field not in Product._converters]
+        if unknown:
+            raise InvalidArgumentException('Unknown product fields: ' + ', '.join(unknown))
+
+        self.fields = fields
+        self.model = model or get_projection_model(fields)
+
+    def get_response_model(self, model: type) -> type:
+        """Returns a version of a response model whose products use the projection model."""
+        return get_projected_response_model(model, self.model)
+
+    def __repr__(self) -> str:
+        return f'Projection{self.fields!r}'
+
+
+_projection_models = {}
+_response_models = {}
+
+
+def get_projection_model(fields: tuple) -> type:
+    """Returns the product model with only the given fields, created once for each set."""
+    model = _projection_models.get(fields)
+    if model is None:
+        model = _projection_models.setdefault(fields, ModelMeta('ProductProjection', (Model,), {
+            '__module__': __name__,
+            '__annotations__': {field: Product.__annotations__[field] for field in fields},
+            '__reduce__': _reduce_projection,
+            '_keep_extra': False,
+            '_fields': fields,
+        }))
+    return model
+
+
+def get_projected_response_model(model: type, product_model: type) -> type:
+    """Returns a subclass of a response model whose products use ``product_model``."""
+    key = (model, product_model)
+    response_model = _response_models.get(key)
+    if response_model is None:
+        response_model = _response_models.setdefault(key, ModelMeta(
+            f'{model.__name__}[{product_model.__name__}]', (model,), {
+                '__module__': __name__,
+                '__slots__': (),
+                '__annotations__': {'products': List[product_model]},
+                '__reduce__': _reduce_response,
+                '_base_model': model,
+                '_product_model': product_model,
+            }))
+    return response_model
+
+
+# The generated classes can't be found by name, so their objects are pickled with the
+# arguments that create the classes again
+
+def _reduce_projection(self):
+    return _load_projection, (self._fields, _get_state(self))
+
+
+def _reduce_response(self):
+    product_model = self._product_model
+    product_model = getattr(product_model, '_fields', product_model)
+    return _load_response, (self._base_model, product_model, _get_state(self))
+
+
+def _load_projection(fields, state):
+    return _set_state(get_projection_model(fields), state)
+
+
+def _load_response(model, product_model, state):
+    if isinstance(product_model, tuple):
+        product_model = get_projection_model(product_model)
+    return _set_state(get_projected_response_model(model, product_model), state)
+
+
+def _get_state(instance):
+    state = {}
+    for cls in type(instance).__mro__:
+        for slot in getattr(cls, '__slots__', ()):
+            try:
+                state[slot] = object.__getattribute__(instance, slot)
+            except AttributeError:
+                pass
+    return state
+
+
+def _set_state(cls, state):
+    instance = cls.__new__(cls)
+    for slot, value in state.items():
+        setattr(instance, slot, value)
+    return instance
+
+
+PRICE_ONLY = Projection(*ProductPrice.__annotations__, model=ProductPrice)
+LINK_ONLY = Projection(*ProductLink.__annotations__, model=ProductLink)
@@ -0,0 +1,20 @@
+from .base import Model
+from .product import Product
+from typing import List
+
+
+class Promo(Model):
+    promo_name: str
+    promo_desc: str
+    product_num: int
+    promotion_start_time: str
+    promotion_end_time: str
+
+
+class PromoProductsResponse(Model):
+    current_page_no: int
+    current_record_count: int
+    total_page_no: int
+    total_record_count: int
+    is_finished: bool
+    products: List[Product]
@@ -8,15 +8,16 @@ from .api.base import sign
 
 
 class appinfo(object):
-    def __init__(self,appkey,secret):
+    def __init__(self,appkey,secret,sign_method="md5"):
         self.appkey = appkey
         self.secret = secret
+        self.sign_method = sign_method
 
 def getDefaultAppInfo():
     pass
 
 
-def setDefaultAppInfo(appkey,secret):
-    default = appinfo(appkey,secret)
+def setDefaultAppInfo(appkey,secret,sign_method="md5"):
+    default = appinfo(appkey,secret,sign_method)
     global getDefaultAppInfo
     getDefaultAppInfo = lambda: default
@@ -1,2 +1,9 @@
-from .rest import *
-from .base import FileItem
+from . import rest
+
+
+def __getattr__(name):
+    if name == "FileItem":
+        from .base import FileItem
+
+        return FileItem
+    return getattr(rest, name)
@@ -6,13 +6,43 @@ Created on 2012-7-3
 """
 
 
-import hashlib
-import http.client as httplib
 import itertools
-import json
-import mimetypes
+import os
+import re
+import threading
 import time
 import urllib
+import urllib.parse
+
+# http.client, ssl, socket, hashlib, hmac, zlib 与 json 只在发送请求时才导入,
+# 其中 http.client 会导入整个 email 包, 是导入时间的大部分
+
+_json_loads = None
+
+
+def json_loads(data):
+    # 安装了 orjson 时用它解析响应
+    global _json_loads
+    if _json_loads is None:
+        try:
+            import orjson
+
+            _json_loads = orjson.loads
+        except ImportError:
+            import json
+
+            _json_loads = json.loads
+    return _json_loads(data)
+
+
+def preload():
+    # 预先导入发送请求时才用到的模块, 在 warmup 时调用
+    import hashlib
+    import hmac
+    import http.client
+    import zlib
+
+    json_loads(b"{}")
 
 """
 定义一些系统变量
@@ -36,33 +66,107 @@ P_SUB_CODE = "sub_code"
 P_MSG = "msg"
 P_SUB_MSG = "sub_msg"
 
+SIGN_METHOD_MD5 = "md5"
+SIGN_METHOD_HMAC_SHA256 = "hmac-sha256"
+
 
 N_REST = "/sync"
 
+POOL_MAXSIZE = 10
+POOL_IDLE_TIMEOUT = 60
 
-def sign(secret, parameters):
+# DNS 解析结果的缓存秒数
+DNS_TTL = 60
+
+# 发往此端口的请求使用 HTTPS
+HTTPS_PORT = 443
+
+ACCEPT_ENCODING = "gzip, deflate"
+BODY_CHUNK_SIZE = 65536
+# 小于此大小的请求体压缩后几乎不会变小
+COMPRESS_MIN_SIZE = 1024
+# 即 zlib.MAX_WBITS
+MAX_WBITS = 15
+
+
+def sign(secret, parameters, sign_method=SIGN_METHOD_MD5):
     # ===========================================================================
     # '''签名方法
     # @param secret: 签名需要的密钥
     # @param parameters: 支持字典和string两种
+    # @param sign_method: md5 或 hmac-sha256
     # '''
     # ===========================================================================
-    # 如果parameters 是字典类的话
+    # 如果parameters 是字典类的话, 一次 join 拼接排序后的 key value
+    # md5 时前后加上密钥, string 则原样签名
     if hasattr(parameters, "items"):
-        keys = parameters.keys()
-        keys = list(keys)
-        keys.sort()
-
-        parameters = "%s%s%s" % (
-            secret,
-            str().join("%s%s" % (key, parameters[key]) for key in keys),
-            secret,
+        parameters = "".join(
+            [key + str(parameters[key]) for key in sorted(parameters)]
         )
-    parameters = parameters.encode("utf-8")
-    sign = hashlib.md5(parameters).hexdigest().upper()
+        if sign_method != SIGN_METHOD_HMAC_SHA256:
+            parameters = secret + parameters + secret
+    import hashlib
+
+    if sign_method == SIGN_METHOD_HMAC_SHA256:
+        import hmac
+
+        return hmac.new(
+            secret.encode("utf-8"), parameters.encode("utf-8"), hashlib.sha256
+        ).hexdigest().upper()
+    sign = hashlib.md5(parameters.encode("utf-8")).hexdigest().upper()
     return sign
 
 
+# 不需要转义的字符, 与 urllib.parse.quote_plus 一致
+_is_safe = re.compile(r"[A-Za-z0-9_.\-~]*").fullmatch
+
+# 每个 app key 与签名方法固定不变的系统参数, 及其 url 编码
+_system_parameters = {}
+
+# 每个请求类与属性组合对应的 (属性名, 参数名)
+_parameter_names = {}
+
+
+def quote_parameter(value):
+    if value.__class__ is not str:
+        if not isinstance(value, bytes):
+            value = str(value)
+    if value.__class__ is str and _is_safe(value):
+        return value
+    return urllib.parse.quote_plus(value)
+
+
+def encode_parameters(parameters):
+    # ===========================================================================
+    # 与 urllib.parse.urlencode 结果相同, 跳过不需要转义的值
+    # ===========================================================================
+    return "&".join(
+        [quote_parameter(key) + "=" + quote_parameter(value)
+         for key, value in parameters.items()]
+    )
+
+
+def get_system_parameters(app_key, sign_method):
+    # ===========================================================================
+    # 返回 (系统参数, url 编码后的系统参数), 只在第一次使用时生成
+    # ===========================================================================
+    key = (app_key, sign_method)
+    parameters = _system_parameters.get(key)
+    if parameters is None:
+        system_parameters = {
+            P_FORMAT: "json",
+            P_APPKEY: app_key,
+            P_SIGN_METHOD: sign_method,
+            P_VERSION: "2.0",
+            P_PARTNER_ID: SYSTEM_GENERATE_VERSION,
+        }
+        parameters = _system_parameters[key] = (
+            system_parameters,
+            encode_parameters(system_parameters),
+        )
+    return parameters
+
+
 def mixStr(pstr):
     if isinstance(pstr, str):
         return pstr
@@ -99,6 +203,8 @@ class MultiPartForm(object):
         """Add a file to be uploaded."""
         body = fileHandle.read()
         if mimetype is None:
+            import mimetypes
+
             mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
         self.files.append(
             (mixStr(fieldname), mixStr(filename), mixStr(mimetype), mixStr(body))
@@ -148,6 +254,60 @@ class MultiPartForm(object):
         return "\r\n".join(flattened)
 
 
+class BodyDecoder(object):
+    # ===========================================================================
+    # 边接收边解压 gzip/deflate 响应体, 同时统计传输的字节数
+    # ===========================================================================
+
+    def __init__(self, encoding=None):
+        self.encoding = (encoding or "").strip().lower()
+        self.received = 0
+        self._chunks = []
+        self._decompressor = None
+
+    def feed(self, chunk):
+        self.received += len(chunk)
+        if self.encoding not in ("gzip", "deflate"):
+            self._chunks.append(chunk)
+            return
+        if self._decompressor is None:
+            import zlib
+
+            self._decompressor = zlib.decompressobj(self._get_wbits(chunk))
+        self._chunks.append(self._decompressor.decompress(chunk))
+
+    def finish(self):
+        if self._decompressor is not None:
+            self._chunks.append(self._decompressor.flush())
+        return b"".join(self._chunks)
+
+    def _get_wbits(self, chunk):
+        # deflate 按规范是 zlib 格式, 但有些服务端发送不带头的原始 deflate
+        if self.encoding == "gzip":
+            return 16 + MAX_WBITS
+        if len(chunk) >= 2 and chunk[0] & 0x0F == 8 and (chunk[0] << 8 | chunk[1]) % 31 == 0:
+            return MAX_WBITS
+        return -MAX_WBITS
+
+
+def get_transfer_sizes(body, received, result):
+    # ===========================================================================
+    # 一次请求的字节数: sent 为发送的请求体, received 为接收的响应体
+    # (压缩时为压缩后的大小), decoded 为解压后的响应体
+    # ===========================================================================
+    return {"sent": len(body), "received": received, "decoded": len(result)}
+
+
+def compress_body(body):
+    # gzip 格式的请求体, 返回 bytes
+    import zlib
+
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + MAX_WBITS)
+    return compressor.compress(body) + compressor.flush()
+
+
 class TopException(Exception):
     # ===========================================================================
     # 业务异常类
@@ -180,9 +340,416 @@ class TopException(Exception):
 
 class RequestException(Exception):
     # ===========================================================================
-    # 请求连接异常类
+    # 请求连接异常类, status 为 HTTP 状态码
+    # ===========================================================================
+    status = None
+
+
+# 代替 socket._GLOBAL_DEFAULT_TIMEOUT, 使用系统默认的超时时间
+_DEFAULT_TIMEOUT = object()
+
+
+class DnsCache(object):
+    # ===========================================================================
+    # 线程安全的 DNS 缓存, 解析结果保留 ttl 秒, 连接失败时清除
     # ===========================================================================
-    pass
+
+    def __init__(self, ttl=DNS_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._addresses = {}
+
+    def resolve(self, host, port):
+        import socket
+
+        addresses = self._get(host, port)
+        if addresses is None:
+            addresses = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+            self._set(host, port, addresses)
+        return addresses
+
+    async def resolve_async(self, host, port):
+        import asyncio
+        import socket
+
+        addresses = self._get(host, port)
+        if addresses is None:
+            addresses = await asyncio.get_running_loop().getaddrinfo(
+                host, port, type=socket.SOCK_STREAM
+            )
+            self._set(host, port, addresses)
+        return addresses
+
+    def invalidate(self, host, port):
+        with self._lock:
+            self._addresses.pop((host, port), None)
+
+    def create_connection(self, address, timeout=_DEFAULT_TIMEOUT, source_address=None):
+        # =======================================================================
+        # 代替 socket.create_connection, 用缓存的地址依次尝试连接
+        # =======================================================================
+        import socket
+
+        if timeout is _DEFAULT_TIMEOUT:
+            timeout = socket._GLOBAL_DEFAULT_TIMEOUT
+        host, port = address
+        error = None
+        for _, _, _, _, sockaddr in self.resolve(host, port):
+            try:
+                return socket.create_connection(sockaddr[:2], timeout, source_address)
+            except OSError as exception:
+                error = exception
+        self.invalidate(host, port)
+        raise error or OSError("getaddrinfo returns an empty list")
+
+    def clear(self):
+        with self._lock:
+            self._addresses = {}
+
+    def after_fork(self):
+        # 子进程重新解析, 锁可能在 fork 时被其它线程持有
+        self._lock = threading.Lock()
+        self._addresses = {}
+
+    def _get(self, host, port):
+        with self._lock:
+            entry = self._addresses.get((host, port))
+        if entry is not None and time.monotonic() < entry[1]:
+            return entry[0]
+        return None
+
+    def _set(self, host, port, addresses):
+        with self._lock:
+            self._addresses[(host, port)] = (addresses, time.monotonic() + self.ttl)
+
+
+dns_cache = DnsCache()
+_ssl_context = None
+
+
+def get_ssl_context():
+    # =======================================================================
+    # 所有 HTTPS 连接共用一个 SSLContext, 只加载一次证书, 且 TLS 会话可以复用
+    # =======================================================================
+    global _ssl_context
+    if _ssl_context is None:
+        import ssl
+
+        _ssl_context = ssl.create_default_context()
+    return _ssl_context
+
+
+class ConnectionPool(object):
+    # ===========================================================================
+    # 线程安全的长连接池, 按 (domain, port) 复用 HTTP 连接
+    # ===========================================================================
+
+    def __init__(self, maxsize=POOL_MAXSIZE, idle_timeout=POOL_IDLE_TIMEOUT):
+        # =======================================================================
+        # Args @param maxsize: 每个 (domain, port) 最多保留的空闲连接数
+        #      @param idle_timeout: 空闲连接的最长保留秒数
+        # =======================================================================
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._idle = {}
+        self._sessions = {}
+
+    def new_connection(self, domain, port, timeout):
+        import http.client as httplib
+
+        if port == HTTPS_PORT:
+            from .https import HTTPSConnection
+
+            connection = HTTPSConnection(
+                domain, port, timeout=timeout, context=get_ssl_context()
+            )
+            connection.session = self._sessions.get((domain, port))
+        else:
+            connection = httplib.HTTPConnection(domain, port, timeout=timeout)
+        connection._create_connection = dns_cache.create_connection
+        return connection
+
+    def warmup(self, domain, port, timeout, connections=1):
+        # =======================================================================
+        # 预先解析域名并建立连接, 放入空闲连接中, 已有的空闲连接也算在内
+        # =======================================================================
+        dns_cache.resolve(domain, port)
+        with self._lock:
+            missing = connections - len(self._idle.get((domain, port), []))
+        for _ in range(missing):
+            connection = self.new_connection(domain, port, timeout)
+            connection.connect()
+            self.release(domain, port, connection)
+
+    def acquire(self, domain, port, timeout):
+        # =======================================================================
+        # 取出一个空闲连接, 没有时新建. 返回 (connection, reused)
+        # =======================================================================
+        expired = []
+        connection = None
+        now = time.monotonic()
+        with self._lock:
+            idle = self._idle.get((domain, port))
+            while idle:
+                candidate, last_used = idle.pop()
+                if now - last_used < self.idle_timeout:
+                    connection = candidate
+                    break
+                expired.append(candidate)
+        for candidate in expired:
+            candidate.close()
+
+        if connection is None:
+            return self.new_connection(domain, port, timeout), False
+
+        connection.timeout = timeout
+        if connection.sock is not None:
+            connection.sock.settimeout(timeout)
+        return connection, True
+
+    def release(self, domain, port, connection):
+        # =======================================================================
+        # 归还连接, 池已满时直接关闭. TLS 会话留给之后的新连接使用
+        # =======================================================================
+        session = getattr(connection.sock, "session", None)
+        with self._lock:
+            if session is not None:
+                self._sessions[(domain, port)] = session
+            idle = self._idle.setdefault((domain, port), [])
+            if len(idle) < self.maxsize:
+                idle.append((connection, time.monotonic()))
+                return
+        connection.close()
+
+    def clear(self):
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection, _ in connections:
+                connection.close()
+
+    def after_fork(self):
+        # =======================================================================
+        # 子进程不能复用父进程的连接与 TLS 会话, 只关闭子进程中的文件描述符,
+        # 父进程的连接不受影响. 锁可能在 fork 时被其它线程持有, 直接替换
+        # =======================================================================
+        self._lock = threading.Lock()
+        idle, self._idle = self._idle, {}
+        self._sessions = {}
+        for connections in idle.values():
+            for connection, _ in connections:
+                connection.close()
+
+
+connection_pool = ConnectionPool()
+
+
+def _after_fork_in_child():
+    global _ssl_context
+    _ssl_context = None
+    dns_cache.after_fork()
+    connection_pool.after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+class AsyncConnection(object):
+    # ===========================================================================
+    # 基于 asyncio streams 的 HTTP/1.1 长连接
+    # ===========================================================================
+
+    def __init__(self, domain, port):
+        self.domain = domain
+        self.port = port
+        self.reader = None
+        self.writer = None
+        self.sock = None
+        self.last_used = time.monotonic()
+
+    async def connect(self, timeout):
+        # =======================================================================
+        # 与 socket.create_connection 一样依次尝试解析到的地址
+        # =======================================================================
+        import asyncio
+        import socket
+
+        loop = asyncio.get_running_loop()
+        error = None
+        for family, type_, proto, _, sockaddr in await dns_cache.resolve_async(
+            self.domain, self.port
+        ):
+            sock = socket.socket(family, type_, proto)
+            sock.setblocking(False)
+            try:
+                await asyncio.wait_for(loop.sock_connect(sock, sockaddr), timeout)
+                break
+            except (OSError, asyncio.TimeoutError) as exception:
+                sock.close()
+                error = exception
+        else:
+            dns_cache.invalidate(self.domain, self.port)
+            raise error or OSError("getaddrinfo returns an empty list")
+
+        context = get_ssl_context() if self.port == HTTPS_PORT else None
+        try:
+            self.reader, self.writer = await asyncio.wait_for(
+                asyncio.open_connection(
+                    sock=sock,
+                    ssl=context,
+                    server_hostname=self.domain if context else None,
+                ),
+                timeout,
+            )
+        except BaseException:
+            sock.close()
+            raise
+        self.sock = sock
+
+    def close(self):
+        if self.writer is not None:
+            try:
+                self.writer.close()
+            except RuntimeError:
+                # 连接所属的事件循环已关闭, 直接关闭 socket
+                self.sock.close()
+            self.writer = None
+
+    async def request(self, method, url, body, header, timeout):
+        # =======================================================================
+        # 发送请求并读取完整响应. 返回 (status, headers, body, will_close, received)
+        # =======================================================================
+        import asyncio
+
+        if self.writer is None:
+            await self.connect(timeout)
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        lines = ["%s %s HTTP/1.1" % (method, url), "Host: %s" % self.domain]
+        lines.extend("%s: %s" % (key, value) for key, value in header.items())
+        lines.append("Content-Length: %d" % len(body))
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+        # 等待缓冲区写出, 大请求体不会无限堆积, 写入错误也能立即发现
+        await asyncio.wait_for(self.writer.drain(), timeout)
+        return await asyncio.wait_for(self._read_response(), timeout)
+
+    async def _read_response(self):
+        # =======================================================================
+        # 响应体按块读取并解压. 返回 (status, headers, body, will_close, received)
+        # =======================================================================
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Remote end closed connection")
+        status = int(status_line.split()[1])
+
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            headers[key.strip().title()] = value.strip()
+
+        will_close = headers.get("Connection", "").lower() == "close"
+        decoder = BodyDecoder(headers.get("Content-Encoding"))
+        if headers.get("Transfer-Encoding", "").lower() == "chunked":
+            while True:
+                size = int((await self.reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await self.reader.readline()
+                    break
+                decoder.feed(await self.reader.readexactly(size))
+                await self.reader.readline()
+        elif "Content-Length" in headers:
+            remaining = int(headers["Content-Length"])
+            while remaining:
+                chunk = await self.reader.readexactly(min(remaining, BODY_CHUNK_SIZE))
+                remaining -= len(chunk)
+                decoder.feed(chunk)
+        else:
+            while True:
+                chunk = await self.reader.read(BODY_CHUNK_SIZE)
+                if not chunk:
+                    break
+                decoder.feed(chunk)
+            will_close = True
+        return status, headers, decoder.finish(), will_close, decoder.received
+
+
+class AsyncConnectionPool(object):
+    # ===========================================================================
+    # asyncio 版本的长连接池, 只能在同一个事件循环中使用
+    # ===========================================================================
+
+    def __init__(self, maxsize=POOL_MAXSIZE, idle_timeout=POOL_IDLE_TIMEOUT):
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self._idle = {}
+
+    def acquire(self, domain, port):
+        idle = self._idle.get((domain, port))
+        now = time.monotonic()
+        while idle:
+            connection = idle.pop()
+            if now - connection.last_used < self.idle_timeout:
+                return connection, True
+            connection.close()
+        return AsyncConnection(domain, port), False
+
+    async def warmup(self, domain, port, timeout, connections=1):
+        # =======================================================================
+        # 预先解析域名并建立连接, 放入空闲连接中
+        # =======================================================================
+        await dns_cache.resolve_async(domain, port)
+        for _ in range(connections - len(self._idle.get((domain, port), []))):
+            connection = AsyncConnection(domain, port)
+            await connection.connect(timeout)
+            self.release(connection)
+
+    def release(self, connection):
+        idle = self._idle.setdefault((connection.domain, connection.port), [])
+        if len(idle) < self.maxsize:
+            connection.last_used = time.monotonic()
+            idle.append(connection)
+        else:
+            connection.close()
+
+    async def request(self, domain, port, method, url, body, header, timeout):
+        # =======================================================================
+        # 复用的连接已被服务端关闭时重连一次. 返回 (status, headers, body, received)
+        # =======================================================================
+        import asyncio
+
+        connection, reused = self.acquire(domain, port)
+        while True:
+            try:
+                status, headers, result, will_close, received = await connection.request(
+                    method, url, body, header, timeout
+                )
+            except (ConnectionError, asyncio.IncompleteReadError):
+                connection.close()
+                if not reused:
+                    raise
+                connection, reused = AsyncConnection(domain, port), False
+                continue
+            except BaseException:
+                connection.close()
+                raise
+            break
+
+        if will_close:
+            connection.close()
+        else:
+            self.release(connection)
+        return status, headers, result, received
+
+    def clear(self):
+        idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
 
 
 class RestApi(object):
@@ -199,19 +766,34 @@ class RestApi(object):
         self.__domain = domain
         self.__port = port
         self.__httpmethod = "POST"
+        self.__sign_method = SIGN_METHOD_MD5
+        self.__compress_min_size = None
         from .. import getDefaultAppInfo
 
         if getDefaultAppInfo():
-            self.__app_key = getDefaultAppInfo().appkey
-            self.__secret = getDefaultAppInfo().secret
+            self.set_app_info(getDefaultAppInfo())
 
     def get_request_header(self):
         return {
             "Content-type": "application/x-www-form-urlencoded;charset=UTF-8",
             "Cache-Control": "no-cache",
             "Connection": "Keep-Alive",
+            "Accept-Encoding": ACCEPT_ENCODING,
         }
 
+    def set_request_compression(self, enabled=True, min_size=COMPRESS_MIN_SIZE):
+        # =======================================================================
+        # 用 gzip 压缩请求体, 只在服务端支持 Content-Encoding 请求时使用
+        # Args @param min_size: 小于此字节数的请求体不压缩
+        # =======================================================================
+        self.__compress_min_size = min_size if enabled else None
+
+    def set_https(self, enabled=True):
+        # =======================================================================
+        # 使用 HTTPS, 即 443 端口. 重连时复用 TLS 会话, 开销接近 HTTP
+        # =======================================================================
+        self.__port = HTTPS_PORT if enabled else 80
+
     def set_app_info(self, appinfo):
         # =======================================================================
         # 设置请求的app信息
@@ -220,6 +802,18 @@ class RestApi(object):
         # =======================================================================
         self.__app_key = appinfo.appkey
         self.__secret = appinfo.secret
+        self.__sign_method = getattr(appinfo, "sign_method", SIGN_METHOD_MD5)
+
+    def warmup(self, timeout=30, connections=1):
+        # =======================================================================
+        # 预先建立到请求域名的连接, 之后的请求直接复用
+        # =======================================================================
+        preload()
+        connection_pool.warmup(self.__domain, self.__port, timeout, connections)
+
+    async def warmup_async(self, pool, timeout=30, connections=1):
+        preload()
+        await pool.warmup(self.__domain, self.__port, timeout, connections)
 
     def getapiname(self):
         return ""
@@ -233,37 +827,57 @@ class RestApi(object):
     def _check_requst(self):
         pass
 
-    def getResponse(self, authrize=None, timeout=30):
+    def getResponse(self, authrize=None, timeout=30, raw=False, on_transfer=None):
         # =======================================================================
         # 获取response结果
+        # Args @param raw: 为 True 时返回未解析的 response body (bytes)
+        #      @param on_transfer: 收到响应后以本次请求的字节数调用, 见 get_transfer_sizes
         # =======================================================================
-        if self.__port == 443:
-            connection = httplib.HTTPSConnection(
-                self.__domain, self.__port, timeout=timeout
-            )
-        else:
-            connection = httplib.HTTPConnection(
-                self.__domain, self.__port, timeout=timeout
-            )
-        timestamp_temp = "%.2f" % (float(time.time()))
-        timestamp_temp = str(int(float(timestamp_temp) * 1000))
+        url, body, header = self._build_request(authrize)
+        response, result, received = self._send(url, body, header, timeout)
+        if on_transfer is not None:
+            on_transfer(get_transfer_sizes(body, received, result))
+        return self._parse_response(response.status, result, response.getheader, raw)
+
+    async def getResponseAsync(
+        self, authrize=None, timeout=30, pool=None, raw=False, on_transfer=None
+    ):
+        # =======================================================================
+        # 异步获取response结果
+        # Args @param pool: AsyncConnectionPool, 默认每次新建连接
+        #      @param raw: 为 True 时返回未解析的 response body (bytes)
+        #      @param on_transfer: 收到响应后以本次请求的字节数调用, 见 get_transfer_sizes
+        # =======================================================================
+        if pool is None:
+            pool = AsyncConnectionPool(maxsize=0)
+        url, body, header = self._build_request(authrize)
+        status, headers, result, received = await pool.request(
+            self.__domain, self.__port, self.__httpmethod, url, body, header, timeout
+        )
+        if on_transfer is not None:
+            on_transfer(get_transfer_sizes(body, received, result))
+        return self._parse_response(status, result, headers.get, raw)
 
+    def _build_request(self, authrize=None):
+        # =======================================================================
+        # 生成签名后的请求. 返回 (url, body, header)
+        # =======================================================================
+        static_parameters, static_query = get_system_parameters(
+            self.__app_key, self.__sign_method
+        )
         sys_parameters = {
-            P_FORMAT: "json",
-            P_APPKEY: self.__app_key,
-            P_SIGN_METHOD: "md5",
-            P_VERSION: "2.0",
-            P_TIMESTAMP: timestamp_temp,
-            P_PARTNER_ID: SYSTEM_GENERATE_VERSION,
+            P_TIMESTAMP: str(int(time.time() * 1000)),
             P_API: self.getapiname(),
         }
         if authrize is not None:
             sys_parameters[P_SESSION] = authrize
         application_parameter = self.getApplicationParameters()
-        sign_parameter = sys_parameters.copy()
+        sign_parameter = static_parameters.copy()
+        sign_parameter.update(sys_parameters)
         sign_parameter.update(application_parameter)
-        sys_parameters[P_SIGN] = sign(self.__secret, sign_parameter)
-        connection.connect()
+        sys_parameters[P_SIGN] = sign(
+            self.__secret, sign_parameter, self.__sign_method
+        )
 
         header = self.get_request_header()
         if self.getMultipartParas():
@@ -277,20 +891,31 @@ class RestApi(object):
             body = str(form)
             header["Content-type"] = form.get_content_type()
         else:
-            body = urllib.parse.urlencode(application_parameter)
+            body = encode_parameters(application_parameter)
+            if self.__compress_min_size is not None and len(body) >= self.__compress_min_size:
+                body = compress_body(body)
+                header["Content-Encoding"] = "gzip"
 
-        url = N_REST + "?" + urllib.parse.urlencode(sys_parameters)
-        connection.request(self.__httpmethod, url, body=body, headers=header)
-        response = connection.getresponse()
-        if response.status != 200:
-            raise RequestException(
+        url = N_REST + "?" + static_query + "&" + encode_parameters(sys_parameters)
+        return url, body, header
+
+    def _parse_response(self, status, result, getheader, raw=False):
+        # =======================================================================
+        # 解析response结果, 出错时抛出 RequestException 或 TopException
+        # raw 模式下只有 body 开头包含 error_response 时才会解析
+        # =======================================================================
+        if status != 200:
+            error = RequestException(
                 "invalid http status "
-                + str(response.status)
+                + str(status)
                 + ",detail body:"
-                + response.read()
+                + result.decode("utf-8", "replace")
             )
-        result = response.read()
-        jsonobj = json.loads(result)
+            error.status = status
+            raise error
+        if raw and result.find(b'"error_response"', 0, 64) == -1:
+            return result
+        jsonobj = json_loads(result)
         if "error_response" in jsonobj:
             error = TopException()
             if P_CODE in jsonobj["error_response"]:
@@ -301,32 +926,78 @@ class RestApi(object):
                 error.subcode = jsonobj["error_response"][P_SUB_CODE]
             if P_SUB_MSG in jsonobj["error_response"]:
                 error.submsg = jsonobj["error_response"][P_SUB_MSG]
-            error.application_host = response.getheader("Application-Host", "")
-            error.service_host = response.getheader("Location-Host", "")
+            error.application_host = getheader("Application-Host", "")
+            error.service_host = getheader("Location-Host", "")
             raise error
-        return jsonobj
+        return result if raw else jsonobj
+
+    def _send(self, url, body, header, timeout):
+        # =======================================================================
+        # 通过连接池发送请求, 复用的连接已被服务端关闭时重连一次
+        # =======================================================================
+        import http.client as httplib
+
+        connection, reused = connection_pool.acquire(
+            self.__domain, self.__port, timeout
+        )
+        while True:
+            try:
+                connection.request(self.__httpmethod, url, body=body, headers=header)
+                response = connection.getresponse()
+                decoder = BodyDecoder(response.getheader("Content-Encoding"))
+                while True:
+                    chunk = response.read(BODY_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    decoder.feed(chunk)
+                result = decoder.finish()
+            except (ConnectionError, httplib.BadStatusLine):
+                connection.close()
+                if not reused:
+                    raise
+                connection = connection_pool.new_connection(
+                    self.__domain, self.__port, timeout
+                )
+                reused = False
+                continue
+            except Exception:
+                connection.close()
+                raise
+            break
+
+        if response.will_close:
+            connection.close()
+        else:
+            connection_pool.release(self.__domain, self.__port, connection)
+        return response, result, decoder.received
 
     def getApplicationParameters(self):
-        application_parameter = {}
-        for key in self.__dict__:
-            value = self.__dict__[key]
-            if (
-                not key.startswith("__")
-                and not key in self.getMultipartParas()
-                and not key.startswith("_RestApi__")
-                and value is not None
-            ):
-                if key.startswith("_"):
-                    application_parameter[key[1:]] = value
-                else:
-                    application_parameter[key] = value
+        # =======================================================================
+        # 属性到参数名的映射按请求类与属性组合缓存, 只在第一次使用时计算
+        # =======================================================================
+        values = self.__dict__
+        key = (self.__class__, tuple(values))
+        names = _parameter_names.get(key)
+        if names is None:
+            names = _parameter_names[key] = self._getParameterNames(key[1])
+        return {
+            name: values[attribute]
+            for attribute, name in names
+            if values[attribute] is not None
+        }
+
+    def _getParameterNames(self, attributes):
+        multipart_parameters = self.getMultipartParas()
         # 查询翻译字典来规避一些关键字属性
         translate_parameter = self.getTranslateParas()
-        for key in application_parameter:
-            value = application_parameter[key]
-            if key in translate_parameter:
-                application_parameter[translate_parameter[key]] = application_parameter[
-                    key
-                ]
-                del application_parameter[key]
-        return application_parameter
+        names = []
+        for attribute in attributes:
+            if (
+                attribute.startswith("__")
+                or attribute in multipart_parameters
+                or attribute.startswith("_RestApi__")
+            ):
+                continue
+            name = attribute[1:] if attribute.startswith("_") else attribute
+            names.append((attribute, translate_parameter.get(name, name)))
+        return tuple(names)
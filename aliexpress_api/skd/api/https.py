@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+"""
+复用 TLS 会话的 HTTPS 连接, 第一次建立 HTTPS 连接时才导入
+"""
+
+
+import http.client as httplib
+
+
+class HTTPSConnection(httplib.HTTPSConnection):
+    # ===========================================================================
+    # 握手时恢复之前的 TLS 会话, 重连时省去完整握手
+    # ===========================================================================
+    session = None
+
+    def connect(self):
+        httplib.HTTPConnection.connect(self)
+        server_hostname = self._tunnel_host or self.host
+        self.sock = self._context.wrap_socket(
+            self.sock, server_hostname=server_hostname, session=self.session
+        )
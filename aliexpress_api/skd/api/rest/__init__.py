@@ -1,12 +1,32 @@
-from .AliexpressAffiliateProductSmartmatchRequest import AliexpressAffiliateProductSmartmatchRequest
-from .AliexpressAffiliateOrderGetRequest import AliexpressAffiliateOrderGetRequest
-from .AliexpressAffiliateOrderListRequest import AliexpressAffiliateOrderListRequest
-from .AliexpressAffiliateHotproductDownloadRequest import AliexpressAffiliateHotproductDownloadRequest
-from .AliexpressAffiliateProductdetailGetRequest import AliexpressAffiliateProductdetailGetRequest
-from .AliexpressAffiliateHotproductQueryRequest import AliexpressAffiliateHotproductQueryRequest
-from .AliexpressAffiliateFeaturedpromoProductsGetRequest import AliexpressAffiliateFeaturedpromoProductsGetRequest
-from .AliexpressAffiliateFeaturedpromoGetRequest import AliexpressAffiliateFeaturedpromoGetRequest
-from .AliexpressAffiliateProductQueryRequest import AliexpressAffiliateProductQueryRequest
-from .AliexpressAffiliateCategoryGetRequest import AliexpressAffiliateCategoryGetRequest
-from .AliexpressAffiliateOrderListbyindexRequest import AliexpressAffiliateOrderListbyindexRequest
-from .AliexpressAffiliateLinkGenerateRequest import AliexpressAffiliateLinkGenerateRequest
+"""
+请求类在第一次使用时才导入, 减少导入时间
+"""
+import importlib
+
+__all__ = [
+    "AliexpressAffiliateProductSmartmatchRequest",
+    "AliexpressAffiliateOrderGetRequest",
+    "AliexpressAffiliateOrderListRequest",
+    "AliexpressAffiliateHotproductDownloadRequest",
+    "AliexpressAffiliateProductdetailGetRequest",
+    "AliexpressAffiliateHotproductQueryRequest",
+    "AliexpressAffiliateFeaturedpromoProductsGetRequest",
+    "AliexpressAffiliateFeaturedpromoGetRequest",
+    "AliexpressAffiliateProductQueryRequest",
+    "AliexpressAffiliateCategoryGetRequest",
+    "AliexpressAffiliateOrderListbyindexRequest",
+    "AliexpressAffiliateLinkGenerateRequest",
+]
+
+
+def __getattr__(name):
+    if name not in __all__:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    # 导入子模块会把同名属性设为模块本身, 之后再替换为请求类
+    request_class = getattr(importlib.import_module("." + name, __name__), name)
+    globals()[name] = request_class
+    return request_class
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1 +1,14 @@
-from .get_product_id import get_product_id
+from .get_product_id import get_product_id, find_product_ids, iter_product_ids
+
+from ..helpers.lazy import lazy_imports
+
+
+LAZY_IMPORTS = {
+    'OrderSync': '.order_sync',
+    'HotProductExport': '.hotproduct_export',
+    'PromoCrawler': '.promo_crawl',
+    'ProductTable': '.product_table',
+}
+
+
+__getattr__, __dir__ = lazy_imports(__name__, LAZY_IMPORTS)
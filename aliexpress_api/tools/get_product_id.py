@@ -1,18 +1,114 @@
 """Some useful tools."""
 
-from ..errors import ProductIdNotFoundException
+from ..errors import InvalidArgumentException, ProductIdNotFoundException
+
+from collections import deque
+from itertools import islice
+from typing import Iterable, Iterator, List, Tuple, Union
 import re
 
 
+PRODUCT_ID_PATTERN = re.compile(r'^[0-9]*$')
+URL_PRODUCT_ID_PATTERN = re.compile(r'(\/)([0-9]*)(\.)')
+# Both start with a literal, which lets the regex engine skip ahead to the candidates
+PATH_PRODUCT_IDS_PATTERN = re.compile(r'/([0-9]+)\.')
+QUERY_PRODUCT_IDS_PATTERN = re.compile(r'productIds?=([0-9]+)')
+
+
 def get_product_id(text: str) -> str:
     """Returns the product ID from a given text. Raises ProductIdNotFoundException on fail."""
     # Return if text is a product ID
-    if re.search(r'^[0-9]*$', text):
+    if PRODUCT_ID_PATTERN.search(text):
         return text
 
     # Extract product ID from URL
-    asin = re.search(r'(\/)([0-9]*)(\.)', text)
+    asin = URL_PRODUCT_ID_PATTERN.search(text)
     if asin:
         return asin.group(2)
     else:
         raise ProductIdNotFoundException('Product id not found: ' + text)
+
+
+def find_product_ids(text: str) -> List[str]:
+    """Returns all the product IDs found in a text, like item URLs in any of their
+    desktop, mobile or locale variants, or ``productId`` query parameters."""
+    if text.isdigit() and text.isascii():
+        return [text]
+
+    product_ids = PATH_PRODUCT_IDS_PATTERN.findall(text)
+    if 'productId' in text:
+        product_ids += QUERY_PRODUCT_IDS_PATTERN.findall(text)
+    if len(product_ids) > 1:
+        product_ids = list(dict.fromkeys(product_ids))
+    return product_ids
+
+
+def iter_product_ids(texts: Union[str, Iterable[str]],
+                     processes: int = None,
+                     chunk_size: int = 10000) -> Iterator[Tuple[str, Union[str, ProductIdNotFoundException]]]:
+    """Extracts the product IDs from many texts, streaming the results in order.
+
+    Args:
+        texts (``str | Iterable[str]``): URLs or texts, e.g., an open file in text mode with
+            one per line. A single ``str`` is one text. Line breaks at the end of each text
+            are ignored.
+        processes (``int``): Number of worker processes. Defaults to None, which works in
+            the current process.
+        chunk_size (``int``): Number of texts sent to a worker process at once.
+
+    Yields:
+        ``tuple[str, str | ProductIdNotFoundException]``: The text and each product ID found
+        in it, or the text and an exception if none was found.
+
+    Raises:
+        ``InvalidArgumentException``: If texts are ``bytes``, e.g., a file opened in binary mode.
+    """
+    if isinstance(texts, str):
+        texts = [texts]
+    elif isinstance(texts, (bytes, bytearray)):
+        raise InvalidArgumentException('Texts must be str, decode them or open the file in text mode')
+    return _iter_product_ids(texts, processes, chunk_size)
+
+
+def _iter_product_ids(texts, processes, chunk_size):
+    if processes:
+        from concurrent.futures import ProcessPoolExecutor
+        chunks = _iter_chunks(texts, chunk_size)
+        with ProcessPoolExecutor(processes) as executor:
+            pending = deque(executor.submit(_find_chunk_product_ids, chunk)
+                            for chunk in islice(chunks, processes * 2))
+            while pending:
+                results = pending.popleft().result()
+                for chunk in islice(chunks, 1):
+                    pending.append(executor.submit(_find_chunk_product_ids, chunk))
+                yield from _iter_results(results)
+    else:
+        yield from _iter_results(map(_find_text_product_ids, texts))
+
+
+def _find_text_product_ids(text):
+    if not isinstance(text, str):
+        raise InvalidArgumentException('Texts must be str, decode them or open the file in text mode')
+    text = text.rstrip('\r\n')
+    return text, find_product_ids(text)
+
+
+def _find_chunk_product_ids(texts):
+    return list(map(_find_text_product_ids, texts))
+
+
+def _iter_chunks(texts, size):
+    texts = iter(texts)
+    chunk = list(islice(texts, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(texts, size))
+
+
+def _iter_results(results):
+    for text, product_ids in results:
+        if product_ids:
+            for product_id in product_ids:
+                yield text, product_id
+        else:
+            yield text, ProductIdNotFoundException('Product id not found: ' + text)
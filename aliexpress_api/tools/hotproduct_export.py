@@ -0,0 +1,243 @@
+"""Bulk export of the hot product downloads to files."""
+
+from ..errors import InvalidArgumentException, ProductsNotFoudException
+from ..helpers import get_list_as_string
+from ..models.base import unwrap_list
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Union
+import csv
+import importlib.util
+import io
+import json
+import os
+import threading
+
+try:
+    import orjson
+
+    def dump_json(value):
+        return orjson.dumps(value)
+except ImportError:
+    def dump_json(value):
+        return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+NDJSON = 'ndjson'
+CSV = 'csv'
+PARQUET = 'parquet'
+
+# Rows converted at once from NDJSON to Parquet, one row group each
+PARQUET_BATCH_SIZE = 10000
+
+
+class HotProductExport:
+    """Downloads the hot products of several categories, writing each page to a file as it arrives.
+
+    Each category is a partition with its own file, ``hotproducts-<category_id>.<format>``,
+    and up to ``max_workers`` partitions are downloaded at the same time. Only one page per
+    partition is kept in memory. After each page the next page number and the file size are
+    stored in the state file, so an interrupted export continues where it stopped, discarding
+    anything written after the last saved page.
+
+    Args:
+        api (AliexpressApi): The client used to download the products.
+        directory (str): Directory where the files are written.
+        format (str): 'ndjson', 'csv' or 'parquet'. Parquet needs pyarrow and is converted
+            from the NDJSON file once the partition is complete. Defaults to ndjson.
+        state_path (str): JSON file where the progress of each partition is kept. Defaults
+            to ``export.json`` in the directory.
+        max_workers (int): Maximum number of partitions downloaded in parallel. Defaults to 4.
+        page_size (int): Number of products per page, up to 50. Defaults to 50.
+        max_pages (int): Maximum pages to download from each partition. Defaults to all.
+        fields (str | list[str]): The fields to include in the products. Also the columns of
+            the CSV and Parquet files, which default to the fields of the first page.
+        country (str): Filter products that can be sent to that country.
+        locale_site (str): The site of the products, e.g., 'ru_site'.
+    """
+
+    def __init__(self, api, directory: str,
+                 format: str = NDJSON,
+                 state_path: str = None,
+                 max_workers: int = 4,
+                 page_size: int = 50,
+                 max_pages: int = None,
+                 fields: Union[str, List[str]] = None,
+                 country: str = None,
+                 locale_site: str = None):
+        if format not in (NDJSON, CSV, PARQUET):
+            raise InvalidArgumentException('Format should be ndjson, csv or parquet')
+        if format == PARQUET and importlib.util.find_spec('pyarrow') is None:
+            raise InvalidArgumentException('The parquet format requires pyarrow')
+
+        self.api = api
+        self.directory = directory
+        self.format = format
+        self.state_path = state_path or os.path.join(directory, 'export.json')
+        self.max_workers = max_workers
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.fields = get_list_as_string(fields)
+        self.country = country
+        self.locale_site = locale_site
+        self._lock = threading.Lock()
+        self.state = self._load_state()
+
+    def export(self, category_ids: List[str] = None) -> Dict[str, int]:
+        """Downloads every partition that is not complete yet.
+
+        Args:
+            category_ids (list[str]): The categories to export. Defaults to all the parent
+                categories.
+
+        Returns:
+            dict: The number of products written to each category file.
+        """
+        if category_ids is None:
+            category_ids = [category.category_id for category in self.api.get_parent_categories()]
+        category_ids = [str(category_id) for category_id in category_ids]
+
+        os.makedirs(self.directory, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self._export_partition, category_id)
+                       for category_id in category_ids]
+            for future in futures:
+                future.result()
+
+        return {category_id: self.state[category_id]['records'] for category_id in category_ids}
+
+    def get_path(self, category_id: str, format: str = None) -> str:
+        """Returns the file of a category."""
+        return os.path.join(self.directory, f'hotproducts-{category_id}.{format or self.format}')
+
+    def _export_partition(self, category_id):
+        with self._lock:
+            partition = self.state.setdefault(category_id, _new_partition(self.fields))
+        if partition['done']:
+            return
+
+        # Parquet files are written at the end, from the NDJSON file
+        data_format = NDJSON if self.format == PARQUET else self.format
+        path = self.get_path(category_id, data_format)
+
+        # A file shorter than the saved offset lost pages that were never flushed to disk,
+        # so the partition starts over instead of resuming after missing data
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        if size < partition['offset']:
+            with self._lock:
+                partition.update(_new_partition(self.fields))
+
+        with open(path, 'r+b' if size else 'wb') as output:
+            output.truncate(partition['offset'])
+            output.seek(partition['offset'])
+
+            while self.max_pages is None or partition['page_no'] <= self.max_pages:
+                products = self._download_page(category_id, partition['page_no'])
+                if products:
+                    if data_format == CSV:
+                        output.write(self._get_csv(partition, products))
+                    else:
+                        output.write(b''.join(dump_json(product) + b'\n' for product in products))
+                    output.flush()
+
+                # The last page is saved once the partition is complete
+                if len(products) < self.page_size:
+                    partition['records'] += len(products)
+                    break
+                os.fsync(output.fileno())
+                with self._lock:
+                    partition['page_no'] += 1
+                    partition['offset'] = output.tell()
+                    partition['records'] += len(products)
+                    self._save_state()
+
+        if self.format == PARQUET:
+            write_parquet(path, self.get_path(category_id), partition['columns'])
+        with self._lock:
+            partition['done'] = True
+            self._save_state()
+
+    def _download_page(self, category_id, page_no):
+        try:
+            response = self.api.download_hotproducts(category_id, self.country, self.fields,
+                self.locale_site, page_no, self.page_size, raw=True)
+        except ProductsNotFoudException:
+            return []
+
+        result = response.get('result') or {}
+        if not result.get('current_record_count'):
+            return []
+        return unwrap_list(result.get('products', []))
+
+    def _get_csv(self, partition, products):
+        lines = io.StringIO()
+        writer = csv.writer(lines)
+        if partition['columns'] is None:
+            partition['columns'] = list(products[0])
+        if partition['offset'] == 0:
+            writer.writerow(partition['columns'])
+        writer.writerows(get_row(product, partition['columns']) for product in products)
+        return lines.getvalue().encode()
+
+    def _load_state(self):
+        if not os.path.exists(self.state_path):
+            return {}
+        with open(self.state_path) as state_file:
+            return json.load(state_file)
+
+    def _save_state(self):
+        temporary_path = self.state_path + '.tmp'
+        with open(temporary_path, 'w') as state_file:
+            json.dump(self.state, state_file)
+        os.replace(temporary_path, self.state_path)
+
+
+def _new_partition(fields):
+    return {'page_no': 1, 'offset': 0, 'records': 0, 'done': False,
+            'columns': fields.split(',') if fields else None}
+
+
+def get_row(product, columns):
+    # Nested values, like the lists of images, are kept as JSON
+    return [_get_value(product.get(column)) for column in columns]
+
+
+def _get_value(value):
+    if isinstance(value, (dict, list)):
+        return dump_json(value).decode()
+    return value
+
+
+def write_parquet(source_path, path, columns=None):
+    """Converts an NDJSON file to Parquet, reading ``PARQUET_BATCH_SIZE`` lines at a time."""
+    import pyarrow
+    import pyarrow.parquet
+
+    writer = None
+    temporary_path = path + '.tmp'
+    try:
+        with open(source_path, 'rb') as source:
+            while True:
+                lines = [line for _, line in zip(range(PARQUET_BATCH_SIZE), source)]
+                if not lines:
+                    break
+                products = [json.loads(line) for line in lines]
+                if columns is None:
+                    columns = list(products[0])
+                table = {column: [_get_value(product.get(column)) for product in products]
+                         for column in columns}
+
+                if writer is None:
+                    # Columns without values in the first batch are written as strings
+                    schema = pyarrow.Table.from_pydict(table).schema
+                    schema = pyarrow.schema([
+                        pyarrow.field(field.name, pyarrow.string())
+                        if pyarrow.types.is_null(field.type) else field for field in schema])
+                    writer = pyarrow.parquet.ParquetWriter(temporary_path, schema)
+                writer.write_table(pyarrow.Table.from_pydict(table, schema=schema))
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if writer is not None:
+        os.replace(temporary_path, path)
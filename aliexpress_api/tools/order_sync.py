@@ -0,0 +1,222 @@
+"""Parallel order synchronization over long date ranges."""
+
+from ..errors import InvalidArgumentException, OrdersNotFoundException
+from .. import models
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone, tzinfo
+from functools import lru_cache
+from typing import Iterator
+import json
+import os
+import warnings
+
+
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+# Times sent and returned by the API are in US Pacific time
+API_TIMEZONE = 'America/Los_Angeles'
+
+
+class OrderSync:
+    """Fetches every order of a date range, splitting it in time windows requested in parallel.
+
+    Orders are deduplicated by ``order_id`` and ``sub_order_id``. Windows with more pages than
+    ``max_pages`` are split in halves until they fit. The end of the synced range is stored as
+    a high-water mark, so the next run only fetches what changed since then.
+
+    Windows that still have more than ``max_pages`` pages at ``min_window`` size are only read
+    up to ``max_pages``. They are added to ``truncated`` with a warning, and the high-water
+    mark stays before them, so the next run requests them again.
+
+    Args:
+        api (AliexpressApi): The client used to request the orders.
+        status (str): Status filter for the orders, e.g., 'Payment Completed'.
+        state_path (str): JSON file where the high-water mark is kept. Defaults to None,
+            which keeps it only in memory.
+        window (timedelta): Initial size of each time window. Defaults to 1 day.
+        min_window (timedelta): Windows are never split below this size, at least 1 second.
+            Defaults to 1 minute.
+        lookback (timedelta): Time before the high-water mark that is synced again, to catch
+            late updates. Defaults to 1 hour.
+        max_workers (int): Maximum number of requests in parallel. Defaults to 4.
+        max_pages (int): Maximum pages to read from a single window. Defaults to 20.
+        page_size (int): Number of records per page, up to 50. Defaults to 50.
+        fields (str | list[str]): The fields to include in the orders.
+    """
+
+    def __init__(self, api, status: str,
+                 state_path: str = None,
+                 window: timedelta = timedelta(days=1),
+                 min_window: timedelta = timedelta(minutes=1),
+                 lookback: timedelta = timedelta(hours=1),
+                 max_workers: int = 4,
+                 max_pages: int = 20,
+                 page_size: int = 50,
+                 fields=None):
+        if min_window < timedelta(seconds=1):
+            raise InvalidArgumentException('min_window should be at least 1 second')
+
+        self.api = api
+        self.status = status
+        self.state_path = state_path
+        self.window = window
+        self.min_window = min_window
+        self.lookback = lookback
+        self.max_workers = max_workers
+        self.max_pages = max_pages
+        self.page_size = page_size
+        self.fields = fields
+        self.truncated = []
+        self.watermark = self._load_watermark()
+
+    def sync(self, start_time: str = None, end_time: str = None) -> Iterator[models.Order]:
+        """Yields the orders of the range as they arrive and advances the high-water mark.
+
+        Args:
+            start_time (str): Start time in format 'YYYY-MM-DD HH:MM:SS'. Defaults to the
+                high-water mark minus ``lookback``.
+            end_time (str): End time in format 'YYYY-MM-DD HH:MM:SS'. Defaults to now, in the
+                API timezone.
+
+        Yields:
+            Order: Each unique order found.
+        """
+        end = parse_time(end_time) if end_time else get_api_now()
+        if start_time:
+            start = parse_time(start_time)
+        elif self.watermark:
+            start = self.watermark - self.lookback
+        else:
+            raise InvalidArgumentException('start_time is required when there is no high-water mark')
+
+        windows = []
+        while start < end:
+            windows.append(_Window(start, min(start + self.window, end)))
+            start = windows[-1].end
+
+        seen = set()
+        self.truncated = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = {executor.submit(self._fetch_page, window, 1): (window, 1) for window in windows}
+            try:
+                yield from self._collect(executor, windows, pending, seen)
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _collect(self, executor, windows, pending, seen):
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                window, page_no = pending.pop(future)
+                response = future.result()
+
+                if page_no == 1:
+                    total_pages = getattr(response, 'total_page_no', 1) if response else 0
+                    if total_pages > self.max_pages and window.end - window.start > self.min_window:
+                        halves = window.split()
+                        position = windows.index(window)
+                        windows[position:position + 1] = halves
+                        for half in halves:
+                            pending[executor.submit(self._fetch_page, half, 1)] = (half, 1)
+                        continue
+                    if total_pages > self.max_pages:
+                        window.truncated = True
+                        self.truncated.append((format_time(window.start), format_time(window.end)))
+                        warnings.warn(f'Orders from {format_time(window.start)} to '
+                                      f'{format_time(window.end)} have more than {self.max_pages} '
+                                      'pages, only the first ones are synced')
+                    window.pending = max(min(total_pages, self.max_pages) - 1, 0)
+                    for next_page in range(2, window.pending + 2):
+                        pending[executor.submit(self._fetch_page, window, next_page)] = (window, next_page)
+                else:
+                    window.pending -= 1
+
+                for order in response.orders if response else []:
+                    key = (getattr(order, 'order_id', None), getattr(order, 'sub_order_id', None))
+                    if key not in seen:
+                        seen.add(key)
+                        yield order
+
+                if window.pending == 0:
+                    window.done = True
+                    self._advance_watermark(windows)
+
+    def _fetch_page(self, window, page_no):
+        try:
+            return self.api.get_order_list(self.status, format_time(window.start),
+                format_time(window.end), fields=self.fields, page_no=page_no,
+                page_size=self.page_size)
+        except OrdersNotFoundException:
+            return None
+
+    def _advance_watermark(self, windows):
+        watermark = self.watermark
+        for window in windows:
+            if not window.done or window.truncated:
+                break
+            watermark = window.end
+
+        if watermark and (not self.watermark or watermark > self.watermark):
+            self.watermark = watermark
+            self._save_watermark()
+
+    def _load_watermark(self):
+        if not self.state_path or not os.path.exists(self.state_path):
+            return None
+        with open(self.state_path) as state_file:
+            watermark = json.load(state_file).get(self.status)
+        return parse_time(watermark) if watermark else None
+
+    def _save_watermark(self):
+        if not self.state_path:
+            return
+
+        state = {}
+        if os.path.exists(self.state_path):
+            with open(self.state_path) as state_file:
+                state = json.load(state_file)
+        state[self.status] = format_time(self.watermark)
+
+        temporary_path = self.state_path + '.tmp'
+        with open(temporary_path, 'w') as state_file:
+            json.dump(state, state_file)
+        os.replace(temporary_path, self.state_path)
+
+
+class _Window:
+    def __init__(self, start, end):
+        self.start = start
+        self.end = end
+        self.pending = None
+        self.done = False
+        self.truncated = False
+
+    def split(self):
+        middle = self.start + (self.end - self.start) / 2
+        # The API takes whole seconds, and each half keeps at least one
+        middle = max(middle.replace(microsecond=0), self.start + timedelta(seconds=1))
+        return [_Window(self.start, middle), _Window(middle, self.end)]
+
+
+def parse_time(value: str) -> datetime:
+    return datetime.strptime(value, TIME_FORMAT)
+
+
+def format_time(value: datetime) -> str:
+    return value.strftime(TIME_FORMAT)
+
+
+@lru_cache(maxsize=None)
+def get_api_timezone() -> tzinfo:
+    """Returns the timezone of the API times, or UTC-8 without the timezone database."""
+    try:
+        from zoneinfo import ZoneInfo
+        return ZoneInfo(API_TIMEZONE)
+    except (ImportError, LookupError):
+        return timezone(timedelta(hours=-8), 'PST')
+
+
+def get_api_now() -> datetime:
+    """Returns the current time in the API timezone, naive like the parsed API times."""
+    return datetime.now(get_api_timezone()).replace(tzinfo=None, microsecond=0)
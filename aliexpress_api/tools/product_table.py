@@ -0,0 +1,309 @@
+"""Columnar storage of products for fast filtering and ranking."""
+
+from ..errors import InvalidArgumentException
+from ..models.base import to_float
+
+from array import array
+from itertools import compress
+from operator import attrgetter, itemgetter, or_
+from typing import Dict, Iterable, List
+import heapq
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# Stored in place of the values that are missing or can't be converted
+MISSING = -1
+
+INTEGER = 'integer'
+HUNDREDTHS = 'hundredths'
+
+# Column name: (product fields read in order until one has a value, conversion)
+COLUMNS = {
+    'product_id': (('product_id',), INTEGER),
+    'price': (('target_sale_price', 'sale_price'), HUNDREDTHS),
+    'original_price': (('target_original_price', 'original_price'), HUNDREDTHS),
+    'discount': (('discount',), HUNDREDTHS),
+    'commission_rate': (('commission_rate',), HUNDREDTHS),
+    'hot_product_commission_rate': (('hot_product_commission_rate',), HUNDREDTHS),
+    'evaluate_rate': (('evaluate_rate',), HUNDREDTHS),
+    'lastest_volume': (('lastest_volume',), INTEGER),
+    'first_level_category_id': (('first_level_category_id',), INTEGER),
+    'second_level_category_id': (('second_level_category_id',), INTEGER),
+}
+
+
+class ProductTable:
+    """Keeps the numeric fields of many products in one array per column.
+
+    Prices are stored as integer cents and percentages, like discounts and commission rates,
+    as integer basis points, so ``'7.5%'`` is 750 and ``'12.34'`` is 1234. Missing values are
+    stored as -1. Columns are NumPy arrays when NumPy is installed, or ``array`` module arrays
+    otherwise, and the operations on them are vectorized when NumPy is available.
+
+    Args:
+        products (list[Product]): Products, or product dicts from raw responses, to add.
+        keep_products (bool): Keeps the product objects too, available with ``get_products``.
+            Defaults to False.
+        use_numpy (bool): Uses NumPy arrays. Defaults to True when NumPy is installed.
+    """
+
+    def __init__(self, products: Iterable = (), keep_products: bool = False, use_numpy: bool = None):
+        self.use_numpy = numpy is not None if use_numpy is None else use_numpy
+        self.keep_products = keep_products
+        self.products = [] if keep_products else None
+        self._size = 0
+        self._columns = {name: self._new_column() for name in COLUMNS}
+        self._source = None
+        self._indexes = None
+        self.append(products)
+
+    def __len__(self):
+        return self._size
+
+    def append(self, products: Iterable):
+        """Adds a page of products, a ``ProductsResponse`` or any list of products."""
+        products = getattr(products, 'products', products)
+        if not isinstance(products, list):
+            products = list(products)
+        if not products:
+            return
+
+        if self._source is not None:
+            self._load_columns()
+        for name, (fields, conversion) in COLUMNS.items():
+            values = _get_column(products, fields, conversion)
+            if self.use_numpy:
+                self._columns[name] = self._extend(self._columns[name], values)
+            else:
+                self._columns[name].extend(values)
+
+        if self.keep_products:
+            self.products.extend(products)
+        self._size += len(products)
+
+    def column(self, name: str):
+        """Returns the values of a column, without copying them."""
+        column = self._columns.get(name)
+        if column is None:
+            column = self._columns[name] = self._take_column(name)
+        return column[:self._size] if self.use_numpy else column
+
+    def filter(self,
+               min_price: int = None,
+               max_price: int = None,
+               min_discount: int = None,
+               min_commission_rate: int = None,
+               min_evaluate_rate: int = None,
+               min_volume: int = None,
+               category_ids: List[int] = None) -> 'ProductTable':
+        """Returns the products matching all the conditions given.
+
+        Args:
+            min_price (int): Minimum price in cents.
+            max_price (int): Maximum price in cents.
+            min_discount (int): Minimum discount in basis points.
+            min_commission_rate (int): Minimum commission rate in basis points.
+            min_evaluate_rate (int): Minimum evaluate rate in basis points.
+            min_volume (int): Minimum ``lastest_volume``.
+            category_ids (list[int]): First or second level category IDs.
+
+        Returns:
+            ProductTable: A new table with the matching products.
+        """
+        conditions = []
+        if min_price is not None:
+            conditions.append(('price', '>=', min_price))
+        if max_price is not None:
+            conditions.append(('price', '>=', 0))
+            conditions.append(('price', '<=', max_price))
+        if min_discount is not None:
+            conditions.append(('discount', '>=', min_discount))
+        if min_commission_rate is not None:
+            conditions.append(('commission_rate', '>=', min_commission_rate))
+        if min_evaluate_rate is not None:
+            conditions.append(('evaluate_rate', '>=', min_evaluate_rate))
+        if min_volume is not None:
+            conditions.append(('lastest_volume', '>=', min_volume))
+
+        if self.use_numpy:
+            mask = numpy.ones(self._size, dtype=bool)
+            for name, operator, value in conditions:
+                column = self.column(name)
+                mask &= column >= value if operator == '>=' else column <= value
+            if category_ids is not None:
+                mask &= (numpy.isin(self.column('first_level_category_id'), category_ids)
+                         | numpy.isin(self.column('second_level_category_id'), category_ids))
+            return self.take(numpy.flatnonzero(mask))
+
+        # Each condition only checks the products that passed the previous ones, mapping the
+        # comparisons over the values instead of looping over the indexes
+        indexes = range(self._size)
+        for name, operator, value in conditions:
+            values = _take_values(self.column(name), indexes)
+            matches = map(value.__le__ if operator == '>=' else value.__ge__, values)
+            indexes = list(compress(indexes, matches))
+        if category_ids is not None:
+            category_ids = set(category_ids)
+            matches = map(or_,
+                map(category_ids.__contains__, _take_values(self.column('first_level_category_id'), indexes)),
+                map(category_ids.__contains__, _take_values(self.column('second_level_category_id'), indexes)))
+            indexes = list(compress(indexes, matches))
+        return self.take(indexes)
+
+    def sort(self, name: str, reverse: bool = False) -> 'ProductTable':
+        """Returns the products sorted by a column. Ties keep their order."""
+        column = self.column(name)
+        if self.use_numpy:
+            indexes = numpy.argsort(-column if reverse else column, kind='stable')
+        else:
+            indexes = sorted(range(self._size), key=column.__getitem__, reverse=reverse)
+        return self.take(indexes)
+
+    def top(self, name: str, k: int, reverse: bool = True) -> 'ProductTable':
+        """Returns the ``k`` products with the highest values of a column, or the lowest ones
+        with ``reverse=False``, sorted, without sorting the whole table."""
+        k = min(k, self._size)
+        if k <= 0:
+            return self.take([])
+
+        column = self.column(name)
+        if self.use_numpy:
+            # Ties with the k-th value are taken in order, like a stable sort would do
+            keys = -column if reverse else column
+            kth = numpy.partition(keys, k - 1)[k - 1]
+            smaller = numpy.flatnonzero(keys < kth)
+            equal = numpy.flatnonzero(keys == kth)[:k - len(smaller)]
+            indexes = numpy.sort(numpy.concatenate((smaller, equal)))
+            return self.take(indexes[numpy.argsort(keys[indexes], kind='stable')])
+
+        select = heapq.nlargest if reverse else heapq.nsmallest
+        return self.take(select(k, range(self._size), key=column.__getitem__))
+
+    def group_by(self, name: str = 'first_level_category_id') -> Dict[int, 'ProductTable']:
+        """Splits the products by the values of a column, usually a category ID."""
+        column = self.column(name)
+        if self.use_numpy:
+            order = numpy.argsort(column, kind='stable')
+            values, starts = numpy.unique(column[order], return_index=True)
+            return {int(value): self.take(indexes)
+                    for value, indexes in zip(values, numpy.split(order, starts[1:]))}
+
+        groups = {}
+        for index, value in enumerate(column):
+            groups.setdefault(value, []).append(index)
+        return {value: self.take(indexes) for value, indexes in groups.items()}
+
+    def take(self, indexes) -> 'ProductTable':
+        """Returns a new table with the products at the given positions."""
+        # Columns are copied when they are first used, so a table that is sorted or split
+        # only pays for the columns that are read afterwards
+        table = ProductTable(keep_products=self.keep_products, use_numpy=self.use_numpy)
+        table._columns = {}
+        table._source = self
+        table._indexes = numpy.asarray(indexes, dtype=numpy.intp) if self.use_numpy else indexes
+        if self.keep_products:
+            table.products = [self.products[index] for index in indexes]
+        table._size = len(indexes)
+        return table
+
+    def get_products(self) -> list:
+        """Returns the product objects, in the order of the table. Requires ``keep_products``."""
+        if not self.keep_products:
+            raise InvalidArgumentException('The products are only kept with keep_products=True')
+        return self.products
+
+    def to_dicts(self) -> List[dict]:
+        """Returns the columns of each product as a dict."""
+        columns = {name: self.column(name).tolist() for name in COLUMNS}
+        return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+    def _take_column(self, name):
+        column = self._source.column(name)
+        if self.use_numpy:
+            return column[self._indexes]
+        return array('q', _take_values(column, self._indexes))
+
+    def _load_columns(self):
+        for name in COLUMNS:
+            self.column(name)
+        self._source = None
+        self._indexes = None
+
+    def _new_column(self):
+        return numpy.empty(0, dtype=numpy.int64) if self.use_numpy else array('q')
+
+    def _extend(self, column, values):
+        # Capacity doubles when full, so appending pages one by one copies each value few times
+        size = self._size + len(values)
+        if size > len(column):
+            grown = numpy.empty(max(size, 2 * len(column)), dtype=numpy.int64)
+            grown[:self._size] = column[:self._size]
+            column = grown
+        column[self._size:size] = numpy.frombuffer(values, dtype=numpy.int64)
+        return column
+
+
+def _take_values(column, indexes):
+    if isinstance(indexes, range) and len(indexes) == len(column):
+        return column
+    if len(indexes) == 1:
+        return [column[indexes[0]]]
+    return itemgetter(*indexes)(column) if indexes else ()
+
+
+def _get_column(products, fields, conversion):
+    values = _get_values(products, fields[0])
+    for field in fields[1:]:
+        if None in values:
+            values = [_get_value(product, field) if value is None else value
+                      for product, value in zip(products, values)]
+
+    # Values already converted by the models skip the parsing
+    if conversion == HUNDREDTHS:
+        if numpy is not None:
+            try:
+                column = numpy.array(values, dtype=numpy.float64)
+            except (TypeError, ValueError):
+                pass
+            else:
+                column = numpy.rint(column * 100)
+                column[numpy.isnan(column)] = MISSING
+                return array('q', column.astype(numpy.int64).tobytes())
+        return array('q', [round(value * 100) if value.__class__ is float
+                           else _to_hundredths(value) for value in values])
+    return array('q', [value if value.__class__ is int else _to_integer(value) for value in values])
+
+
+def _get_values(products, field):
+    if isinstance(products[0], dict):
+        return [product.get(field) for product in products]
+    try:
+        return list(map(attrgetter(field), products))
+    except AttributeError:
+        return [getattr(product, field, None) for product in products]
+
+
+def _get_value(product, field):
+    return product.get(field) if isinstance(product, dict) else getattr(product, field, None)
+
+
+def _to_hundredths(value):
+    if value is None:
+        return MISSING
+    try:
+        return round(to_float(value) * 100)
+    except (TypeError, ValueError):
+        return MISSING
+
+
+def _to_integer(value):
+    if value is None:
+        return MISSING
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return MISSING
@@ -0,0 +1,116 @@
+"""Parallel crawl of the products of every featured promotion."""
+
+from ..errors import ProductsNotFoudException
+from .. import models
+from .order_sync import get_api_timezone, parse_time
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from typing import Iterator, List, Tuple, Union
+
+
+class PromoCrawler:
+    """Fetches the products of all the featured promotions, requesting their pages in parallel.
+
+    Each promotion, or each promotion and category when ``category_ids`` is given, is crawled
+    page by page. First pages are requested before the rest, so every promotion starts
+    returning products early. At most ``max_workers`` pages are requested at the same time,
+    and no more are requested until their products are consumed, which keeps memory bounded.
+    Promotions whose ``promotion_end_time`` has passed are skipped.
+
+    Args:
+        api (AliexpressApi): The client used to request the products.
+        max_workers (int): Maximum number of requests in parallel. Defaults to 8.
+        page_size (int): Number of products per page, up to 50. Defaults to 50.
+        max_pages (int): Maximum pages to read from each promotion and category. Defaults to all.
+        category_ids (list[str]): Categories crawled separately in each promotion. Defaults
+            to None, which crawls the promotions without category filter.
+        country (str): Filter products that can be sent to that country.
+        fields (str | list[str]): The fields to include in the products.
+        sort (models.SortBy): Specifies the sort method.
+    """
+
+    def __init__(self, api,
+                 max_workers: int = 8,
+                 page_size: int = 50,
+                 max_pages: int = None,
+                 category_ids: List[str] = None,
+                 country: str = None,
+                 fields: Union[str, List[str]] = None,
+                 sort: models.SortBy = None):
+        self.api = api
+        self.max_workers = max_workers
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.category_ids = category_ids
+        self.country = country
+        self.fields = fields
+        self.sort = sort
+        self.skipped = []
+
+    def crawl(self, promos: List[models.Promo] = None) -> Iterator[Tuple[models.Promo, models.Product]]:
+        """Yields the products of the promotions as they arrive.
+
+        Args:
+            promos (list[models.Promo]): The promotions to crawl. Defaults to all the featured
+                promotions.
+
+        Yields:
+            tuple[Promo, Product]: Each product found and its promotion.
+        """
+        if promos is None:
+            promos = self.api.get_featured_promos()
+
+        now = datetime.now(timezone.utc)
+        self.skipped = [promo for promo in promos if has_ended(promo, now)]
+        queue = deque((promo, category_id, 1)
+                      for promo in promos if not has_ended(promo, now)
+                      for category_id in self.category_ids or [None])
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = {}
+            try:
+                while queue or pending:
+                    while queue and len(pending) < self.max_workers:
+                        page = queue.popleft()
+                        pending[executor.submit(self._fetch_page, *page)] = page
+
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        promo, category_id, page_no = pending.pop(future)
+                        response = future.result()
+                        if response is None:
+                            continue
+
+                        if page_no == 1:
+                            total_pages = getattr(response, 'total_page_no', None) or 1
+                            if self.max_pages:
+                                total_pages = min(total_pages, self.max_pages)
+                            queue.extend((promo, category_id, next_page)
+                                         for next_page in range(2, total_pages + 1))
+
+                        for product in response.products:
+                            yield promo, product
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _fetch_page(self, promo, category_id, page_no):
+        try:
+            return self.api.get_featured_promo_products(promo.promo_name, category_id,
+                self.country, self.fields, page_no, self.page_size, sort=self.sort)
+        except ProductsNotFoudException:
+            return None
+
+
+def has_ended(promo: models.Promo, now: datetime = None) -> bool:
+    """Returns whether the promotion end time has passed. A naive ``now`` is local time."""
+    end_time = getattr(promo, 'promotion_end_time', None)
+    if not end_time:
+        return False
+    try:
+        end_time = parse_time(end_time).replace(tzinfo=get_api_timezone())
+    except ValueError:
+        return False
+    return end_time < (now.astimezone() if now else datetime.now(timezone.utc))
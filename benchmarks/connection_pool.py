@@ -0,0 +1,40 @@
+"""Sequential calls per second with and without the keep-alive connection pool.
+
+    python benchmarks/connection_pool.py
+
+Without the pool every call opens a new connection, like before the pool was added.
+"""
+
+import time
+
+import stub
+from aliexpress_api.skd import setDefaultAppInfo
+from aliexpress_api.skd.api import base
+from aliexpress_api.skd.api.rest import AliexpressAffiliateCategoryGetRequest
+
+CALLS = 3000
+WARMUP_CALLS = 200
+
+
+def get_calls_per_second(calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        AliexpressAffiliateCategoryGetRequest().getResponse()
+    return calls / (time.perf_counter() - start)
+
+
+def main():
+    stub.start()
+    setDefaultAppInfo('key', 'secret')
+
+    maxsize = base.connection_pool.maxsize
+    for name, pool_size in (('new connection per call', 0), ('pooled', maxsize)):
+        # With no idle connections allowed, each one is closed when it is released
+        base.connection_pool.maxsize = pool_size
+        base.connection_pool.clear()
+        get_calls_per_second(WARMUP_CALLS)
+        print(f'{name:<24} {get_calls_per_second(CALLS):>6.0f} calls/s')
+
+
+if __name__ == '__main__':
+    main()
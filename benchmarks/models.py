@@ -0,0 +1,64 @@
+"""Memory and build time of the product models against the previous SimpleNamespace results.
+
+    python benchmarks/models.py
+
+Builds 100k products from pages of 50, each with 14 fields. The previous results are built
+like ``helpers.parse_products`` did, with a SimpleNamespace object hook. Memory is what the
+products keep allocated, measured with tracemalloc.
+"""
+
+from types import SimpleNamespace
+import gc
+import json
+import timeit
+import tracemalloc
+
+import stub  # noqa: F401, adds the repository to the import path
+from aliexpress_api.models import ProductsResponse
+
+PRODUCTS = 100000
+PAGE_SIZE = 50
+
+
+def get_product(product_id):
+    return {'product_id': product_id, 'product_title': f'Product {product_id}',
+            'target_sale_price': '12.34', 'target_sale_price_currency': 'EUR',
+            'commission_rate': '7.0%', 'discount': '50%', 'evaluate_rate': '95.5%',
+            'lastest_volume': 120, 'first_level_category_id': 1, 'second_level_category_id': 2,
+            'shop_id': 99, 'original_price': '24.68',
+            'product_small_image_urls': {'string': ['a.jpg', 'b.jpg']},
+            'promotion_link': f'https://s.click.aliexpress.com/e/_{product_id}'}
+
+
+PAGE = json.dumps({'current_record_count': PAGE_SIZE, 'products': {
+    'product': [get_product(1000 + index) for index in range(PAGE_SIZE)]}}).encode()
+
+
+def build_namespaces():
+    response = json.loads(PAGE, object_hook=lambda values: SimpleNamespace(**values))
+    products = response.products.product
+    for product in products:
+        product.product_small_image_urls = product.product_small_image_urls.string
+    return products
+
+
+def build_models():
+    return ProductsResponse.from_dict(json.loads(PAGE)).products
+
+
+def main():
+    print(f'{"Results":<16} {"Retained memory":>16} {"Build time":>14}')
+    for name, build in (('SimpleNamespace', build_namespaces), ('Product', build_models)):
+        gc.collect()
+        tracemalloc.start()
+        kept = [product for _ in range(PRODUCTS // PAGE_SIZE) for product in build()]
+        retained = tracemalloc.get_traced_memory()[0] / len(kept)
+        tracemalloc.stop()
+        del kept
+
+        seconds = min(timeit.repeat(build, number=200, repeat=5)) / 200 / PAGE_SIZE
+        print(f'{name:<16} {retained:>8.0f} B/product {seconds * 1e6:>7.1f} µs/product')
+
+
+if __name__ == '__main__':
+    main()
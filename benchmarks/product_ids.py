@@ -0,0 +1,90 @@
+"""Product ID extraction from 1M mixed URLs and IDs.
+
+    python benchmarks/product_ids.py [processes ...]
+
+Compares the previous ``get_product_id`` loop, with uncompiled patterns, against the
+compiled one and ``iter_product_ids`` reading a file. Pass process counts to also run
+``iter_product_ids`` with worker processes, which only helps on multi-core hosts.
+"""
+
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+import stub  # noqa: F401, adds the repository to the import path
+from aliexpress_api.errors import ProductIdNotFoundException
+from aliexpress_api.tools import get_product_id, iter_product_ids
+
+INPUTS = 1000000
+
+
+def get_input(index):
+    # 10% are short links without an ID
+    kind = random.random()
+    product_id = str(random.randrange(10 ** 15, 10 ** 16))
+    if kind < 0.3:
+        return (f'https://www.aliexpress.com/item/{product_id}.html'
+                f'?spm=a2g0o.productlist.0.0&algo_pvid={index}')
+    if kind < 0.5:
+        return f'https://m.aliexpress.com/item/{product_id}.html'
+    if kind < 0.7:
+        return (f'https://es.aliexpress.com/item/{product_id}.html'
+                f'?gatewayAdapt=glo2esp&productId={product_id}')
+    if kind < 0.9:
+        return product_id
+    return f'https://s.click.aliexpress.com/e/_Dabc{index}'
+
+
+def get_product_id_uncompiled(text):
+    if re.search(r'^[0-9]*$', text):
+        return text
+    match = re.search(r'(\/)([0-9]*)(\.)', text)
+    if match:
+        return match.group(2)
+    raise ProductIdNotFoundException('Product id not found: ' + text)
+
+
+def run_loop(function, texts):
+    found = 0
+    for text in texts:
+        try:
+            function(text.rstrip('\n'))
+            found += 1
+        except ProductIdNotFoundException:
+            pass
+    return found
+
+
+def run_iterator(path, processes=None):
+    with open(path) as texts:
+        return sum(isinstance(product_id, str)
+                   for _, product_id in iter_product_ids(texts, processes=processes))
+
+
+def measure(name, function, *args):
+    start = time.perf_counter()
+    found = function(*args)
+    print(f'{name:<32} {time.perf_counter() - start:>6.2f} s  {found:>9,} IDs')
+
+
+def main():
+    random.seed(0)
+    texts = [get_input(index) + '\n' for index in range(INPUTS)]
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as urls:
+        urls.writelines(texts)
+
+    try:
+        measure('old get_product_id loop', run_loop, get_product_id_uncompiled, texts)
+        measure('compiled get_product_id loop', run_loop, get_product_id, texts)
+        measure('iter_product_ids from a file', run_iterator, urls.name)
+        for processes in map(int, sys.argv[1:]):
+            measure(f'iter_product_ids processes={processes}', run_iterator, urls.name, processes)
+    finally:
+        os.remove(urls.name)
+
+
+if __name__ == '__main__':
+    main()
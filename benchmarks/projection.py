@@ -0,0 +1,39 @@
+"""Bytes transferred and decode time per page with field projections.
+
+    python benchmarks/projection.py
+
+Requests a page of 50 products from the local stub with each projection, then decodes
+the same body repeatedly. Decode time covers parse_response plus the models.
+"""
+
+import json
+import time
+
+import stub
+from aliexpress_api import AliexpressApi, models
+from aliexpress_api.helpers import parse_response
+
+RUNS = 200
+RESPONSE_NAME = 'aliexpress_affiliate_product_query_response'
+
+
+def main():
+    server = stub.start()
+    api = AliexpressApi('key', 'secret', models.Language.EN, models.Currency.EUR, 'tracking')
+
+    print(f'{"Fields":<14} {"Bytes per page":>14} {"Decode per page":>16}')
+    for name, fields in (('all', None), ('PRICE_ONLY', models.PRICE_ONLY),
+                         ('LINK_ONLY', models.LINK_ONLY)):
+        result = api.get_products(keywords='phone', page_size=50, fields=fields, raw=True)
+        body = json.dumps({RESPONSE_NAME: {'resp_result': result}}).encode()
+
+        best = float('inf')
+        for _ in range(RUNS):
+            start = time.perf_counter()
+            api._products_response(parse_response(body, RESPONSE_NAME), fields=fields)
+            best = min(best, time.perf_counter() - start)
+        print(f'{name:<14} {server.sent[-1]:>14,} {best * 1e6:>13.0f} µs')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""Local stub of the API used by the benchmarks.
+
+Answers the product methods with pages of complete products and honours ``fields``, like
+the real API. Every other method gets an empty result.
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+import sys
+import threading
+import urllib.parse
+
+# Lets the benchmarks import the package from the repository without installing it
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aliexpress_api import models  # noqa: E402
+import aliexpress_api.skd.api.rest as rest  # noqa: E402
+
+
+def get_product(product_id):
+    """Returns a product with every field of the model filled in."""
+    product = {field: f'value of {field}' for field in models.Product.__annotations__}
+    product.update({
+        'product_id': product_id,
+        'product_title': f'Product {product_id}',
+        'product_detail_url': f'https://www.aliexpress.com/item/{product_id}.html',
+        'product_main_image_url': f'https://ae01.alicdn.com/kf/{product_id}/main.jpg',
+        'product_small_image_urls': {'string': ['a.jpg', 'b.jpg']},
+        'promotion_link': f'https://s.click.aliexpress.com/e/_{product_id}',
+        'shop_url': f'https://www.aliexpress.com/store/{product_id}',
+        'shop_id': 99,
+        'lastest_volume': 120,
+        'first_level_category_id': 1,
+        'second_level_category_id': 2,
+    })
+    for field in ('sale_price', 'app_sale_price', 'original_price', 'target_sale_price',
+                  'target_app_sale_price', 'target_original_price'):
+        product[field] = '12.34'
+    for field in ('sale_price_currency', 'app_sale_price_currency', 'original_price_currency',
+                  'target_sale_price_currency', 'target_app_sale_price_currency',
+                  'target_original_price_currency'):
+        product[field] = 'EUR'
+    for field in ('commission_rate', 'hot_product_commission_rate',
+                  'relevant_market_commission_rate', 'discount', 'evaluate_rate'):
+        product[field] = '7.5%'
+    return product
+
+
+def get_result(method, params):
+    if method == 'aliexpress.affiliate.productdetail.get':
+        product_ids = [int(product_id) for product_id in params['product_ids'].split(',')]
+    elif method in ('aliexpress.affiliate.product.query', 'aliexpress.affiliate.hotproduct.query'):
+        page_size = int(params.get('page_size', 50))
+        first = 1005000000000 + (int(params.get('page_no', 1)) - 1) * page_size
+        product_ids = range(first, first + page_size)
+    else:
+        return {}
+
+    products = [get_product(product_id) for product_id in product_ids]
+    if params.get('fields'):
+        fields = params['fields'].split(',')
+        products = [{field: product[field] for field in fields if field in product}
+                    for product in products]
+    return {'current_record_count': len(products), 'total_record_count': 100000,
+            'products': {'product': products}}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0))).decode()
+        method = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)['method'][0]
+        params = {key: value[0] for key, value in urllib.parse.parse_qs(body).items()}
+        response = {method.replace('.', '_') + '_response': {
+            'resp_result': {'resp_code': 200, 'resp_msg': 'ok', 'result': get_result(method, params)}}}
+        data = json.dumps(response).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        self.server.sent.append(len(data))
+
+    def log_message(self, *args):
+        pass
+
+
+def start(host='127.0.0.1', port=0, context=None):
+    """Starts the stub in a thread and sends the requests of every client to it.
+
+    Args:
+        host (str): Address to listen on.
+        port (int): Port to listen on. Defaults to any free one.
+        context (ssl.SSLContext): Serves HTTPS with this context.
+
+    Returns:
+        The server. Its ``sent`` list has the size of each response body.
+    """
+    server = ThreadingHTTPServer((host, port), StubHandler)
+    server.daemon_threads = True
+    server.sent = []
+    if context is not None:
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    for name in rest.__all__:
+        getattr(rest, name).__init__.__defaults__ = (host, server.server_address[1])
+    return server
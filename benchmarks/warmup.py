@@ -0,0 +1,96 @@
+"""Time to the first call, with and without warmup(), and reconnect time over HTTPS.
+
+    python benchmarks/warmup.py
+
+The stub is served over HTTPS on localhost, with the test certificate, and every lookup
+of localhost takes 20 ms more to simulate the resolver. Each measurement runs in a fresh
+process. Reconnects are measured before the DNS cache and TLS session reuse, by dropping
+both before each one, and with them.
+"""
+
+import os
+import socket
+import ssl
+import statistics
+import subprocess
+import sys
+import time
+
+import stub
+from aliexpress_api import AliexpressApi, models
+from aliexpress_api.skd.api import base
+
+KEYCERT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                       'tests', 'keycert.pem')
+DNS_DELAY = 0.02
+PROCESSES = 3
+RECONNECTS = 30
+
+
+def slow_resolver(getaddrinfo):
+    def resolve(host, *args, **kwargs):
+        if host == 'localhost':
+            time.sleep(DNS_DELAY)
+        return getaddrinfo(host, *args, **kwargs)
+    return resolve
+
+
+def get_reconnect_time(api, reuse):
+    times = []
+    for _ in range(RECONNECTS):
+        base.connection_pool.clear()
+        if not reuse:
+            base.connection_pool._sessions.clear()
+            base.dns_cache.clear()
+        start = time.perf_counter()
+        api.get_products_details('1003')
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def run(mode):
+    socket.getaddrinfo = slow_resolver(socket.getaddrinfo)
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(KEYCERT)
+    server = stub.start('localhost', context=context)
+    # The stub port is used as the HTTPS port, so it runs without privileges
+    base.HTTPS_PORT = server.server_address[1]
+    base._ssl_context = ssl.create_default_context(cafile=KEYCERT)
+    api = AliexpressApi('key', 'secret', models.Language.EN, models.Currency.EUR, 'tracking')
+
+    warmup = 0
+    if mode == 'warm':
+        start = time.perf_counter()
+        api.warmup()
+        warmup = time.perf_counter() - start
+    start = time.perf_counter()
+    api.get_products_details('1001')
+    first = time.perf_counter() - start
+
+    print(f'{first * 1000:.1f} {warmup * 1000:.1f} {get_reconnect_time(api, reuse=False) * 1000:.2f} '
+          f'{get_reconnect_time(api, reuse=True) * 1000:.2f}')
+
+
+def main():
+    results = {}
+    for mode in ('cold', 'warm'):
+        for _ in range(PROCESSES):
+            output = subprocess.run([sys.executable, __file__, mode], capture_output=True,
+                                    text=True, check=True).stdout
+            results.setdefault(mode, []).append([float(value) for value in output.split()])
+
+    def get_range(mode, column, unit='ms'):
+        values = [result[column] for result in results[mode]]
+        return f'{min(values):.1f}-{max(values):.1f} {unit}'
+
+    print(f'first call, without warmup()   {get_range("cold", 0)}')
+    print(f'first call, after warmup()     {get_range("warm", 0)} (warmup takes {get_range("warm", 1)})')
+    print(f'reconnect median, no reuse     {get_range("cold", 2)}')
+    print(f'reconnect median, with reuse   {get_range("cold", 3)}')
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        run(sys.argv[1])
+    else:
+        main()
@@ -0,0 +1,185 @@
+import contextlib
+import json
+import os
+import socket
+import ssl
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from aliexpress_api import AliexpressApi, models
+from aliexpress_api.skd.api import base
+import aliexpress_api.skd.api.rest as rest
+
+
+def get_product(product_id):
+    return {'product_id': int(product_id), 'product_title': f'Product {product_id}',
+            'target_sale_price': '12.34', 'target_sale_price_currency': 'EUR',
+            'commission_rate': '7.0%', 'discount': '50%', 'lastest_volume': 120}
+
+
+# Products returned by the product and hot product searches
+SEARCH_RESULTS = 120
+
+
+def get_result(method, params):
+    if method == 'aliexpress.affiliate.productdetail.get':
+        products = [get_product(product_id) for product_id in params['product_ids'].split(',')]
+        return {'current_record_count': len(products), 'products': {'product': products}}
+    if method in ('aliexpress.affiliate.product.query', 'aliexpress.affiliate.hotproduct.query'):
+        page_no, page_size = int(params.get('page_no', 1)), int(params.get('page_size', 50))
+        first = (page_no - 1) * page_size
+        products = [get_product(1000 + index)
+                    for index in range(first, min(first + page_size, SEARCH_RESULTS))]
+        return {'current_page_no': page_no, 'current_record_count': len(products),
+                'total_record_count': SEARCH_RESULTS, 'products': {'product': products}}
+    if method == 'aliexpress.affiliate.link.generate':
+        links = [{'source_value': link, 'promotion_link': get_promotion_link(link)}
+                 for link in params['source_values'].split(',')]
+        return {'total_result_count': len(links), 'promotion_links': {'promotion_link': links}}
+    return {}
+
+
+def get_promotion_link(link):
+    return 'https://s.click.aliexpress.com/e/_' + link.rstrip('/').rsplit('/', 1)[-1]
+
+
+class ApiError(dict):
+    """Result that makes the stub answer with an ``error_response``."""
+
+    def __init__(self, code, sub_code=None):
+        super().__init__(code=code, msg='Error')
+        if sub_code:
+            self['sub_code'] = sub_code
+
+
+class HttpError:
+    """Result that makes the stub answer with an HTTP error status."""
+
+    def __init__(self, status):
+        self.status = status
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.sockets.append(self.connection)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0))).decode()
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+        params = {key: value[0] for key, value in urllib.parse.parse_qs(body).items()}
+        method = query['method'][0]
+        server = self.server
+        with server.lock:
+            server.calls.append((method, params))
+            server.connections.add(self.client_address)
+
+        result = server.get_result(method, params)
+        status = 200
+        if result is None:
+            response = {'error_response': {'code': '15', 'msg': 'Remote service error'}}
+        elif isinstance(result, ApiError):
+            response = {'error_response': dict(result)}
+        elif isinstance(result, HttpError):
+            status, response = result.status, {}
+        else:
+            response = {method.replace('.', '_') + '_response': {
+                'resp_result': {'resp_code': 200, 'resp_msg': 'ok', 'result': result}}}
+        data = json.dumps(response).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    """API stub on localhost. ``get_result(method, params)`` returns the result of each call,
+    or None for an error response."""
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), StubHandler)
+        self.lock = threading.Lock()
+        self.calls = []
+        self.connections = set()
+        self.sockets = []
+        self.get_result = get_result
+
+    def close_connections(self):
+        """Closes the kept-alive connections, like a server dropping idle clients."""
+        with self.lock:
+            sockets, self.sockets = self.sockets, []
+        for sock in sockets:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+# Self-signed certificate for localhost and 127.0.0.1, with its key
+KEYCERT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'keycert.pem')
+
+
+@contextlib.contextmanager
+def serve(stub):
+    """Runs the stub and sends the requests of every client to it."""
+    thread = threading.Thread(target=stub.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+
+    classes = [getattr(rest, name) for name in rest.__all__]
+    defaults = [cls.__init__.__defaults__ for cls in classes]
+    for cls in classes:
+        cls.__init__.__defaults__ = stub.server_address
+    base.connection_pool.clear()
+    base.dns_cache.invalidate(*stub.server_address)
+    try:
+        yield stub
+    finally:
+        for cls, default in zip(classes, defaults):
+            cls.__init__.__defaults__ = default
+        base.connection_pool.clear()
+        base.connection_pool._sessions.clear()
+        base.dns_cache.invalidate(*stub.server_address)
+        stub.shutdown()
+        stub.server_close()
+
+
+@pytest.fixture
+def server():
+    with serve(StubServer()) as stub:
+        yield stub
+
+
+@pytest.fixture
+def tls_server(monkeypatch):
+    """The stub over HTTPS. Clients trust its certificate and use HTTPS on its port."""
+    stub = StubServer()
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(KEYCERT)
+    stub.socket = context.wrap_socket(stub.socket, server_side=True)
+    monkeypatch.setattr(base, 'HTTPS_PORT', stub.server_address[1])
+    monkeypatch.setattr(base, '_ssl_context', ssl.create_default_context(cafile=KEYCERT))
+    with serve(stub):
+        yield stub
+
+
+def get_closed_address():
+    """Returns a local address nothing listens on."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()
+
+
+@pytest.fixture
+def api():
+    return AliexpressApi('key', 'secret', models.Language.EN, models.Currency.EUR, 'tracking')
@@ -0,0 +1,94 @@
+import asyncio
+
+from aliexpress_api import AsyncAliexpressApi, models
+from aliexpress_api.helpers import get_link_key, normalize_link
+from conftest import ApiError, get_promotion_link, get_result
+
+LINK = 'https://www.aliexpress.com/item/1001.html'
+
+
+def get_source_values(server):
+    return [params['source_values'].split(',') for _, params in server.calls]
+
+
+def echo_with(transform):
+    """Echoes the source values transformed, like an API that returns another form."""
+    def get_echoed_result(method, params):
+        result = get_result(method, params)
+        for link in result['promotion_links']['promotion_link']:
+            link['source_value'] = transform(link['source_value'])
+        return result
+    return get_echoed_result
+
+
+def test_normalize_link():
+    assert normalize_link(' www.aliexpress.com/item/1001.html ') == LINK
+    assert normalize_link('HTTP://WWW.AliExpress.com:80/item/1001.html/#reviews') == LINK
+    assert normalize_link(LINK + '?sku=2') == LINK + '?sku=2'
+    assert get_link_key(LINK + '?q=a%20b') == get_link_key(LINK + '?q=a b')
+
+
+def test_forms_of_the_same_link_are_converted_once(server, api):
+    links = [LINK, ' http://WWW.aliexpress.com/item/1001.html#reviews ', 'www.aliexpress.com/item/1001.html/']
+
+    results = api.get_affiliate_links_bulk(links)
+
+    assert get_source_values(server) == [[LINK]]
+    assert [result.source_value for result in results] == [link.strip() for link in links]
+    assert {result.promotion_link for result in results} == {get_promotion_link(LINK)}
+    assert all(result.error is None for result in results)
+
+
+def test_results_match_another_echoed_form(server, api):
+    server.get_result = echo_with(lambda link: link.replace('https://', 'http://') + '/')
+
+    results = api.get_affiliate_links_bulk([LINK])
+
+    assert results[0].promotion_link == get_promotion_link(LINK)
+    assert results[0].error is None
+
+
+def test_links_are_sent_in_chunks(server, api):
+    links = [f'https://www.aliexpress.com/item/{product_id}.html' for product_id in range(1001, 1006)]
+
+    results = api.get_affiliate_links_bulk(links, chunk_size=2, max_workers=1)
+
+    assert get_source_values(server) == [links[0:2], links[2:4], links[4:5]]
+    assert [result.promotion_link for result in results] == [get_promotion_link(link) for link in links]
+
+
+def test_partial_results(server, api):
+    def get_partial_result(method, params):
+        if '1003' in params['source_values']:
+            return ApiError('15', 'isp.remote-service-timeout')
+        result = get_result(method, params)
+        links = result['promotion_links']['promotion_link']
+        links[:] = [link for link in links if '1002' not in link['source_value']]
+        return result
+    server.get_result = get_partial_result
+    links = ['https://www.aliexpress.com/item/1001.html', 'https://www.aliexpress.com/item/1002.html',
+             'https://www.aliexpress.com/item/1003.html', '', 'a,b']
+
+    results = api.get_affiliate_links_bulk(links, chunk_size=2)
+
+    assert results[0].promotion_link == get_promotion_link(links[0])
+    assert results[1].error == 'Affiliate link not available'
+    assert results[2].promotion_link is None and results[2].error
+    assert [result.error for result in results[3:]] == ['Invalid link', 'Invalid link']
+    assert len(server.calls) == 2
+
+
+def test_async_bulk_links(server):
+    server.get_result = echo_with(lambda link: link + '#top')
+
+    async def main():
+        async with AsyncAliexpressApi('key', 'secret', models.Language.EN, models.Currency.EUR,
+                                      'tracking') as api:
+            return await api.get_affiliate_links_bulk([LINK, 'aliexpress.com/item/1002.html'],
+                                                      chunk_size=1)
+
+    results = asyncio.run(main())
+
+    assert [result.promotion_link for result in results] == [
+        get_promotion_link(LINK), get_promotion_link('https://aliexpress.com/item/1002.html')]
+    assert len(server.calls) == 2
@@ -0,0 +1,150 @@
+import asyncio
+import socket
+import threading
+
+from aliexpress_api import AsyncAliexpressApi, models
+from aliexpress_api.helpers import ResponseCache, SqliteCache
+from aliexpress_api.skd.api import base
+from conftest import get_closed_address
+
+
+def get_api(**kwargs):
+    return AsyncAliexpressApi('key', 'secret', models.Language.EN, models.Currency.EUR, 'tracking',
+                              **kwargs)
+
+
+class ThreadRecordingCache(SqliteCache):
+    """Records the threads the backend is used from."""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.threads = set()
+
+    def get(self, key):
+        self.threads.add(threading.get_ident())
+        return super().get(key)
+
+    def set(self, key, value, ttl):
+        self.threads.add(threading.get_ident())
+        super().set(key, value, ttl)
+
+
+def test_concurrent_calls(server):
+    async def main():
+        async with get_api() as api:
+            return await asyncio.gather(*[api.get_products_details(str(product_id))
+                                          for product_id in range(1001, 1011)])
+
+    results = asyncio.run(main())
+
+    assert [products[0].product_id for products in results] == list(range(1001, 1011))
+    assert len(server.calls) == 10
+
+
+def test_calls_reuse_one_connection(server):
+    async def main():
+        async with get_api() as api:
+            for product_id in ('1001', '1002', '1003'):
+                await api.get_products_details(product_id)
+
+    asyncio.run(main())
+
+    assert len(server.calls) == 3
+    assert len(server.connections) == 1
+
+
+def test_reconnects_when_the_server_closed_the_connection(server):
+    async def main():
+        async with get_api() as api:
+            await api.get_products_details('1001')
+            server.close_connections()
+            return await api.get_products_details('1002')
+
+    assert asyncio.run(main())[0].product_id == 1002
+    assert len(server.connections) == 2
+
+
+def test_warmup_opens_idle_connections(server):
+    async def main():
+        async with get_api() as api:
+            await api.warmup(connections=2)
+            await api.get_products_details('1001')
+
+    asyncio.run(main())
+
+    assert len(server.calls) == 1
+    assert len(server.sockets) == 2
+
+
+def test_connect_tries_every_address(server):
+    host, port = server.server_address
+    closed = (socket.AF_INET, socket.SOCK_STREAM, 6, '', get_closed_address())
+    working = (socket.AF_INET, socket.SOCK_STREAM, 6, '', (host, port))
+    base.dns_cache._set(host, port, [closed, working])
+
+    async def main():
+        async with get_api() as api:
+            return await api.get_products_details('1001')
+
+    assert asyncio.run(main())[0].product_id == 1001
+
+
+def test_new_loop_closes_the_old_connections(server):
+    api = get_api()
+
+    async def main():
+        await api.get_products_details('1001')
+        return api._pool
+
+    old_pool = asyncio.run(main())
+    connections = [connection for idle in old_pool._idle.values() for connection in idle]
+    asyncio.run(main())
+
+    assert connections
+    assert all(connection.writer is None for connection in connections)
+    assert all(connection.sock.fileno() == -1 for connection in connections)
+    assert len(server.calls) == 2
+
+
+def test_blocking_cache_runs_off_the_loop(server, tmp_path):
+    backend = ThreadRecordingCache(str(tmp_path / 'cache.db'))
+
+    async def main():
+        async with get_api(cache=ResponseCache(backend)) as api:
+            await api.get_products_details('1001')
+            return await api.get_products_details('1001')
+
+    assert asyncio.run(main())[0].product_id == 1001
+    assert len(server.calls) == 1
+    assert backend.threads and threading.get_ident() not in backend.threads
+
+
+def test_https(tls_server):
+    async def main():
+        async with get_api() as api:
+            await api.warmup()
+            return await api.get_products_details('1001')
+
+    assert asyncio.run(main())[0].product_id == 1001
+    assert len(tls_server.connections) == 1
+
+
+def test_request_is_drained_before_reading(server, monkeypatch):
+    drained = []
+    drain = asyncio.StreamWriter.drain
+
+    async def recording_drain(writer):
+        drained.append(writer)
+        await drain(writer)
+
+    monkeypatch.setattr(asyncio.StreamWriter, 'drain', recording_drain)
+    product_ids = [str(product_id) for product_id in range(1000, 1050)]
+
+    async def main():
+        async with get_api() as api:
+            return await api.get_products_details(product_ids)
+
+    products = asyncio.run(main())
+
+    assert len(products) == 50
+    assert drained
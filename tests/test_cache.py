@@ -0,0 +1,28 @@
+import threading
+
+from aliexpress_api.helpers import ResponseCache
+from aliexpress_api.skd.api.rest import AliexpressAffiliateProductdetailGetRequest
+
+
+def get_request(product_id):
+    request = AliexpressAffiliateProductdetailGetRequest()
+    request.product_ids = product_id
+    return request
+
+
+def test_counters_from_many_threads():
+    cache = ResponseCache()
+    cache.set(get_request('1'), b'{}')
+
+    def lookup():
+        for index in range(1000):
+            cache.get(get_request(str(index % 2)))
+
+    threads = [threading.Thread(target=lookup) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    method = 'aliexpress.affiliate.productdetail.get'
+    assert cache.hits[method] == cache.misses[method] == 4000
@@ -0,0 +1,96 @@
+import pytest
+
+from aliexpress_api import models
+from aliexpress_api.helpers import categories
+from aliexpress_api.helpers.categories import CategoryIndex
+from conftest import get_result
+
+# Category payload in the shape returned by aliexpress.affiliate.category.get
+CATEGORIES = [
+    {'category_id': 2, 'category_name': 'Food'},
+    {'category_id': 44, 'category_name': 'Consumer Electronics'},
+    {'category_id': 100003, 'category_name': 'Snacks', 'parent_category_id': 2},
+    {'category_id': 100006, 'category_name': 'Coffee', 'parent_category_id': 2},
+    {'category_id': 200001, 'category_name': 'Cameras', 'parent_category_id': 44},
+]
+
+
+def get_index():
+    return CategoryIndex([
+        (models.ChildCategory if 'parent_category_id' in category else models.Category).from_dict(category)
+        for category in CATEGORIES])
+
+
+def get_ids(categories):
+    return [category.category_id for category in categories]
+
+
+def get_categories_result(method, params):
+    if method == 'aliexpress.affiliate.category.get':
+        return {'total_result_count': len(CATEGORIES), 'categories': {'category': CATEGORIES}}
+    return get_result(method, params)
+
+
+@pytest.fixture(autouse=True)
+def shared_indexes(monkeypatch):
+    monkeypatch.setattr(categories, '_shared_indexes', {})
+
+
+def test_lookups():
+    index = get_index()
+
+    assert index.get(100006).category_name == 'Coffee'
+    assert index.get('44').category_name == 'Consumer Electronics'
+    assert index.get(1) is None
+    assert get_ids(index.get_parents()) == [2, 44]
+    assert get_ids(index.get_children(2)) == [100003, 100006]
+    assert get_ids(index.get_children('44')) == [200001]
+    assert index.get_children(100003) == []
+
+
+def test_path():
+    index = get_index()
+
+    assert get_ids(index.get_path(200001)) == [44, 200001]
+    assert get_ids(index.get_path(2)) == [2]
+    assert index.get_path(1) == []
+
+
+def test_results_are_copies():
+    index = get_index()
+
+    index.get_parents().clear()
+    index.get_children(2).clear()
+
+    assert len(index.get_parents()) == 2
+    assert len(index.get_children(2)) == 2
+
+
+def test_save_and_load(tmp_path):
+    path = str(tmp_path / 'categories.json')
+    index = get_index()
+    index.save(path)
+
+    loaded = CategoryIndex.load(path)
+
+    assert loaded.created == index.created
+    assert get_ids(loaded.categories) == get_ids(index.categories)
+    assert isinstance(loaded.get(100003), models.ChildCategory)
+    assert get_ids(loaded.get_path(100003)) == [2, 100003]
+    assert CategoryIndex.load(str(tmp_path / 'missing.json')) is None
+
+
+def test_expiry():
+    index = CategoryIndex([], created=1000)
+
+    assert index.is_expired(60)
+    assert not CategoryIndex([]).is_expired(60)
+
+
+def test_api_fetches_the_categories_once(server, api):
+    server.get_result = get_categories_result
+
+    assert get_ids(api.get_parent_categories()) == [2, 44]
+    assert get_ids(api.get_child_categories(2)) == [100003, 100006]
+    assert get_ids(api.get_category_path(100006)) == [2, 100006]
+    assert [method for method, _ in server.calls] == ['aliexpress.affiliate.category.get']
@@ -0,0 +1,73 @@
+import asyncio
+from types import SimpleNamespace
+
+from aliexpress_api import AliexpressApi, AsyncAliexpressApi, ClientPool, RateLimiter, models
+
+PRODUCT_DETAILS = 'aliexpress.affiliate.productdetail.get'
+
+
+def get_pool(strategy, client_class=AliexpressApi, rate_limiters=(None, None)):
+    clients = [client_class(f'key{index}', 'secret', models.Language.EN, models.Currency.EUR,
+                            'tracking', rate_limiter=rate_limiter)
+               for index, rate_limiter in enumerate(rate_limiters)]
+    return ClientPool(clients, strategy)
+
+
+def test_round_robin_uses_the_clients_in_turns(server):
+    pool = get_pool('round_robin')
+
+    for product_id in ('1001', '1002', '1003', '1004'):
+        assert pool.get_products_details(product_id)[0].product_id == int(product_id)
+
+    assert pool.calls == [2, 2]
+    assert pool._in_progress == [0, 0]
+
+
+def test_least_loaded_prefers_rate_limiter_headroom():
+    pool = get_pool('least_loaded', rate_limiters=(RateLimiter(rate=1), RateLimiter(rate=1)))
+    pool.clients[0]._rate_limiter.acquire(SimpleNamespace(getapiname=lambda: PRODUCT_DETAILS))
+
+    assert pool.get_client(PRODUCT_DETAILS) is pool.clients[1]
+    assert pool.get_client(PRODUCT_DETAILS) is pool.clients[1]
+    # Other methods have their own buckets
+    assert {pool.get_client('aliexpress.affiliate.product.query') for _ in range(2)} == set(pool.clients)
+
+
+def test_least_loaded_counts_iterators_until_closed(server):
+    pool = get_pool('least_loaded')
+
+    products = pool.iter_products(page_size=10)
+    next(products)
+    busy = pool._in_progress.index(1)
+    assert pool.get_client() is pool.clients[1 - busy]
+    assert pool.get_client() is pool.clients[1 - busy]
+
+    products.close()
+    assert pool._in_progress == [0, 0]
+
+
+def test_exhausted_iterator_is_released(server):
+    pool = get_pool('least_loaded')
+
+    assert len(list(pool.iter_products(page_size=50))) == 120
+    assert len(list(pool.iter_products(page_size=50, max_items=10))) == 10
+    assert pool._in_progress == [0, 0]
+
+
+def test_async_iterators_are_held(server):
+    pool = get_pool('least_loaded', AsyncAliexpressApi)
+
+    async def main():
+        async with pool:
+            products = pool.iter_products(page_size=10)
+            await products.__anext__()
+            in_progress = list(pool._in_progress)
+            await products.aclose()
+            details = await pool.get_products_details('1001')
+            return in_progress, details
+
+    in_progress, details = asyncio.run(main())
+
+    assert sorted(in_progress) == [0, 1]
+    assert details[0].product_id == 1001
+    assert pool._in_progress == [0, 0]
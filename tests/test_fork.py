@@ -0,0 +1,33 @@
+import os
+
+import pytest
+
+from aliexpress_api.skd.api import base
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='needs os.fork')
+def test_child_does_not_share_connections(server, api):
+    api.warmup(connections=2)
+    base.get_ssl_context()
+    read, write = os.pipe()
+
+    pid = os.fork()
+    if pid == 0:
+        try:
+            shared = (bool(base.connection_pool._idle) or bool(base.dns_cache._addresses)
+                      or base._ssl_context is not None)
+            api.get_products_details('1001')
+            os.write(write, b'shared' if shared else b'ok')
+        finally:
+            os._exit(0)
+
+    os.close(write)
+    os.waitpid(pid, 0)
+    with os.fdopen(read, 'rb') as result:
+        assert result.read() == b'ok'
+
+    # The parent keeps its idle connections, and the child opened its own
+    assert sum(len(idle) for idle in base.connection_pool._idle.values()) == 2
+    assert len(server.sockets) == 3
+    api.get_products_details('1002')
+    assert len(server.sockets) == 3
@@ -0,0 +1,36 @@
+import pytest
+
+from aliexpress_api.errors import InvalidArgumentException, ProductIdNotFoundException
+from aliexpress_api.tools import iter_product_ids
+
+
+def test_texts_are_streamed_in_order():
+    texts = ['https://www.aliexpress.com/item/1005001.html\n', 'no id\n', '1005002']
+
+    results = list(iter_product_ids(texts))
+
+    assert results[0] == ('https://www.aliexpress.com/item/1005001.html', '1005001')
+    assert results[1][0] == 'no id'
+    assert isinstance(results[1][1], ProductIdNotFoundException)
+    assert results[2] == ('1005002', '1005002')
+
+
+def test_string_is_a_single_text():
+    url = 'https://es.aliexpress.com/item/1005003.html?productId=1005004'
+
+    assert list(iter_product_ids(url)) == [(url, '1005003'), (url, '1005004')]
+
+
+def test_bytes_are_rejected():
+    with pytest.raises(InvalidArgumentException):
+        iter_product_ids(b'https://www.aliexpress.com/item/1005001.html')
+    with pytest.raises(InvalidArgumentException):
+        list(iter_product_ids([b'https://www.aliexpress.com/item/1005001.html']))
+
+
+def test_worker_processes_keep_the_order():
+    texts = [f'https://www.aliexpress.com/item/{product_id}.html' for product_id in range(100)]
+
+    results = list(iter_product_ids(texts, processes=2, chunk_size=7))
+
+    assert [product_id for _, product_id in results] == [str(product_id) for product_id in range(100)]
@@ -0,0 +1,60 @@
+import json
+import os
+
+from aliexpress_api.tools import HotProductExport
+
+
+class FakeApi:
+    """Returns ``pages`` full pages of products for any category."""
+
+    def __init__(self, pages, page_size):
+        self.pages = pages
+        self.page_size = page_size
+
+    def download_hotproducts(self, category_id, country, fields, locale_site, page_no,
+                             page_size, raw=False):
+        if page_no > self.pages:
+            return {'result': {'current_record_count': 0}}
+        products = [{'product_id': page_no * 100 + index} for index in range(self.page_size)]
+        return {'result': {'current_record_count': len(products),
+                           'products': {'product': products}}}
+
+
+def read_ids(path):
+    with open(path, 'rb') as data:
+        return [json.loads(line)['product_id'] for line in data]
+
+
+def test_export_writes_every_page(tmp_path):
+    export = HotProductExport(FakeApi(pages=3, page_size=2), str(tmp_path), page_size=2)
+
+    assert export.export(['7']) == {'7': 6}
+    assert read_ids(export.get_path('7')) == [100, 101, 200, 201, 300, 301]
+
+
+def test_resume_restarts_when_the_file_is_shorter_than_the_state(tmp_path):
+    api = FakeApi(pages=3, page_size=2)
+    export = HotProductExport(api, str(tmp_path), page_size=2)
+    export.export(['7'])
+
+    # State saved after two pages, but the data was lost before reaching the disk
+    export.state['7'].update(page_no=3, offset=1000, records=4, done=False)
+    export._save_state()
+    with open(export.get_path('7'), 'wb') as data:
+        data.write(b'{"product_id": 100}\n')
+
+    resumed = HotProductExport(api, str(tmp_path), page_size=2)
+    assert resumed.export(['7']) == {'7': 6}
+    assert read_ids(resumed.get_path('7')) == [100, 101, 200, 201, 300, 301]
+
+
+def test_resume_restarts_when_the_file_is_missing(tmp_path):
+    api = FakeApi(pages=2, page_size=2)
+    export = HotProductExport(api, str(tmp_path), page_size=2)
+    export.state['7'] = {'page_no': 2, 'offset': 40, 'records': 2, 'done': False, 'columns': None}
+    os.makedirs(str(tmp_path), exist_ok=True)
+    export._save_state()
+
+    resumed = HotProductExport(api, str(tmp_path), page_size=2)
+    assert resumed.export(['7']) == {'7': 4}
+    assert read_ids(resumed.get_path('7')) == [100, 101, 200, 201]
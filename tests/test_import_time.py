@@ -0,0 +1,59 @@
+"""Import time of the package. Run directly to print the measurements:
+
+    python tests/test_import_time.py
+
+The time budget depends on the machine, so it is only checked with CHECK_IMPORT_TIME=1.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Best of RUNS, in seconds, measured with python -X importtime
+IMPORT_TIME_BUDGET = 0.080
+RUNS = 5
+
+# Loaded when the first request is sent, or by AliexpressApi.warmup
+DEFERRED_MODULES = (
+    'asyncio', 'concurrent.futures', 'hashlib', 'hmac', 'http.client', 'orjson', 'socket',
+    'sqlite3', 'ssl', 'zlib',
+)
+
+
+def run(*args):
+    environment = dict(os.environ)
+    environment.pop('PYTHONDONTWRITEBYTECODE', None)
+    return subprocess.run([sys.executable, *args], cwd=ROOT, env=environment,
+                          capture_output=True, text=True, check=True)
+
+
+def get_import_time():
+    # The last line is the package itself: "import time: self | cumulative | aliexpress_api"
+    output = run('-X', 'importtime', '-c', 'import aliexpress_api').stderr
+    return int(output.strip().splitlines()[-1].split('|')[1]) / 1e6
+
+
+def get_import_times():
+    run('-c', 'import aliexpress_api')  # Writes the bytecode caches
+    return [get_import_time() for _ in range(RUNS)]
+
+
+def test_deferred_modules_are_not_imported():
+    code = ('import sys, aliexpress_api; '
+            f'print(",".join(name for name in {DEFERRED_MODULES!r} if name in sys.modules))')
+    assert run('-c', code).stdout.strip() == ''
+
+
+@pytest.mark.skipif(not os.environ.get('CHECK_IMPORT_TIME'), reason='set CHECK_IMPORT_TIME=1')
+def test_import_time_budget():
+    assert min(get_import_times()) < IMPORT_TIME_BUDGET
+
+
+if __name__ == '__main__':
+    times = sorted(get_import_times())
+    print(f'import aliexpress_api: best {times[0] * 1000:.1f} ms, '
+          f'median {times[len(times) // 2] * 1000:.1f} ms, budget {IMPORT_TIME_BUDGET * 1000:.0f} ms')
@@ -0,0 +1,71 @@
+import asyncio
+import time
+
+from aliexpress_api import AsyncAliexpressApi, models
+from conftest import SEARCH_RESULTS, get_result
+
+
+def get_pages(server):
+    return [int(params['page_no']) for _, params in server.calls]
+
+
+def slow_first_page(method, params):
+    # Later pages arrive first, the products must still be in page order
+    if params.get('page_no') == '1':
+        time.sleep(0.2)
+    return get_result(method, params)
+
+
+def test_products_of_every_page_in_order(server, api):
+    server.get_result = slow_first_page
+
+    products = list(api.iter_products(keywords='phone', page_size=25, prefetch=3))
+
+    assert [product.product_id for product in products] == list(range(1000, 1000 + SEARCH_RESULTS))
+    assert sorted(get_pages(server)) == [1, 2, 3, 4, 5]
+
+
+def test_pages_are_requested_ahead(server, api):
+    products = api.iter_products(keywords='phone', page_size=10, prefetch=3)
+
+    next(products)
+    products.close()
+    assert sorted(get_pages(server)) == [1, 2, 3, 4]
+
+
+def test_max_items(server, api):
+    products = list(api.iter_products(keywords='phone', page_size=50, max_items=60, prefetch=4))
+
+    assert [product.product_id for product in products] == list(range(1000, 1060))
+    assert sorted(get_pages(server)) == [1, 2]
+
+
+def test_max_items_zero_requests_nothing(server, api):
+    assert list(api.iter_products(keywords='phone', max_items=0)) == []
+    assert list(api.iter_hotproducts(max_items=-1)) == []
+    assert server.calls == []
+
+
+def test_last_page_ends_the_iteration(server, api):
+    products = list(api.iter_hotproducts(page_size=50, page_no=2, prefetch=5))
+
+    assert len(products) == SEARCH_RESULTS - 50
+    assert sorted(get_pages(server)) == [2, 3]
+
+
+def test_async_iteration(server):
+    server.get_result = slow_first_page
+
+    async def main():
+        async with AsyncAliexpressApi('key', 'secret', models.Language.EN, models.Currency.EUR,
+                                      'tracking') as api:
+            products = [product.product_id async for product in
+                        api.iter_products(keywords='phone', page_size=25, prefetch=3, max_items=70)]
+            nothing = [product async for product in api.iter_products(max_items=0)]
+            return products, nothing
+
+    products, nothing = asyncio.run(main())
+
+    assert products == list(range(1000, 1070))
+    assert nothing == []
+    assert sorted(get_pages(server)) == [1, 2, 3]
@@ -0,0 +1,44 @@
+from aliexpress_api import models
+
+
+def test_annotations_become_slots_and_converters():
+    assert 'target_sale_price' in models.Product.__slots__
+    assert 'orders' in models.OrderListResponse._converters
+
+
+def test_fields_are_converted():
+    product = models.Product.from_dict({
+        'product_id': '1005003091506814',
+        'target_sale_price': '12.34',
+        'commission_rate': '7.0%',
+        'product_small_image_urls': {'string': ['a.jpg', 'b.jpg']},
+        'unknown_field': {'value': 1},
+    })
+
+    assert product.product_id == 1005003091506814
+    assert product.target_sale_price == 12.34
+    assert product.commission_rate == 7.0
+    assert product.product_small_image_urls == ['a.jpg', 'b.jpg']
+    assert product.unknown_field.value == 1
+
+
+def test_orders_are_a_list():
+    response = models.OrderListResponse.from_dict({
+        'current_record_count': 2,
+        'orders': {'order': [{'order_id': 1, 'paid_amount': '3.50'}, {'order_id': 2}]},
+    })
+
+    assert [order.order_id for order in response.orders] == [1, 2]
+    assert response.orders[0].paid_amount == 3.5
+
+
+def test_bool_fields_are_converted():
+    def is_finished(value):
+        return models.PromoProductsResponse.from_dict({'is_finished': value}).is_finished
+
+    assert is_finished('false') is False
+    assert is_finished('true') is True
+    assert is_finished('True') is True
+    assert is_finished(False) is False
+    assert is_finished('') is None
+    assert is_finished('unknown') == 'unknown'
@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from aliexpress_api.errors import InvalidArgumentException
+from aliexpress_api.tools import OrderSync, order_sync
+from aliexpress_api.tools.order_sync import format_time, parse_time
+
+
+class FakeApi:
+    """Every window between ``busy_start`` and ``busy_end`` has ``busy_pages`` pages."""
+
+    def __init__(self, busy_start, busy_end, busy_pages):
+        self.busy_start = parse_time(busy_start)
+        self.busy_end = parse_time(busy_end)
+        self.busy_pages = busy_pages
+
+    def get_order_list(self, status, start_time, end_time, fields=None, page_no=1, page_size=50):
+        start, end = parse_time(start_time), parse_time(end_time)
+        pages = self.busy_pages if start < self.busy_end and end > self.busy_start else 1
+        order = SimpleNamespace(order_id=f'{start_time}-{page_no}', sub_order_id=None)
+        return SimpleNamespace(total_page_no=pages, orders=[order])
+
+
+def test_truncated_window_keeps_watermark_before_it():
+    api = FakeApi('2024-01-01 10:00:00', '2024-01-01 10:00:01', busy_pages=5)
+    sync = OrderSync(api, 'Payment Completed', window=timedelta(hours=6),
+                     min_window=timedelta(seconds=1), max_pages=2)
+
+    with pytest.warns(UserWarning):
+        orders = list(sync.sync('2024-01-01 00:00:00', '2024-01-02 00:00:00'))
+
+    assert orders
+    assert sync.truncated == [('2024-01-01 10:00:00', '2024-01-01 10:00:01')]
+    assert format_time(sync.watermark) <= '2024-01-01 10:00:00'
+
+
+def test_complete_sync_advances_watermark():
+    api = FakeApi('2024-01-01 10:00:00', '2024-01-01 10:00:01', busy_pages=2)
+    sync = OrderSync(api, 'Payment Completed', window=timedelta(hours=6), max_pages=2)
+
+    list(sync.sync('2024-01-01 00:00:00', '2024-01-02 00:00:00'))
+
+    assert sync.truncated == []
+    assert format_time(sync.watermark) == '2024-01-02 00:00:00'
+
+
+def test_min_window_under_one_second_is_rejected():
+    with pytest.raises(InvalidArgumentException):
+        OrderSync(FakeApi('2024-01-01 00:00:00', '2024-01-01 00:00:00', 1), 'Payment Completed',
+                  min_window=timedelta(milliseconds=500))
+
+
+class RecordingApi:
+    """Records the requested ranges and has no orders."""
+
+    def __init__(self):
+        self.ranges = []
+
+    def get_order_list(self, status, start_time, end_time, fields=None, page_no=1, page_size=50):
+        self.ranges.append((parse_time(start_time), parse_time(end_time)))
+        return SimpleNamespace(total_page_no=1, orders=[])
+
+
+def fake_clock(instant):
+    """A datetime whose now() is ``instant``, on a host in Tokyo."""
+    tokyo = timezone(timedelta(hours=9))
+
+    class FakeDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            if tz is None:
+                return instant.astimezone(tokyo).replace(tzinfo=None)
+            return instant.astimezone(tz)
+
+    return FakeDatetime
+
+
+def test_default_end_time_is_in_the_api_timezone(monkeypatch):
+    api = RecordingApi()
+    sync = OrderSync(api, 'Payment Completed', window=timedelta(hours=6))
+    first_run = datetime(2024, 1, 10, 20, tzinfo=timezone.utc)  # 12:00 in Los Angeles
+
+    monkeypatch.setattr(order_sync, 'datetime', fake_clock(first_run))
+    list(sync.sync('2024-01-10 00:00:00'))
+    assert format_time(sync.watermark) == '2024-01-10 12:00:00'
+
+    # An order created in the API between both runs is inside the second range
+    created = parse_time('2024-01-10 12:05:00')
+    api.ranges = []
+    monkeypatch.setattr(order_sync, 'datetime', fake_clock(first_run + timedelta(minutes=10)))
+    list(sync.sync())
+
+    assert any(start <= created < end for start, end in api.ranges)
+    assert format_time(sync.watermark) == '2024-01-10 12:10:00'
@@ -0,0 +1,75 @@
+import asyncio
+
+from aliexpress_api import AsyncAliexpressApi, models
+from conftest import get_result
+
+# Orders of the stub, the cursor of each page is the id of its last order
+ORDERS = [{'order_id': order_id, 'paid_amount': '1.50'} for order_id in range(1, 5)]
+
+
+def get_order_page(method, params):
+    if method != 'aliexpress.affiliate.order.listbyindex':
+        return get_result(method, params)
+    cursor = int(params.get('start_query_index_id', 0))
+    orders = [order for order in ORDERS if order['order_id'] > cursor][:int(params['page_size'])]
+    if not orders:
+        return {'current_record_count': 0}
+    return {'current_record_count': len(orders),
+            'min_query_index_id': str(orders[0]['order_id']),
+            'max_query_index_id': str(orders[-1]['order_id']),
+            'orders': {'order': orders}}
+
+
+def get_cursors(server):
+    return [params.get('start_query_index_id') for _, params in server.calls]
+
+
+def test_cursor_pages(server, api):
+    server.get_result = get_order_page
+    checkpoints = []
+
+    orders = list(api.iter_orders_by_index('Payment Completed', '2024-01-01 00:00:00',
+                                           '2024-01-02 00:00:00', page_size=2,
+                                           checkpoint=checkpoints.append))
+
+    assert [order.order_id for order in orders] == [1, 2, 3, 4]
+    # The last page is full, so the empty page after it ends the iteration
+    assert get_cursors(server) == [None, '2', '4']
+    assert checkpoints == ['2', '4']
+
+
+def test_resume_from_cursor(server, api):
+    server.get_result = get_order_page
+
+    orders = list(api.iter_orders_by_index('Payment Completed', '2024-01-01 00:00:00',
+                                           '2024-01-02 00:00:00', page_size=2,
+                                           start_query_index_id='2'))
+
+    assert [order.order_id for order in orders] == [3, 4]
+    assert get_cursors(server) == ['2', '4']
+
+
+def test_short_page_is_the_last(server, api):
+    server.get_result = get_order_page
+
+    orders = list(api.iter_orders_by_index('Payment Completed', '2024-01-01 00:00:00',
+                                           '2024-01-02 00:00:00', page_size=3))
+
+    assert [order.order_id for order in orders] == [1, 2, 3, 4]
+    assert get_cursors(server) == [None, '3']
+
+
+def test_async_cursor_pages(server):
+    server.get_result = get_order_page
+    checkpoints = []
+
+    async def main():
+        async with AsyncAliexpressApi('key', 'secret', models.Language.EN, models.Currency.EUR,
+                                      'tracking') as api:
+            return [order.order_id async for order in api.iter_orders_by_index(
+                'Payment Completed', '2024-01-01 00:00:00', '2024-01-02 00:00:00',
+                page_size=2, checkpoint=checkpoints.append)]
+
+    assert asyncio.run(main()) == [1, 2, 3, 4]
+    assert get_cursors(server) == [None, '2', '4']
+    assert checkpoints == ['2', '4']
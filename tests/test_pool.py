@@ -0,0 +1,105 @@
+import socket
+
+import pytest
+
+from aliexpress_api.skd.api import base
+from conftest import get_closed_address
+
+
+def test_calls_reuse_one_connection(server, api):
+    for product_id in ('1001', '1002', '1003'):
+        api.get_products_details(product_id)
+
+    assert len(server.calls) == 3
+    assert len(server.connections) == 1
+
+
+def test_reconnects_when_the_server_closed_the_connection(server, api):
+    api.get_products_details('1001')
+    server.close_connections()
+
+    assert api.get_products_details('1002')[0].product_id == 1002
+    assert len(server.calls) == 2
+    assert len(server.connections) == 2
+
+
+def test_connect_tries_every_address(server, api):
+    host, port = server.server_address
+    closed = (socket.AF_INET, socket.SOCK_STREAM, 6, '', get_closed_address())
+    working = (socket.AF_INET, socket.SOCK_STREAM, 6, '', (host, port))
+    base.dns_cache._set(host, port, [closed, working])
+
+    assert api.get_products_details('1001')[0].product_id == 1001
+
+
+def test_warmup_opens_idle_connections(server, api):
+    api.warmup(connections=2)
+    api.get_products_details('1001')
+
+    assert len(server.calls) == 1
+    assert len(server.sockets) == 2
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+def test_dns_answers_expire_after_the_ttl(monkeypatch):
+    clock = FakeClock()
+    lookups = []
+    monkeypatch.setattr(base, 'time', clock)
+    monkeypatch.setattr(socket, 'getaddrinfo', lambda host, port, *args: lookups.append(host) or [
+        (socket.AF_INET, socket.SOCK_STREAM, 6, '', ('127.0.0.1', port))])
+    cache = base.DnsCache(ttl=60)
+
+    cache.resolve('api.example.com', 80)
+    clock.now += 59
+    cache.resolve('api.example.com', 80)
+    assert len(lookups) == 1
+
+    clock.now += 2
+    cache.resolve('api.example.com', 80)
+    assert len(lookups) == 2
+
+    cache.invalidate('api.example.com', 80)
+    cache.resolve('api.example.com', 80)
+    assert len(lookups) == 3
+
+
+def test_failed_connection_drops_the_dns_answer():
+    address = get_closed_address()
+    base.dns_cache._set(*address, [(socket.AF_INET, socket.SOCK_STREAM, 6, '', address)])
+
+    with pytest.raises(OSError):
+        base.dns_cache.create_connection(address, timeout=1)
+    assert base.dns_cache._get(*address) is None
+
+
+def get_idle_connection(server):
+    idle = base.connection_pool._idle[server.server_address]
+    assert len(idle) == 1
+    return idle[0][0]
+
+
+def test_tls_session_is_resumed_on_reconnect(tls_server, api):
+    api.get_products_details('1001')
+    assert get_idle_connection(tls_server).sock.session_reused is False
+
+    for product_id in ('1002', '1003'):
+        base.connection_pool.clear()
+        assert api.get_products_details(product_id)[0].product_id == int(product_id)
+        assert get_idle_connection(tls_server).sock.session_reused is True
+    assert len(tls_server.connections) == 3
+
+
+def test_warmup_completes_the_tls_handshake(tls_server, api):
+    api.warmup()
+    connection = get_idle_connection(tls_server)
+
+    api.get_products_details('1001')
+    assert get_idle_connection(tls_server) is connection
+    assert connection.sock.version() is not None
@@ -0,0 +1,113 @@
+import pytest
+
+from aliexpress_api import models
+from aliexpress_api.tools import product_table
+from aliexpress_api.tools.product_table import MISSING, ProductTable
+
+PRODUCTS = [
+    {'product_id': '1', 'target_sale_price': '12.34', 'discount': '50%', 'commission_rate': '7.5%',
+     'evaluate_rate': '98.1%', 'lastest_volume': 120, 'first_level_category_id': 10,
+     'second_level_category_id': 100},
+    {'product_id': '2', 'sale_price': '5.00', 'discount': '10%', 'commission_rate': '3%',
+     'lastest_volume': '45', 'first_level_category_id': 20, 'second_level_category_id': 200},
+    {'product_id': '3', 'target_sale_price': 'n/a', 'discount': '50%', 'commission_rate': '9%',
+     'evaluate_rate': '90%', 'lastest_volume': 300, 'first_level_category_id': 10,
+     'second_level_category_id': 101},
+    {'product_id': '4', 'target_sale_price': '99.99', 'discount': '70%', 'commission_rate': '7.5%',
+     'evaluate_rate': '95.5%', 'lastest_volume': 120, 'first_level_category_id': 30,
+     'second_level_category_id': 10},
+]
+
+
+@pytest.fixture(params=[True, False], ids=['numpy', 'array'])
+def use_numpy(request, monkeypatch):
+    if request.param:
+        pytest.importorskip('numpy')
+    else:
+        # The array backend must also work when NumPy is not installed
+        monkeypatch.setattr(product_table, 'numpy', None)
+    return request.param
+
+
+def get_ids(table):
+    return list(table.column('product_id'))
+
+
+def test_prices_are_cents_and_percentages_basis_points(use_numpy):
+    table = ProductTable(PRODUCTS, use_numpy=use_numpy)
+
+    assert list(table.column('price')) == [1234, 500, MISSING, 9999]
+    assert list(table.column('commission_rate')) == [750, 300, 900, 750]
+    assert list(table.column('evaluate_rate')) == [9810, MISSING, 9000, 9550]
+    assert list(table.column('lastest_volume')) == [120, 45, 300, 120]
+
+
+def test_models_and_dicts_give_the_same_columns(use_numpy):
+    from_dicts = ProductTable(PRODUCTS, use_numpy=use_numpy)
+    from_models = ProductTable([models.Product.from_dict(product) for product in PRODUCTS],
+                               use_numpy=use_numpy)
+
+    assert from_models.to_dicts() == from_dicts.to_dicts()
+
+
+def test_filter(use_numpy):
+    table = ProductTable(PRODUCTS, use_numpy=use_numpy)
+
+    assert get_ids(table.filter(min_discount=5000)) == [1, 3, 4]
+    assert get_ids(table.filter(max_price=2000)) == [1, 2]
+    assert get_ids(table.filter(min_commission_rate=750, min_volume=121)) == [3]
+    assert get_ids(table.filter(category_ids=[10])) == [1, 3, 4]
+    assert get_ids(table.filter(min_evaluate_rate=9500, category_ids=[100, 30])) == [1, 4]
+    assert get_ids(table.filter(min_price=100000)) == []
+
+
+def test_sort_keeps_ties_in_order(use_numpy):
+    table = ProductTable(PRODUCTS, use_numpy=use_numpy)
+
+    assert get_ids(table.sort('lastest_volume')) == [2, 1, 4, 3]
+    assert get_ids(table.sort('lastest_volume', reverse=True)) == [3, 1, 4, 2]
+
+
+def test_top(use_numpy):
+    table = ProductTable(PRODUCTS, use_numpy=use_numpy)
+
+    assert get_ids(table.top('lastest_volume', 2)) == [3, 1]
+    assert get_ids(table.top('commission_rate', 3, reverse=False)) == [2, 1, 4]
+    assert get_ids(table.top('price', 10)) == [4, 1, 2, 3]
+    assert get_ids(table.top('price', 0)) == []
+
+
+def test_group_by(use_numpy):
+    groups = ProductTable(PRODUCTS, use_numpy=use_numpy).group_by()
+
+    assert {category: get_ids(group) for category, group in groups.items()} == {
+        10: [1, 3], 20: [2], 30: [4]}
+
+
+def test_chained_operations_and_appends(use_numpy):
+    table = ProductTable(PRODUCTS[:2], keep_products=True, use_numpy=use_numpy)
+    table.append(PRODUCTS[2:])
+
+    ranked = table.filter(min_discount=5000).sort('price', reverse=True)
+    assert get_ids(ranked) == [4, 1, 3]
+    assert [product['product_id'] for product in ranked.get_products()] == ['4', '1', '3']
+
+    ranked.append(PRODUCTS[1:2])
+    assert get_ids(ranked) == [4, 1, 3, 2]
+    assert list(ranked.column('price')) == [9999, 1234, MISSING, 500]
+
+
+def test_backends_give_identical_results(monkeypatch):
+    pytest.importorskip('numpy')
+    products = [dict(product, product_id=str(index), lastest_volume=index % 7)
+                for index, product in enumerate(PRODUCTS * 50)]
+
+    def run(table):
+        return (table.filter(min_discount=1000, max_price=5000).to_dicts(),
+                table.top('lastest_volume', 17).to_dicts(),
+                table.sort('price', reverse=True).to_dicts(),
+                {key: group.to_dicts() for key, group in table.group_by().items()})
+
+    with_numpy = run(ProductTable(products, use_numpy=True))
+    monkeypatch.setattr(product_table, 'numpy', None)
+    assert run(ProductTable(products, use_numpy=False)) == with_numpy
@@ -0,0 +1,64 @@
+import pytest
+
+from aliexpress_api.errors import ApiRequestException, ProductsNotFoudException
+from conftest import get_result
+
+
+def fail_chunk_with(product_id):
+    def get_failing_result(method, params):
+        if product_id in params.get('product_ids', '').split(','):
+            return None
+        return get_result(method, params)
+    return get_failing_result
+
+
+def test_failed_chunk_keeps_the_other_chunks(server, api):
+    server.get_result = fail_chunk_with('1003')
+
+    products = api.get_products_details(['1001', '1002', '1003', '1004', '1005'], chunk_size=2)
+
+    assert [product.product_id for product in products] == [1001, 1002, 1005]
+    assert products.missing_ids == ['1003', '1004']
+    assert set(products.errors) == {'1003', '1004'}
+    assert isinstance(products.errors['1003'], ApiRequestException)
+
+
+def test_error_is_raised_when_every_chunk_fails(server, api):
+    server.get_result = lambda method, params: None
+
+    with pytest.raises(ApiRequestException):
+        api.get_products_details(['1001', '1002', '1003'], chunk_size=2)
+
+
+def test_error_is_raised_when_the_other_chunks_find_nothing(server, api):
+    def get_failing_result(method, params):
+        if '1001' in params['product_ids'].split(','):
+            return None
+        return {'current_record_count': 0}
+    server.get_result = get_failing_result
+
+    with pytest.raises(ApiRequestException):
+        api.get_products_details(['1001', '1002', '1003'], chunk_size=2)
+
+
+def test_not_found_when_no_chunk_fails(server, api):
+    server.get_result = lambda method, params: {'current_record_count': 0}
+
+    with pytest.raises(ProductsNotFoudException):
+        api.get_products_details(['1001', '1002', '1003'], chunk_size=2)
+
+
+def test_async_failed_chunk_keeps_the_other_chunks(server):
+    import asyncio
+    from aliexpress_api import AsyncAliexpressApi, models
+
+    async def main():
+        async with AsyncAliexpressApi('key', 'secret', models.Language.EN, models.Currency.EUR,
+                                      'tracking') as api:
+            return await api.get_products_details(['1001', '1002', '1003'], chunk_size=2)
+
+    server.get_result = fail_chunk_with('1001')
+    products = asyncio.run(main())
+
+    assert [product.product_id for product in products] == [1003]
+    assert set(products.errors) == {'1001', '1002'}
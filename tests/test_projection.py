@@ -0,0 +1,61 @@
+import pickle
+
+import pytest
+
+from aliexpress_api import models
+from aliexpress_api.errors import InvalidArgumentException
+
+PRICE_FIELDS = ('product_id,target_sale_price,target_sale_price_currency,'
+                'target_original_price,target_original_price_currency')
+
+
+def test_price_only_sends_and_decodes_its_fields(server, api):
+    products = api.get_products_details(['1001', '1002'], fields=models.PRICE_ONLY)
+
+    assert server.calls[0][1]['fields'] == PRICE_FIELDS
+    assert all(type(product) is models.ProductPrice for product in products)
+    assert products[0].target_sale_price == 12.34
+    # The stub sends every field, the ones outside the projection are dropped
+    with pytest.raises(AttributeError):
+        products[0].product_title
+    assert products[0].to_dict() == {'product_id': 1001, 'target_sale_price': 12.34,
+                                     'target_sale_price_currency': 'EUR'}
+
+
+def test_link_only_sends_its_fields(server, api):
+    response = api.get_products(keywords='phone', fields=models.LINK_ONLY)
+
+    assert server.calls[0][1]['fields'] == 'product_id,promotion_link'
+    assert isinstance(response, models.ProductsResponse)
+    assert type(response.products[0]) is models.ProductLink
+
+
+def test_custom_projection(server, api):
+    projection = models.Projection('commission_rate', 'lastest_volume')
+    response = api.get_hotproducts(fields=projection)
+
+    assert server.calls[0][1]['fields'] == 'product_id,commission_rate,lastest_volume'
+    assert isinstance(response, models.HotProductsResponse)
+    assert response.products[0].to_dict() == {'product_id': 1000, 'commission_rate': 7.0,
+                                              'lastest_volume': 120}
+    assert models.Projection('commission_rate', 'lastest_volume').model is projection.model
+
+
+def test_unknown_fields_are_rejected():
+    with pytest.raises(InvalidArgumentException):
+        models.Projection('not_a_field')
+
+
+@pytest.mark.parametrize('projection', [models.PRICE_ONLY, models.Projection('commission_rate')])
+def test_projected_results_can_be_pickled(server, api, projection):
+    response = api.get_products(keywords='phone', fields=projection)
+    details = api.get_products_details(['1001', '1002'], fields=projection)
+
+    loaded = pickle.loads(pickle.dumps(response))
+    assert type(loaded) is type(response)
+    assert loaded == response
+    assert type(loaded.products[0]) is projection.model
+
+    loaded = pickle.loads(pickle.dumps(details))
+    assert loaded == details
+    assert type(loaded[0]) is projection.model
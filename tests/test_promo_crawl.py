@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta, timezone
+
+from aliexpress_api import models
+from aliexpress_api.tools import PromoCrawler
+from aliexpress_api.tools.promo_crawl import has_ended
+
+# 12:00 in Los Angeles, 20:00 UTC
+END_TIME = '2026-01-10 12:00:00'
+END = datetime(2026, 1, 10, 20, tzinfo=timezone.utc)
+
+
+def get_promo(name, end_time):
+    return models.Promo.from_dict({'promo_name': name, 'promotion_end_time': end_time})
+
+
+class FakeApi:
+    def get_featured_promo_products(self, promo_name, category_id, country, fields, page_no,
+                                    page_size, sort=None):
+        return models.PromoProductsResponse.from_dict({
+            'total_page_no': 1,
+            'products': {'product': [{'product_id': 1}]},
+        })
+
+
+def test_end_time_is_in_the_api_timezone():
+    promo = get_promo('Sale', END_TIME)
+
+    assert not has_ended(promo, END - timedelta(minutes=1))
+    assert has_ended(promo, END + timedelta(minutes=1))
+    assert not has_ended(promo, (END - timedelta(minutes=1)).astimezone(timezone(timedelta(hours=9))))
+
+
+def test_missing_or_invalid_end_time_has_not_ended():
+    assert not has_ended(get_promo('Sale', None), END)
+    assert not has_ended(get_promo('Sale', 'soon'), END)
+
+
+def test_ended_promos_are_skipped():
+    now = datetime.now(timezone.utc)
+    ended = get_promo('Ended', (now - timedelta(days=1)).strftime('%Y-%m-%d %H:%M:%S'))
+    active = get_promo('Active', (now + timedelta(days=1)).strftime('%Y-%m-%d %H:%M:%S'))
+    crawler = PromoCrawler(FakeApi())
+
+    assert [promo.promo_name for promo, _ in crawler.crawl([ended, active])] == ['Active']
+    assert crawler.skipped == [ended]
@@ -0,0 +1,141 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from aliexpress_api import RateLimiter
+from aliexpress_api.errors import ApiRequestException
+from aliexpress_api.helpers import rate_limit
+from aliexpress_api.skd.api.base import RequestException, TopException
+
+
+class FakeClock:
+    """Replaces the time module of the rate limiter. Sleeping advances the clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, delay):
+        self.sleeps.append(delay)
+        self.now += delay
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limit, 'time', fake)
+    return fake
+
+
+def get_request(method='aliexpress.affiliate.productdetail.get'):
+    return SimpleNamespace(getapiname=lambda: method)
+
+
+def get_throttle_error():
+    error = TopException()
+    error.errorcode = 7
+    error.subcode = 'isp.call-limited'
+    return error
+
+
+def test_calls_wait_for_their_token(clock):
+    limiter = RateLimiter(rate=2)
+
+    for _ in range(3):
+        limiter.acquire(get_request())
+
+    assert clock.sleeps == [0.5, 0.5]
+
+
+def test_burst_is_sent_at_once_after_idle(clock):
+    limiter = RateLimiter(rate=2, burst=3)
+    limiter.acquire(get_request())
+    clock.now += 10
+
+    for _ in range(3):
+        limiter.acquire(get_request())
+
+    assert clock.sleeps == []
+    assert limiter.get_available(get_request().getapiname()) == 0
+
+
+def test_methods_have_their_own_rates(clock):
+    limiter = RateLimiter(rate=10, rates={'slow': 1})
+
+    for method in ('slow', 'slow', 'fast', 'fast'):
+        limiter.acquire(get_request(method))
+
+    assert clock.sleeps == [1, 0.1]
+
+
+def test_async_waits_without_blocking(clock, monkeypatch):
+    delays = []
+
+    async def sleep(delay):
+        delays.append(delay)
+        clock.now += delay
+    monkeypatch.setattr(asyncio, 'sleep', sleep)
+    limiter = RateLimiter(rate=4)
+
+    async def main():
+        for _ in range(3):
+            await limiter.acquire_async(get_request())
+
+    asyncio.run(main())
+
+    assert delays == [0.25, 0.25]
+    assert clock.sleeps == []
+
+
+def test_throttling_halves_the_rate_once_per_interval(clock):
+    limiter = RateLimiter(rate=8, min_rate=3)
+    method = get_request().getapiname()
+
+    limiter.update(get_request(), get_throttle_error())
+    limiter.update(get_request(), get_throttle_error())
+    assert limiter.get_rate(method) == 4
+    assert limiter.throttled[method] == 2
+
+    clock.now += rate_limit.DECREASE_INTERVAL
+    limiter.update(get_request(), get_throttle_error())
+    assert limiter.get_rate(method) == 3
+
+
+def test_rate_recovers_after_successful_calls(clock):
+    limiter = RateLimiter(rate=8, increase=4)
+    method = get_request().getapiname()
+    limiter.update(get_request(), get_throttle_error())
+
+    limiter.update(get_request())
+    assert limiter.get_rate(method) == 5
+    for _ in range(10):
+        limiter.update(get_request())
+    assert limiter.get_rate(method) == 8
+
+
+def test_throttling_is_detected_in_wrapped_errors(clock):
+    limiter = RateLimiter(rate=8)
+    method = get_request().getapiname()
+    http_error = RequestException()
+    http_error.status = 429
+    wrapped = ApiRequestException('Too many requests')
+    wrapped.__cause__ = http_error
+
+    limiter.update(get_request(), wrapped)
+    assert limiter.get_rate(method) == 4
+
+    clock.now += rate_limit.DECREASE_INTERVAL
+    limiter.update(get_request(), ApiRequestException('Remote service error'))
+    assert limiter.get_rate(method) == 4
+
+
+def test_not_adaptive_keeps_the_rate(clock):
+    limiter = RateLimiter(rate=8, adaptive=False)
+
+    limiter.update(get_request(), get_throttle_error())
+
+    assert limiter.get_rate(get_request().getapiname()) == 8
@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from aliexpress_api import AliexpressApi, AsyncAliexpressApi, RetryPolicy, models
+from aliexpress_api.errors import ApiRequestException
+from aliexpress_api.helpers import retry
+from conftest import ApiError, HttpError, get_result
+
+PRODUCT_DETAILS = 'aliexpress.affiliate.productdetail.get'
+
+
+def fail_first(*failures):
+    """Answers with each failure in turn, then with the normal result."""
+    failures = list(failures)
+
+    def get_failing_result(method, params):
+        if failures:
+            return failures.pop(0)
+        return get_result(method, params)
+    return get_failing_result
+
+
+def get_api(policy, client_class=AliexpressApi):
+    return client_class('key', 'secret', models.Language.EN, models.Currency.EUR, 'tracking',
+                        retry_policy=policy)
+
+
+@pytest.mark.parametrize('failure', [ApiError('15', 'isp.remote-service-timeout'),
+                                     ApiError('7', 'isp.call-limited'),
+                                     HttpError(503)])
+def test_transient_failure_is_retried(server, failure):
+    server.get_result = fail_first(failure)
+    policy = RetryPolicy(backoff=0)
+
+    assert get_api(policy).get_products_details('1001')[0].product_id == 1001
+    assert len(server.calls) == 2
+    assert policy.attempts[PRODUCT_DETAILS] == {2: 1}
+
+
+@pytest.mark.parametrize('failure', [ApiError('15', 'isv.invalid-parameter'), HttpError(400)])
+def test_permanent_failure_is_not_retried(server, failure):
+    server.get_result = fail_first(failure)
+    policy = RetryPolicy(backoff=0)
+
+    with pytest.raises(ApiRequestException):
+        get_api(policy).get_products_details('1001')
+    assert len(server.calls) == 1
+    assert policy.attempts[PRODUCT_DETAILS] == {1: 1}
+
+
+def test_write_methods_are_not_retried(server):
+    server.get_result = lambda method, params: ApiError('15', 'isp.remote-service-timeout')
+    policy = RetryPolicy(backoff=0, methods=())
+
+    with pytest.raises(ApiRequestException):
+        get_api(policy).get_products_details('1001')
+    assert len(server.calls) == 1
+
+
+def test_budget_exhaustion_stops_retries(server):
+    server.get_result = lambda method, params: HttpError(503)
+    policy = RetryPolicy(max_attempts=5, backoff=0, budget=0.5, max_budget=1)
+    api = get_api(policy)
+
+    # The first call starts with a full budget and spends it on a single retry
+    with pytest.raises(ApiRequestException):
+        api.get_products_details('1001')
+    assert len(server.calls) == 2
+    assert policy.exhausted[PRODUCT_DETAILS] == 1
+
+    # Each call earns half a retry, so the next one can't retry at all
+    with pytest.raises(ApiRequestException):
+        api.get_products_details('1001')
+    assert len(server.calls) == 3
+    assert policy.exhausted[PRODUCT_DETAILS] == 2
+
+
+def test_backoff_is_random_up_to_an_exponential_limit(monkeypatch):
+    bounds, sleeps = [], []
+    monkeypatch.setattr(retry.random, 'uniform', lambda low, high: bounds.append((low, high)) or high)
+    monkeypatch.setattr(retry.time, 'sleep', sleeps.append)
+    policy = RetryPolicy(max_attempts=5, backoff=1, max_backoff=3)
+    request = type('Request', (), {'getapiname': lambda self: PRODUCT_DETAILS})()
+
+    def fail():
+        raise ConnectionResetError()
+
+    with pytest.raises(ConnectionResetError):
+        policy.call(request, fail)
+    assert bounds == [(0, 1), (0, 2), (0, 3), (0, 3)]
+    assert sleeps == [1, 2, 3, 3]
+    assert policy.attempts[PRODUCT_DETAILS] == {5: 1}
+
+
+def test_async_transient_failure_is_retried(server):
+    server.get_result = fail_first(HttpError(502))
+    policy = RetryPolicy(backoff=0)
+
+    async def main():
+        async with get_api(policy, AsyncAliexpressApi) as api:
+            return await api.get_products_details('1001')
+
+    assert asyncio.run(main())[0].product_id == 1001
+    assert len(server.calls) == 2
+    assert policy.attempts[PRODUCT_DETAILS] == {2: 1}
+
+
+def test_error_classification():
+    assert retry.is_transient_error(TimeoutError())
+    assert not retry.is_transient_error(ValueError())
+    wrapped = ApiRequestException('Connection reset')
+    wrapped.__cause__ = ConnectionResetError()
+    assert retry.is_transient_error(wrapped)
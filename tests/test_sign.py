@@ -0,0 +1,32 @@
+from aliexpress_api.skd import sign
+from aliexpress_api.skd.api.base import SIGN_METHOD_HMAC_SHA256, SIGN_METHOD_MD5
+
+
+SECRET = 'secret'
+PARAMETERS = {
+    'method': 'aliexpress.affiliate.product.query',
+    'app_key': '12345',
+    'timestamp': '1700000000000',
+    'keywords': 'café phone',
+    'page_size': 50,
+}
+JOINED = 'app_key12345methodaliexpress.affiliate.product.query'
+
+
+def test_md5_dict():
+    assert sign(SECRET, PARAMETERS) == 'CC46C2660528C6646F3FF02B5994095F'
+    assert sign(SECRET, PARAMETERS, SIGN_METHOD_MD5) == 'CC46C2660528C6646F3FF02B5994095F'
+
+
+def test_md5_string_is_signed_as_is():
+    assert sign(SECRET, JOINED) == '1E87C1468F440B7E8F48F349AE4BAE94'
+
+
+def test_hmac_sha256_dict():
+    assert sign(SECRET, PARAMETERS, SIGN_METHOD_HMAC_SHA256) == (
+        'F0C7D2CBBF8608B04D0EB50BD392488218A54187A3777AF608FC5851C2C3045C')
+
+
+def test_hmac_sha256_string():
+    assert sign(SECRET, JOINED, SIGN_METHOD_HMAC_SHA256) == (
+        '3509917E230AD6159115165845621AC0EB9BFB1AD44B938CE4FE2D7C7A2FBE07')
@@ -0,0 +1,168 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from aliexpress_api import SingleFlight
+from aliexpress_api.skd import api as aliapi
+
+METHOD = 'aliexpress.affiliate.productdetail.get'
+
+
+def get_request(product_ids='1001'):
+    request = aliapi.rest.AliexpressAffiliateProductdetailGetRequest()
+    request.product_ids = product_ids
+    return request
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+class Send:
+    """Sends a request only when released, counting the sends of each parameter."""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.released = threading.Event()
+        self.sent = []
+
+    def __call__(self, product_ids):
+        self.sent.append(product_ids)
+        assert self.released.wait(5)
+        if self.error:
+            raise self.error
+        return {'product_ids': product_ids}
+
+
+def call_in_threads(single_flight, send, product_ids, followers):
+    results = [None] * len(product_ids)
+
+    def call(index):
+        try:
+            results[index] = single_flight.call(get_request(product_ids[index]), send, product_ids[index])
+        except Exception as error:
+            results[index] = error
+
+    threads = [threading.Thread(target=call, args=(index,)) for index in range(len(product_ids))]
+    for thread in threads:
+        thread.start()
+    assert wait_for(lambda: sum(single_flight.collapsed.values()) == followers
+                    and len(send.sent) == len(set(product_ids)))
+    send.released.set()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_identical_calls_share_the_result():
+    single_flight, send = SingleFlight(), Send()
+
+    results = call_in_threads(single_flight, send, ['1001'] * 4, followers=3)
+
+    assert send.sent == ['1001']
+    assert all(result is results[0] for result in results)
+    assert single_flight.collapsed[METHOD] == 3
+
+
+def test_followers_receive_the_error_of_the_leader():
+    error = ValueError('failed')
+    single_flight, send = SingleFlight(), Send(error)
+
+    results = call_in_threads(single_flight, send, ['1001'] * 3, followers=2)
+
+    assert send.sent == ['1001']
+    assert all(result is error for result in results)
+
+
+def test_different_parameters_are_sent_separately():
+    single_flight, send = SingleFlight(), Send()
+
+    results = call_in_threads(single_flight, send, ['1001', '1002', '1001'], followers=1)
+
+    assert sorted(send.sent) == ['1001', '1002']
+    assert [result['product_ids'] for result in results] == ['1001', '1002', '1001']
+    assert results[0] is results[2]
+
+
+def test_finished_calls_are_not_reused():
+    single_flight, send = SingleFlight(), Send()
+    send.released.set()
+
+    first = single_flight.call(get_request(), send, '1001')
+    second = single_flight.call(get_request(), send, '1001')
+
+    assert send.sent == ['1001', '1001']
+    assert first is not second
+    assert not single_flight.collapsed
+
+
+class AsyncSend:
+    def __init__(self, error=None):
+        self.error = error
+        self.sent = []
+
+    async def __call__(self, product_ids):
+        self.sent.append(product_ids)
+        await asyncio.sleep(0.05)
+        if self.error:
+            raise self.error
+        return {'product_ids': product_ids}
+
+
+def call_async(single_flight, send, product_ids):
+    async def main():
+        return await asyncio.gather(
+            *(single_flight.call_async(get_request(ids), send, ids) for ids in product_ids),
+            return_exceptions=True)
+    return asyncio.run(main())
+
+
+def test_async_identical_calls_share_the_result():
+    single_flight, send = SingleFlight(), AsyncSend()
+
+    results = call_async(single_flight, send, ['1001'] * 4)
+
+    assert send.sent == ['1001']
+    assert all(result is results[0] for result in results)
+    assert single_flight.collapsed[METHOD] == 3
+
+
+def test_async_followers_receive_the_error_of_the_leader():
+    error = ValueError('failed')
+    single_flight, send = SingleFlight(), AsyncSend(error)
+
+    results = call_async(single_flight, send, ['1001'] * 3)
+
+    assert send.sent == ['1001']
+    assert all(result is error for result in results)
+
+
+def test_async_different_parameters_are_sent_separately():
+    single_flight, send = SingleFlight(), AsyncSend()
+
+    results = call_async(single_flight, send, ['1001', '1002', '1001'])
+
+    assert send.sent == ['1001', '1002']
+    assert [result['product_ids'] for result in results] == ['1001', '1002', '1001']
+    assert single_flight.collapsed[METHOD] == 1
+
+
+def test_async_cancelled_caller_does_not_cancel_the_others():
+    single_flight, send = SingleFlight(), AsyncSend()
+
+    async def main():
+        leader = asyncio.ensure_future(single_flight.call_async(get_request(), send, '1001'))
+        follower = asyncio.ensure_future(single_flight.call_async(get_request(), send, '1001'))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(main()) == {'product_ids': '1001'}
+    assert send.sent == ['1001']
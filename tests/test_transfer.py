@@ -0,0 +1,57 @@
+import threading
+import time
+
+from aliexpress_api import AliexpressApi, HedgePolicy, SingleFlight, models
+from conftest import get_result
+
+
+def slow(delay):
+    def get_slow_result(method, params):
+        time.sleep(delay)
+        return get_result(method, params)
+    return get_slow_result
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_sizes_are_recorded_per_call(server, api):
+    api.get_products_details('1001')
+    api.get_products_details('1002')
+
+    transferred = api.transferred['aliexpress.affiliate.productdetail.get']
+    assert transferred['calls'] == 2
+    assert transferred['sent'] > 0
+    assert transferred['received'] == transferred['decoded'] > 0
+
+
+def test_both_hedged_copies_are_recorded(server):
+    server.get_result = slow(0.2)
+    policy = HedgePolicy(min_delay=0.05)
+    api = AliexpressApi('key', 'secret', models.Language.EN, models.Currency.EUR, 'tracking',
+                        hedge_policy=policy)
+
+    api.get_products_details('1001')
+    transferred = api.transferred['aliexpress.affiliate.productdetail.get']
+    assert wait_for(lambda: transferred['calls'] == 2)
+    assert len(server.calls) == 2
+    policy.close()
+
+
+def test_single_flight_followers_are_not_recorded(server):
+    server.get_result = slow(0.2)
+    api = AliexpressApi('key', 'secret', models.Language.EN, models.Currency.EUR, 'tracking',
+                        single_flight=SingleFlight())
+
+    threads = [threading.Thread(target=api.get_products_details, args=('1001',)) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(server.calls) == 1
+    assert api.transferred['aliexpress.affiliate.productdetail.get']['calls'] == 1